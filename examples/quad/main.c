@@ -108,6 +108,8 @@ static void DrawCallback(VkForgeRender render)
 
         // Bind descriptor sets if needed
         // (In your case, it seems you don't have descriptor sets for the "Default" pipeline)
+        // Binds every set on the first bind after VkForge_UpdateRender begins cmdbuf_draw,
+        // then only the sets that changed
         VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
             userData->layout,
             userData->layout_queue,
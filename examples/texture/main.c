@@ -124,6 +124,8 @@ static void DrawCallback(VkForgeRender render)
             userData->pipeline.pipeline);
 
         // Bind descriptor sets using the new layout system
+        // Binds every set on the first bind after VkForge_UpdateRender begins cmdbuf_draw,
+        // then only the sets that changed
         VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
             userData->layout,
             userData->layout_queue,
@@ -127,6 +127,8 @@ static void DrawCallback(VkForgeRender render)
             userData->pipeline.pipeline);
 
         // Use the new binding function that handles descriptor writes and binding
+        // Binds every set on the first bind after VkForge_UpdateRender begins cmdbuf_draw,
+        // then only the sets that changed
         VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
             userData->layout,
             userData->layout_queue,
@@ -0,0 +1,118 @@
+from pathlib import Path
+from typing import List, Optional, Union
+import hashlib
+import os
+import tempfile
+
+CACHE_DIR = ".vkforge_cache"
+MEBIBYTE = 1024 * 1024
+
+# Read once at import: os.umask can only be read by setting it, and setting it
+# while worker threads create files would leak the temporary value to them
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+
+def hash_bytes(*parts: Union[bytes, str]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        # Length prefix so that ("ab", "c") and ("a", "bc") hash differently
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write data to path via a temp file + rename so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        # mkstemp creates the file 0600; keep the target's mode, or use the
+        # mode open() would have given a new file
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~UMASK
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+class ContentCache:
+    """
+    On-disk, content-addressed store under <build-dir>/.vkforge_cache/<name>.
+    Entries are files named by their key. A hit refreshes the entry's mtime so
+    that evict() can drop the least recently used entries once the store grows
+    past max_bytes. A max_bytes of 0 disables the cache.
+    """
+
+    def __init__(self, build_dir: str, name: str, max_bytes: int):
+        self.root = Path(build_dir) / CACHE_DIR / name
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def path(self, key: str, suffix: str = "") -> Path:
+        return self.root / key[:2] / (key + suffix)
+
+    def get(self, key: str, suffix: str = "") -> Optional[Path]:
+        if not self.enabled:
+            return None
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, key: str, data: bytes, suffix: str = "") -> Optional[Path]:
+        if not self.enabled:
+            return None
+        path = self.path(key, suffix)
+        write_atomic(path, data)
+        return path
+
+    def evict(self) -> List[Path]:
+        if not self.enabled or not self.root.exists():
+            return []
+
+        entries = []
+        total = 0
+        for path in self.root.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            st = path.stat()
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        evicted = []
+        entries.sort()  # oldest first
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted.append(path)
+        return evicted
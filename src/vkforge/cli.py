@@ -5,49 +5,14 @@ import os
 from pathlib import Path
 from .schema import VkForgeModel
 from .shader import load_shader_data
-from typing import Any
-from dataclasses import is_dataclass, fields
-from pydantic import BaseModel
-from pathlib import Path
+from .cache import MEBIBYTE
 from .context import VkForgeContext
-from .layout import create_pipeline_layouts
+from .layout import create_pipeline_layouts, LAYOUT_STRATEGIES
 from .writer import Generate
-
-
-def deep_serialize(obj: Any) -> Any:
-    if isinstance(obj, dict):
-        new_dict = {}
-        for k, v in obj.items():
-            # Convert tuple keys to strings
-            if isinstance(k, tuple):
-                new_key = str(k)
-            else:
-                new_key = k
-            new_dict[new_key] = deep_serialize(v)
-        return new_dict
-
-    elif isinstance(obj, list):
-        return [deep_serialize(v) for v in obj]
-
-    elif isinstance(obj, tuple):
-        return [deep_serialize(v) for v in obj]  # Optionally keep as tuple
-
-    elif isinstance(obj, set):
-        return [deep_serialize(v) for v in obj]  # sets → list for JSON
-
-    elif isinstance(obj, Path):
-        return str(obj)
-
-    elif isinstance(obj, BaseModel):
-        values = {k: deep_serialize(v) for k, v in obj.model_dump().items()}
-        return values
-
-    elif is_dataclass(obj):
-        data = {f.name: deep_serialize(getattr(obj, f.name)) for f in fields(obj)}
-        return data
-
-    else:
-        return obj
+from .manifest import Manifest
+from .watch import watch
+from . import profile
+from .mappings import *
 
 
 def load_file(config_path: str) -> dict:
@@ -113,18 +78,143 @@ def main():
         help="By default Pipeline Shaders are embedded with --build-dir as root path. This overwrite the root path. However, any compiled shader is still saved at --build-dir.",
     )
 
+    parser.add_argument(
+        "--shader-cache-size",
+        type=int,
+        default=256,
+        help="Size cap in MiB of the compiled shader cache kept in --build-dir. Shaders are cached by the content of their source, its includes, the compiler and its flags. A cached shader is reused without glslangValidator on PATH; only a miss needs it. The least recently used entries are evicted first. 0 disables the cache."
+    )
+
+    parser.add_argument(
+        "--reflect-cache-size",
+        type=int,
+        default=64,
+        help="Size cap in MiB of the shader reflection cache kept in --build-dir. Reflections are cached by the SHA-256 of the SPIR-V binary and shared by every config using the same --build-dir. The least recently used entries are evicted first. 0 disables the cache."
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of shaders compiled and reflected, and of files rendered, concurrently. Defaults to the number of CPUs. Use 1 to do one at a time."
+    )
+
+    parser.add_argument(
+        "--reflector",
+        choices=["spirv-cross", "native"],
+        default="spirv-cross",
+        help="Shader reflection backend. 'native' parses SPIR-V in-process and needs no spirv-cross for reflection; it falls back to spirv-cross for binaries it cannot parse."
+    )
+
+    parser.add_argument(
+        "--shader-linker",
+        choices=["native", "glslang"],
+        default="native",
+        help="How the shaders of each pipeline are checked against each other. 'native' matches the reflected stage inputs/outputs (location, type, array size) and descriptor bindings in-process. 'glslang' links them with glslangValidator -l, which needs SPIR-V inputs to be disassembled with spirv-cross first."
+    )
+
+    parser.add_argument(
+        "--shader-storage",
+        choices=["file", "embed", "pack"],
+        default="file",
+        help="How pipelines get their SPIR-V. 'file' reads each .spv from its path under --build-dir (or --overwrite-shader-dir) at runtime. 'embed' compiles every unique SPIR-V binary into vkforge_pipelines.c as a static uint32_t array, so creating a shader module reads no file and the program can be moved freely. 'pack' writes every unique SPIR-V binary into a single vkforge_shaders.pack in --build-dir, which the program maps into memory once, on the first shader module it creates."
+    )
+
+    parser.add_argument(
+        "--layout-strategy",
+        choices=LAYOUT_STRATEGIES,
+        default="pack",
+        help="How pipelines are merged into shared pipeline layouts. 'pack' clusters pipelines whose descriptor bindings do not conflict into as few pipeline layouts, then descriptor set layouts, as possible, independent of the order of pipelines in the config. It searches exhaustively for small configs and uses the DSatur heuristic for large ones. 'greedy' merges pipelines in config order and starts a new layout at the first conflict."
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore the build manifest in --build-dir and render every generated file again. By default, files whose inputs have not changed since the last run are skipped."
+    )
+
+    parser.add_argument(
+        "--serial",
+        action="store_true",
+        help="Render the generated files one after another in this process instead of on a worker pool. Useful for debugging a translator."
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate whenever the config or one of its shaders (or their includes) changes. The parsed config and the compiled, reflected shaders are kept in memory between runs, and only the shaders that changed are processed again."
+    )
+
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=0.5,
+        help="Seconds between two checks for changed files in --watch mode."
+    )
+
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="OUT_JSON",
+        help="Record how long each phase takes (config validation, every shader tool call, the layout passes, rendering and writing each file) into OUT_JSON in Chrome trace format, viewable in chrome://tracing or ui.perfetto.dev, and print a summary table."
+    )
+
     args = parser.parse_args()
-    raw_data = load_file(args.config_path)
 
-    forgeModel = VkForgeModel(**raw_data)
-    shaderData = load_shader_data(
-        args.config_roots, 
-        args.build_dir, 
-        args.copy_shader_dir, 
-        args.overwrite_shader_dir,
-        forgeModel
+    if args.profile:
+        profiler = profile.enable()
+
+    try:
+        with profile.span("main"):
+            if args.watch:
+                watch(args, load_model, run, args.watch_interval)
+            else:
+                run(args, load_model(args.config_path))
+    finally:
+        if args.profile:
+            profiler.save(args.profile)
+            print(profiler.summary())
+
+
+def load_model(config_path: str) -> VkForgeModel:
+    with profile.span("load_config"):
+        raw_data = load_file(config_path)
+    with profile.span("validate_model"):
+        return VkForgeModel(**raw_data)
+
+
+def run(args, forgeModel: VkForgeModel, known: dict = None, validated: set = None) -> dict:
+    with profile.span("load_shader_data"):
+        shaderData = load_shader_data(
+            args.config_roots, 
+            args.build_dir, 
+            args.copy_shader_dir, 
+            args.overwrite_shader_dir,
+            forgeModel,
+            shader_cache_size=args.shader_cache_size * MEBIBYTE,
+            jobs=args.jobs,
+            reflect_cache_size=args.reflect_cache_size * MEBIBYTE,
+            reflector=args.reflector,
+            known=known,
+            validated=validated,
+            linker=args.shader_linker
+        )
+
+    manifest = Manifest(args.build_dir, force=args.force)
+
+    # The layout only depends on which shaders each pipeline uses, their reflections,
+    # the strategy and the descriptor frequency annotations
+    layout_key = manifest.fingerprint(
+        args.layout_strategy,
+        [annotation.model_dump() for annotation in forgeModel.DescriptorFrequency or []],
+        shaderData[SHADER.COMBO],
+        {id: shader[SHADER.REFLECT] for id, shader in shaderData[SHADER.LIST].items()}
     )
-    layout = create_pipeline_layouts(forgeModel, shaderData)
+    layout = manifest.get_layout(layout_key)
+    if layout is None:
+        with profile.span("create_pipeline_layouts"):
+            layout = create_pipeline_layouts(forgeModel, shaderData, args.layout_strategy)
+        manifest.set_layout(layout_key, layout)
 
     context = VkForgeContext(
         args.remove_validations,
@@ -132,20 +222,14 @@ def main():
         args.build_dir, 
         forgeModel, 
         shaderData, 
-        layout
+        layout,
+        args.shader_storage,
+        args.overwrite_shader_dir
     )
 
-    genFile = ".VkForgeGeneration"
-    filepath = Path(context.buildDir) / genFile
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(filepath, "w") as f:
-        f.write(json.dumps(deep_serialize(context), indent=4))
-        print(f"GENERATED: {filepath}")
-
-    
-
-    Generate(context)
+    with profile.span("generate"):
+        Generate(context, manifest, jobs=args.jobs, serial=args.serial)
+    return shaderData
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .schema import VkForgeModel
 
 
@@ -10,3 +10,6 @@ class VkForgeContext:
     forgeModel: VkForgeModel = None
     shaderData: dict = None
     layout: dict = None
+    shaderStorage: str = "file"
+    overwriteShaderDir: str = None
+    cachedValues: dict = field(default_factory=dict)  # see GetCachedValue
@@ -1,6 +1,7 @@
 from .schema import VkForgeModel
 from .mappings import *
 from typing import List, Tuple, Dict
+from .profile import span
 import hashlib
 
 def hash_tuple(t: tuple) -> str:
@@ -76,52 +77,66 @@ def create_descriptorsets(shader: dict):
     return dsets
 
 
-def check_for_errors_single_descriptorsets(id: str, dsets: List[Tuple]):
-    for i, dset1 in enumerate(dsets[:-1]):
-        mode1, set1, binding1, type1, count1 = dset1
-        for dset2 in dsets[i + 1:]:
-            mode2, set2, binding2, type2, count2 = dset2
-            if set1 == set2 and binding1 == binding2 and mode1 == mode2:
-                raise ValueError(
-                    f"set {set1}, binding {binding1}, mode {mode1} overlapped for shader {id}"
-                )
+def find_single_descriptorset_conflicts(id: str, dsets: List[Tuple]) -> List[str]:
+    errors = []
+    seen = {}
+    for mode, set1, binding, type, count in dsets:
+        key = (set1, binding)
+        if key in seen:
+            errors.append(f"set {set1}, binding {binding}, mode {mode} overlapped for shader {id}")
+        else:
+            seen[key] = type
+    return errors
 
 
-def check_for_errors_group_descriptorsets(shader_groups: Dict, shader_dsets: Dict,):
+def find_group_descriptorset_conflicts(shader_groups: Dict, shader_dsets: Dict,) -> List[str]:
+    """
+    Check the shaders of each pipeline against each other with one index keyed by
+    (set, binding). Every binding is compared with the first shader that declared it.
+    """
+    errors = []
     for pipeline_name, shader_ids in shader_groups.items():
-        dsets = []
-        dsets_shaderids = []
+        index = {}
         for shader_id in shader_ids:
-            if shader_id in shader_dsets:
-                for shader_dset in shader_dsets[shader_id]:
-                    dsets.append(shader_dset)
-                    dsets_shaderids.append(shader_id)
-    
-    for i, dset1 in enumerate(dsets[:-1]):
-        for j, dset2 in enumerate(dsets[i+1:], start=i+1):
-            mode1, set1, binding1, type1, count1 = dset1
-            mode2, set2, binding2, type2, count2 = dset2
-            shader_names = ', '.join([dsets_shaderids[i], dsets_shaderids[j]])
-
-            if set1 == set2 and binding1 == binding2 and mode1 == mode2:
-                raise ValueError(
-                    f"Shaders {shader_names} are grouped together in pipeline {pipeline_name} "
-                    f"but the mode {mode1} is duplicated. There must be 1 unique mode per shader"
-                )
-            if set1 == set2 and binding1 == binding2 and type1 != type2:
-                raise ValueError(
-                    f"Shaders {shader_names} are grouped together in pipeline {pipeline_name} "
-                    f"but set {set1} and binding {binding1} have different types "
-                    f"{type1}, {type2} across the shaders. If shaders share the same "
-                    f"set and binding then the type and count must match."
-                )
-            if set1 == set2 and binding1 == binding2 and count1 != count2:
-                raise ValueError(
-                    f"Shaders {shader_names} are grouped together in pipeline {pipeline_name} "
-                    f"but set {set1} and binding {binding1} have different types "
-                    f"{count1}, {count2} across the shaders. If shaders share the same "
-                    f"set and binding then the type and count must match."
-                )
+            for mode, set1, binding, type, count in shader_dsets.get(shader_id, []):
+                key = (set1, binding)
+                if not key in index:
+                    index[key] = (shader_id, type, count, {mode: shader_id})
+                    continue
+
+                first_id, first_type, first_count, modes = index[key]
+                if first_id == shader_id:
+                    continue  # a single shader's own overlaps are reported per shader
+                shader_names = ', '.join([first_id, shader_id])
+
+                if mode in modes and modes[mode] != shader_id:
+                    errors.append(
+                        f"Shaders {modes[mode]}, {shader_id} are grouped together in pipeline {pipeline_name} "
+                        f"but the mode {mode} is duplicated. There must be 1 unique mode per shader"
+                    )
+                modes.setdefault(mode, shader_id)
+                if type != first_type:
+                    errors.append(
+                        f"Shaders {shader_names} are grouped together in pipeline {pipeline_name} "
+                        f"but set {set1} and binding {binding} have different types "
+                        f"{first_type}, {type} across the shaders. If shaders share the same "
+                        f"set and binding then the type and count must match."
+                    )
+                if count != first_count:
+                    errors.append(
+                        f"Shaders {shader_names} are grouped together in pipeline {pipeline_name} "
+                        f"but set {set1} and binding {binding} have different counts "
+                        f"{first_count}, {count} across the shaders. If shaders share the same "
+                        f"set and binding then the type and count must match."
+                    )
+    return errors
+
+
+def raise_descriptorset_conflicts(errors: List[str]):
+    if errors:
+        raise ValueError(
+            f"{len(errors)} descriptor set conflict(s):\n" + "\n".join(f"  - {e}" for e in errors)
+        )
 
 def create_descriptorset_layouts(dsets_list: List[List[Tuple]]):
     dset_layout_dict = {}
@@ -154,84 +169,298 @@ def create_pipeline_descriptorset_layouts(shader_groups: Dict, shader_dsets: Dic
         pipelines_dset_layouts[pipeline_name] = dset_layouts
     return pipelines_dset_layouts
 
-def optimize_pipeline_layouts(fm: VkForgeModel, data: dict) -> dict:
-    def fill_bind_slots(bind:int, type:str, count:int, stages:set, bind_slots:List[tuple]):
-        if bind < len(bind_slots):
-            if bind_slots[bind]:
-                slot_type, slot_count, slot_stages = bind_slots[bind]
-                if type == slot_type and count == slot_count:
-                    if not stages in slot_stages:
-                        stages.union(slot_stages)
-                    bind_slots[bind] = (type, count, stages)
-                    return True
-                else:
-                    return False
-            else:
-                bind_slots[bind] = (type, count, stages)
+LAYOUT_STRATEGIES = ["pack", "greedy"]
+
+# The pack strategy searches for the best clustering exactly while the number of
+# distinct pipeline descriptor signatures is at most EXACT_PACK_NODES and the search
+# finishes within EXACT_PACK_STEPS steps. Otherwise it keeps the best clustering
+# found within the step cap, which is the DSatur answer if the search found nothing better.
+EXACT_PACK_NODES = 64
+EXACT_PACK_STEPS = 200000
+
+# How the pack strategy arrived at its clustering, as reported in the LAYOUT line
+PACK_EXACT = "exact"
+PACK_CAPPED = "best found within the step cap"
+PACK_HEURISTIC = "DSatur heuristic"
+
+
+def fill_bind_slots(bind:int, type:str, count:int, stages:set, bind_slots:List[tuple]):
+    if bind < len(bind_slots):
+        if bind_slots[bind]:
+            slot_type, slot_count, slot_stages = bind_slots[bind]
+            if type == slot_type and count == slot_count:
+                bind_slots[bind] = (type, count, slot_stages | stages)
                 return True
+            else:
+                return False
         else:
-            bind_slots.extend([None] * (bind + 1))
-            bind_slots[bind] = (type, count, stages)
+            bind_slots[bind] = (type, count, set(stages))
             return True
-    
-    def fill_set_slots(set1: int, bind:int, type:str, count:int, stages:set, set_slots:List[list]):
-        if set1 < len(set_slots):
-            if not set_slots[set1]:
-                set_slots[set1] = []
-            return fill_bind_slots(bind, type, count, stages, set_slots[set1])
-        else:
-            set_slots.extend([None] * (set1 - len(set_slots) + 1))
+    else:
+        bind_slots.extend([None] * (bind - len(bind_slots) + 1))
+        bind_slots[bind] = (type, count, set(stages))
+        return True
+
+def fill_set_slots(set1: int, bind:int, type:str, count:int, stages:set, set_slots:List[list]):
+    if set1 < len(set_slots):
+        if not set_slots[set1]:
             set_slots[set1] = []
-            return fill_bind_slots(bind, type, count, stages, set_slots[set1])
-        
-    dset_dict = data[LAYOUT.DSET_LAYOUT]
-    reference_dict = data[LAYOUT.DSET_REF]
-
-    layouts = [] # Each item is a Pipeline Layout
-    references = {} # Reference for the Optimized Layout
+        return fill_bind_slots(bind, type, count, stages, set_slots[set1])
+    else:
+        set_slots.extend([None] * (set1 - len(set_slots) + 1))
+        set_slots[set1] = []
+        return fill_bind_slots(bind, type, count, stages, set_slots[set1])
+
+
+def get_pipeline_descriptors(dset_dict: dict, reference_dict: dict) -> Dict[str, List[Tuple]]:
+    """(set, binding, type, count, stages) of each pipeline's descriptors."""
+    descriptors = {
+        hash: (
+            dset_data[LAYOUT.SET],
+            dset_data[LAYOUT.BIND],
+            dset_data[LAYOUT.TYPE],
+            dset_data[LAYOUT.COUNT],
+            dset_data[LAYOUT.STAGES],
+        )
+        for hash, dset_data in dset_dict.items()
+    }
+    return {
+        pipeline_name: [descriptors[hash] for hash in hash_list]
+        for pipeline_name, hash_list in reference_dict.items()
+    }
 
-    current = [] # Current Pipeline Layout being build. Each Item is a DescriptorSet
-    previous = []
 
-    pipeline_index = 0
-    pipeline_keys = reference_dict.keys()
-    pipeline_names = list(pipeline_keys)
+def merge_pipeline_layout(layout: list, descriptors: List[Tuple]):
+    """A copy of layout with the descriptors added, or None if they conflict with it."""
+    merged = [list(set_slots) if set_slots is not None else None for set_slots in layout]
+    for set1, bind, type, count, stages in descriptors:
+        if not fill_set_slots(set1, bind, type, count, stages, merged):
+            return None
+    return merged
 
-    while(pipeline_index < len(pipeline_keys)):
-        pipeline_name = pipeline_names[pipeline_index]
-        hash_list = reference_dict[pipeline_name]
 
-        previous = current.copy()
-        incompletePipeline = False
+def count_set_layouts(layouts: list) -> int:
+    return sum(len(layout) for layout in layouts if layout)
 
-        for hash in hash_list:
-            dset_data = dset_dict[hash]
-            set1 = dset_data[LAYOUT.SET]
-            bind = dset_data[LAYOUT.BIND]
-            type = dset_data[LAYOUT.TYPE]
-            count = dset_data[LAYOUT.COUNT]
-            stages = dset_data[LAYOUT.STAGES]
 
-            if fill_set_slots(set1, bind, type, count, stages, current):
-                continue
-            else:
-                incompletePipeline = True
-                break
+def optimize_greedy(pipeline_names: List[str], pipeline_descriptors: Dict[str, List[Tuple]]):
+    """Merge pipelines in config order. A pipeline that conflicts with the running layout closes it."""
+    layouts = []
+    references = {}
+    current = []
+
+    for pipeline_name in pipeline_names:
+        merged = merge_pipeline_layout(current, pipeline_descriptors[pipeline_name])
+        if merged is None:
+            if current:
+                layouts.append(current)
+            merged = merge_pipeline_layout([], pipeline_descriptors[pipeline_name])
+            if merged is None:
+                break # pipeline conflicts with itself
+        current = merged
+        references[pipeline_name] = len(layouts)
 
-        if incompletePipeline == True:
-            if previous:
-                layouts.append(previous)
-                current = []
-                continue
-            else:
-                break # now descriptor layout exists
-        else:
-            references[pipeline_name] = len(layouts)
-        pipeline_index += 1
-    
     if current:
         layouts.append(current)
-    
+    return layouts, references
+
+
+def find_signature_conflicts(signatures: List[Tuple]) -> List[int]:
+    """
+    Conflict graph of descriptor signatures as bitmasks: bit j of conflicts[i] is set when
+    signatures i and j use the same set and binding with a different type or count.
+    """
+    slots = {}  # (set, binding) -> (type, count) -> bitmask of signatures
+    for i, signature in enumerate(signatures):
+        for set1, bind, type, count in signature:
+            kinds = slots.setdefault((set1, bind), {})
+            kinds[(type, count)] = kinds.get((type, count), 0) | (1 << i)
+
+    conflicts = [0] * len(signatures)
+    for kinds in slots.values():
+        if len(kinds) < 2:
+            continue
+        masks = list(kinds.values())
+        union = 0
+        for mask in masks:
+            union |= mask
+        for mask in masks:
+            others = union & ~mask
+            remaining = mask
+            while remaining:
+                low = remaining & -remaining
+                conflicts[low.bit_length() - 1] |= others
+                remaining ^= low
+    return conflicts
+
+
+def color_dsatur(conflicts: List[int]) -> Tuple[List[int], List[int]]:
+    """
+    DSatur coloring: repeatedly color the signature with the most distinct conflicting
+    colors, ties going to the most conflicts and then the lowest index.
+    Returns the colors and the order the signatures were colored in.
+    """
+    count = len(conflicts)
+    degrees = [bin(mask).count("1") for mask in conflicts]
+    colors = [-1] * count
+    saturation = [set() for _ in range(count)]
+    order = []
+
+    for _ in range(count):
+        node = max(
+            (i for i in range(count) if colors[i] < 0),
+            key=lambda i: (len(saturation[i]), degrees[i], -i)
+        )
+        color = 0
+        while color in saturation[node]:
+            color += 1
+        colors[node] = color
+        order.append(node)
+
+        remaining = conflicts[node]
+        while remaining:
+            low = remaining & -remaining
+            saturation[low.bit_length() - 1].add(color)
+            remaining ^= low
+    return colors, order
+
+
+def color_exact(conflicts: List[int], weights: List[int], colors: List[int], order: List[int]):
+    """
+    Branch and bound over the colorings of the conflict graph, minimizing the number of
+    colors, then the sum over colors of the largest weight in each. Starts from the given
+    coloring as the best known answer. Returns (colors, method): PACK_EXACT if the search
+    finished, PACK_CAPPED if it hit EXACT_PACK_STEPS after improving on the given coloring
+    and PACK_HEURISTIC if it hit the cap without improving on it.
+    """
+    def cost(colors: List[int]) -> Tuple[int, int]:
+        largest = {}
+        for node, color in enumerate(colors):
+            largest[color] = max(largest.get(color, 0), weights[node])
+        return (len(largest), sum(largest.values()))
+
+    best = [list(colors), cost(colors)]
+    assigned = [-1] * len(conflicts)
+    members = []  # bitmask of the signatures in each color
+    largest = []  # largest weight in each color
+    steps = 0
+
+    def search(depth: int, total: int) -> bool:
+        nonlocal steps
+        steps += 1
+        if steps > EXACT_PACK_STEPS:
+            return False
+        if depth == len(order):
+            best[0], best[1] = list(assigned), (len(members), total)
+            return True
+
+        node = order[depth]
+        for color in range(len(members)):
+            if members[color] & conflicts[node]:
+                continue
+            grown = total - largest[color] + max(largest[color], weights[node])
+            if (len(members), grown) >= best[1]:
+                continue
+            previous = largest[color]
+            members[color] |= 1 << node
+            largest[color] = max(previous, weights[node])
+            assigned[node] = color
+            finished = search(depth + 1, grown)
+            members[color] &= ~(1 << node)
+            largest[color] = previous
+            if not finished:
+                return False
+
+        if (len(members) + 1, total + weights[node]) < best[1]:
+            members.append(1 << node)
+            largest.append(weights[node])
+            assigned[node] = len(members) - 1
+            finished = search(depth + 1, total + weights[node])
+            members.pop()
+            largest.pop()
+            if not finished:
+                return False
+        return True
+
+    if search(0, 0):
+        return best[0], PACK_EXACT
+    return best[0], PACK_CAPPED if best[1] < cost(colors) else PACK_HEURISTIC
+
+
+def optimize_pack(pipeline_names: List[str], pipeline_descriptors: Dict[str, List[Tuple]]):
+    """
+    Cluster pipelines into as few pipeline layouts, then descriptor set layouts, as possible.
+
+    Pipelines with the same descriptor signature always share a layout, so the signatures
+    are the nodes of a conflict graph, sorted so the answer does not depend on config order.
+    A group of pipelines can share a layout exactly when no two of them conflict, which
+    makes the clustering a coloring of that graph.
+    """
+    signature_pipelines = {}
+    for pipeline_name in pipeline_names:
+        signature = tuple(sorted(
+            {(set1, bind, type, count) for set1, bind, type, count, _ in pipeline_descriptors[pipeline_name]}
+        ))
+        signature_pipelines.setdefault(signature, []).append(pipeline_name)
+    signatures = sorted(signature_pipelines)
+
+    conflicts = find_signature_conflicts(signatures)
+    colors, order = color_dsatur(conflicts)
+    method = PACK_HEURISTIC
+    if len(signatures) <= EXACT_PACK_NODES:
+        # A signature's weight is the number of set layouts it needs: its highest set + 1
+        weights = [max((set1 for set1, _, _, _ in signature), default=-1) + 1 for signature in signatures]
+        colors, method = color_exact(conflicts, weights, colors, order)
+
+    # Number the layouts by their first signature, so the output is canonical
+    renumber = {}
+    for color in colors:
+        renumber.setdefault(color, len(renumber))
+
+    layouts = [[] for _ in renumber]
+    layout_pipelines = [[] for _ in renumber]
+    for signature, color in zip(signatures, colors):
+        layout_pipelines[renumber[color]].extend(signature_pipelines[signature])
+
+    # The pipelines of a layout never conflict, so their descriptors are filled in place
+    references = {}
+    for index, names in enumerate(layout_pipelines):
+        for pipeline_name in names:
+            for set1, bind, type, count, stages in pipeline_descriptors[pipeline_name]:
+                fill_set_slots(set1, bind, type, count, stages, layouts[index])
+            references[pipeline_name] = index
+    references = {name: references[name] for name in pipeline_names}
+    return layouts, references, method
+
+
+def optimize_pipeline_layouts(fm: VkForgeModel, data: dict, strategy: str = "pack") -> dict:
+    dset_dict = data[LAYOUT.DSET_LAYOUT]
+    reference_dict = data[LAYOUT.DSET_REF]
+
+    pipeline_names = list(reference_dict.keys())
+    pipeline_descriptors = get_pipeline_descriptors(dset_dict, reference_dict)
+
+    if strategy == "greedy":
+        layouts, references = optimize_greedy(pipeline_names, pipeline_descriptors)
+        method = "greedy"
+    elif strategy == "pack":
+        layouts, references, method = optimize_pack(pipeline_names, pipeline_descriptors)
+        method = f"pack, {method}"
+    else:
+        raise ValueError(f"Unknown layout strategy {strategy}. Use one of {LAYOUT_STRATEGIES}")
+
+    # One layout per pipeline, with sets up to its highest set, is what the runtime would create without merging
+    unmerged_set_layouts = sum(
+        max(set1 for set1, _, _, _, _ in descriptors) + 1
+        for descriptors in pipeline_descriptors.values() if descriptors
+    )
+    print(
+        f"LAYOUT: {len(pipeline_names)} pipeline(s) with descriptors, "
+        f"{len(pipeline_names)} -> {len(layouts)} pipeline layout(s), "
+        f"{unmerged_set_layouts} -> {count_set_layouts(layouts)} descriptor set layout(s) "
+        f"({method})"
+    )
+
     # This code does not generate empty pipeline layout
     # It must be manually added if needed
 
@@ -262,7 +491,144 @@ def optimize_pipeline_layouts(fm: VkForgeModel, data: dict) -> dict:
     }
 
 
-def combine_pipeline_descriptorset_layouts(fm: VkForgeModel, pipeline_dset_layouts_dict: Dict[str, List]):
+FREQUENCIES = ["frame", "material", "draw"] # lowest update frequency first
+BUFFER_TYPES = [REFLECT.UBO, REFLECT.SSBO]
+IMAGE_TYPES = [REFLECT.IMAGE, REFLECT.TEXTURE, REFLECT.SAMPLER_IMAGE, REFLECT.SAMPLER]
+
+
+def get_shader_binding_names(shaders: dict) -> Dict[str, Dict[Tuple[int, int], set]]:
+    """Names each shader gives to each (set, binding)."""
+    shader_names = {}
+    for shader_id, shader_data in shaders[SHADER.LIST].items():
+        names = {}
+        for dset_type, members in shader_data[SHADER.REFLECT].items():
+            if dset_type in BUFFER_TYPES + IMAGE_TYPES:
+                for member in members:
+                    key = (member[MEMBER.SET], member[MEMBER.BIND])
+                    names.setdefault(key, set()).add(member[MEMBER.NAME])
+        shader_names[shader_id] = names
+    return shader_names
+
+
+def find_annotated_frequency(annotations: list, names: set, set1: int, binding: int):
+    found = [
+        annotation.frequency for annotation in annotations
+        if (annotation.name in names if annotation.name is not None
+            else annotation.set == set1 and annotation.binding in (None, binding))
+    ]
+    return max(found, key=FREQUENCIES.index) if found else None
+
+
+def infer_frequency(type: str, users: int, pipeline_count: int) -> str:
+    if not type in BUFFER_TYPES:
+        return "material"
+    if pipeline_count > 1 and users == pipeline_count:
+        return "frame"
+    return "draw"
+
+
+def assign_set_frequencies(fm: VkForgeModel, shaders: dict, raw_layout: dict, pipeline_layouts: dict) -> list:
+    """
+    Update frequency of each descriptor set of each pipeline layout: the highest frequency
+    of its bindings. Set numbers come from the shaders and are not changed, but a warning
+    is printed when a set changes more often than a set after it, since rebinding a set
+    means rebinding every set after it, or when a set with an annotated binding mixes
+    frequencies. Sets that only mix inferred frequencies are counted in the summary.
+    """
+    annotations = fm.DescriptorFrequency or []
+    shader_names = get_shader_binding_names(shaders)
+
+    hash_users = {}
+    for keys in raw_layout[LAYOUT.DSET_REF].values():
+        for key in keys:
+            hash_users[key] = hash_users.get(key, 0) + 1
+    users = {} # (set, binding, type, count) -> number of pipelines using it
+    for key, count in hash_users.items():
+        dset = raw_layout[LAYOUT.DSET_LAYOUT][key]
+        users[(dset[LAYOUT.SET], dset[LAYOUT.BIND], dset[LAYOUT.TYPE], dset[LAYOUT.COUNT])] = count
+    pipeline_count = len(raw_layout[LAYOUT.DSET_REF])
+
+    members = {}
+    for pipeline_name, index in pipeline_layouts[LAYOUT.REFERENCES].items():
+        members.setdefault(index, []).append(pipeline_name)
+
+    frequencies = []
+    inferred_count = 0
+    mixed_inferred_count = 0
+    warnings = []
+
+    known_names = set()
+    for names in shader_names.values():
+        for value in names.values():
+            known_names.update(value)
+    for annotation in annotations:
+        if annotation.name is not None and not annotation.name in known_names:
+            warnings.append(f"WARNING: DescriptorFrequency name {annotation.name} matches no descriptor.")
+    for index, layout in enumerate(pipeline_layouts[LAYOUT.LAYOUTS]):
+        if not layout:
+            frequencies.append(None)
+            continue
+
+        # Names of each (set, binding) across the distinct shaders of the layout's pipelines
+        shader_ids = {shader_id for pipeline_name in members.get(index, []) for shader_id in shaders[SHADER.COMBO][pipeline_name]}
+        layout_names = {}
+        for shader_id in sorted(shader_ids):
+            for key, value in shader_names.get(shader_id, {}).items():
+                layout_names.setdefault(key, set()).update(value)
+
+        set_frequencies = []
+        for set1, bind_slots in enumerate(layout):
+            if not bind_slots:
+                set_frequencies.append(None)
+                continue
+
+            bind_frequencies = {}
+            annotated = False
+            for binding, bind_slot in enumerate(bind_slots):
+                if not bind_slot:
+                    continue
+                type, count, _ = bind_slot
+                names = layout_names.get((set1, binding), set())
+                frequency = find_annotated_frequency(annotations, names, set1, binding)
+                if frequency is None:
+                    frequency = infer_frequency(type, users.get((set1, binding, type, count), 0), pipeline_count)
+                    inferred_count += 1
+                else:
+                    annotated = True
+                bind_frequencies[binding] = frequency
+
+            set_frequency = max(bind_frequencies.values(), key=FREQUENCIES.index)
+            if len(set(bind_frequencies.values())) > 1 and not annotated:
+                # A texture next to a per-draw buffer is common; nothing to act on without annotations
+                mixed_inferred_count += 1
+            elif len(set(bind_frequencies.values())) > 1:
+                listed = ", ".join(f"binding {b} per-{f}" for b, f in bind_frequencies.items())
+                warnings.append(
+                    f"WARNING: set {set1} of pipeline layout {index} mixes update frequencies ({listed}). "
+                    f"The whole set is rebound per-{set_frequency}."
+                )
+            set_frequencies.append(set_frequency)
+
+        used = [(set1, frequency) for set1, frequency in enumerate(set_frequencies) if frequency]
+        for (set1, frequency1), (set2, frequency2) in zip(used, used[1:]):
+            if FREQUENCIES.index(frequency1) > FREQUENCIES.index(frequency2):
+                warnings.append(
+                    f"WARNING: set {set1} of pipeline layout {index} changes per-{frequency1} but set {set2} "
+                    f"after it changes per-{frequency2}. Rebinding set {set1} also rebinds set {set2}; "
+                    f"lower frequency data should use lower set numbers."
+                )
+        frequencies.append(set_frequencies)
+
+    for warning in warnings:
+        print(warning)
+    print(
+        f"FREQUENCY: {inferred_count} binding(s) inferred, {len(annotations)} annotation(s), "
+        f"{mixed_inferred_count} set(s) mix inferred frequencies, {len(warnings)} warning(s)"
+    )
+    return frequencies
+
+
+def combine_pipeline_descriptorset_layouts(fm: VkForgeModel, pipeline_dset_layouts_dict: Dict[str, List], strategy: str = "pack"):
     layouts = {}
     references = {}
 
@@ -270,9 +636,9 @@ def combine_pipeline_descriptorset_layouts(fm: VkForgeModel, pipeline_dset_layou
         for dset_key, dset_layout in dset_layouts_dict.items():
             key = hash_tuple(dset_key)
             if not key in layouts:
-                layouts[key] = dset_layout
+                layouts[key] = dict(dset_layout, **{LAYOUT.STAGES: set(dset_layout[LAYOUT.STAGES])})
             else:
-                layouts[key][LAYOUT.STAGES].union(dset_layout[LAYOUT.STAGES])
+                layouts[key][LAYOUT.STAGES] |= dset_layout[LAYOUT.STAGES]
             if not pipeline_name in references:
                 references[pipeline_name] = set()
             references[pipeline_name].add(key)
@@ -283,27 +649,42 @@ def combine_pipeline_descriptorset_layouts(fm: VkForgeModel, pipeline_dset_layou
         LAYOUT.DSET_LAYOUT: layouts,
         LAYOUT.DSET_REF: references
     }
-    pipeline_layouts = optimize_pipeline_layouts(fm, pipeline_descriptorset_layouts)
+    with span("optimize_pipeline_layouts"):
+        pipeline_layouts = optimize_pipeline_layouts(fm, pipeline_descriptorset_layouts, strategy)
 
     return {
         LAYOUT.RAW_LAYOUT: pipeline_descriptorset_layouts,
         LAYOUT.PIPELINE_LAYOUT: pipeline_layouts
     }
 
-def create_pipeline_layouts(fm: VkForgeModel, shaders: dict):
+def create_pipeline_layouts(fm: VkForgeModel, shaders: dict, strategy: str = "pack"):
     shader_dsets = {}
+    errors = []
 
-    for shader_id, shader_data in shaders[SHADER.LIST].items():
-        reflect = shader_data[SHADER.REFLECT]
+    with span("create_descriptorsets"):
+        for shader_id, shader_data in shaders[SHADER.LIST].items():
+            reflect = shader_data[SHADER.REFLECT]
+
+            print_unsupported_warning(shader_id, reflect)
+            raise_unrecognized_error(shader_id, reflect)
 
-        print_unsupported_warning(shader_id, reflect)
-        raise_unrecognized_error(shader_id, reflect)
+            dsets = create_descriptorsets(shader_data)
+            errors.extend(find_single_descriptorset_conflicts(shader_id, dsets))
 
-        dsets = create_descriptorsets(shader_data)
-        check_for_errors_single_descriptorsets(shader_id, dsets)
+            shader_dsets[shader_id] = dsets
 
-        shader_dsets[shader_id] = dsets
-    check_for_errors_group_descriptorsets(shaders[SHADER.COMBO], shader_dsets)
+    with span("check_descriptorset_conflicts"):
+        errors.extend(find_group_descriptorset_conflicts(shaders[SHADER.COMBO], shader_dsets))
+        raise_descriptorset_conflicts(errors)
 
-    pipeline_dset_layouts_dict = create_pipeline_descriptorset_layouts(shaders[SHADER.COMBO], shader_dsets)
-    return combine_pipeline_descriptorset_layouts(fm, pipeline_dset_layouts_dict)
+    with span("create_pipeline_descriptorset_layouts"):
+        pipeline_dset_layouts_dict = create_pipeline_descriptorset_layouts(shaders[SHADER.COMBO], shader_dsets)
+
+    with span("combine_pipeline_descriptorset_layouts"):
+        layout = combine_pipeline_descriptorset_layouts(fm, pipeline_dset_layouts_dict, strategy)
+
+    with span("assign_set_frequencies"):
+        layout[LAYOUT.FREQUENCIES] = assign_set_frequencies(
+            fm, shaders, layout[LAYOUT.RAW_LAYOUT], layout[LAYOUT.PIPELINE_LAYOUT]
+        )
+    return layout
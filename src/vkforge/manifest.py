@@ -0,0 +1,162 @@
+from pathlib import Path
+from typing import Any, Optional
+from dataclasses import is_dataclass, fields
+from importlib import metadata
+from pydantic import BaseModel
+import json
+from .cache import hash_bytes, hash_file, write_atomic
+
+MANIFEST_FILE = ".VkForgeGeneration"
+MANIFEST_FORMAT = 1
+
+
+def deep_serialize(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        new_dict = {}
+        for k, v in obj.items():
+            # Convert tuple keys to strings
+            if isinstance(k, tuple):
+                new_key = str(k)
+            else:
+                new_key = k
+            new_dict[new_key] = deep_serialize(v)
+        return new_dict
+
+    elif isinstance(obj, list):
+        return [deep_serialize(v) for v in obj]
+
+    elif isinstance(obj, tuple):
+        return [deep_serialize(v) for v in obj]  # Optionally keep as tuple
+
+    elif isinstance(obj, set):
+        # sets → sorted list for JSON so the output does not depend on hash order
+        return sorted([deep_serialize(v) for v in obj], key=str)
+
+    elif isinstance(obj, Path):
+        return str(obj)
+
+    elif isinstance(obj, BaseModel):
+        values = {k: deep_serialize(v) for k, v in obj.model_dump().items()}
+        return values
+
+    elif is_dataclass(obj):
+        data = {f.name: deep_serialize(getattr(obj, f.name)) for f in fields(obj)}
+        return data
+
+    else:
+        return obj
+
+
+def encode_tagged(obj: Any) -> Any:
+    """Like deep_serialize but tags tuples and sets so decode_tagged can restore them."""
+    if isinstance(obj, dict):
+        return {k: encode_tagged(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [encode_tagged(v) for v in obj]
+    elif isinstance(obj, tuple):
+        return {"__tuple__": [encode_tagged(v) for v in obj]}
+    elif isinstance(obj, set):
+        return {"__set__": sorted([encode_tagged(v) for v in obj], key=str)}
+    return obj
+
+
+def decode_tagged(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        if "__tuple__" in obj:
+            return tuple(decode_tagged(v) for v in obj["__tuple__"])
+        if "__set__" in obj:
+            return set(decode_tagged(v) for v in obj["__set__"])
+        return {k: decode_tagged(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [decode_tagged(v) for v in obj]
+    return obj
+
+
+def get_generator_fingerprint() -> str:
+    """
+    Identify the running VkForge: its version plus the content of its own modules,
+    so that upgrading VkForge or editing a template invalidates every artifact.
+    """
+    try:
+        version = metadata.version("vkforge")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+
+    parts = [version]
+    package_dir = Path(__file__).parent
+    for path in sorted(package_dir.rglob("*.py")):
+        parts.extend([str(path.relative_to(package_dir)), path.read_bytes()])
+    return hash_bytes(*parts)
+
+
+class Manifest:
+    """
+    Build manifest stored in <build-dir>/.VkForgeGeneration.
+
+    For every generated file it records a fingerprint of the inputs the file was
+    rendered from and the hash of the file written. A file whose inputs and
+    on-disk content both still match does not need to be rendered again.
+    The pipeline layout is stored as well, keyed by the fingerprint of the
+    shader reflections it was computed from.
+    """
+
+    def __init__(self, build_dir: str, force: bool = False):
+        self.path = Path(build_dir) / MANIFEST_FILE
+        self.generator = get_generator_fingerprint()
+        self.artifacts = {}
+        self.layout = None
+        self.previous = {}
+
+        if not force:
+            self.previous = self.load()
+
+    def load(self) -> dict:
+        try:
+            data = json.loads(self.path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict):
+            return {}
+        if data.get("format") != MANIFEST_FORMAT or data.get("generator") != self.generator:
+            return {}
+        return data
+
+    def fingerprint(self, *inputs: Any) -> str:
+        serialized = json.dumps(deep_serialize(list(inputs)), sort_keys=True, default=str)
+        return hash_bytes(self.generator, serialized)
+
+    def is_current(self, filename: str, inputs: str, filepath: Path) -> bool:
+        entry = self.previous.get("artifacts", {}).get(str(filename))
+        if not entry or entry.get("inputs") != inputs:
+            return False
+        try:
+            return hash_file(filepath) == entry.get("output")
+        except FileNotFoundError:
+            return False
+
+    def record(self, filename: str, inputs: str, filepath: Path):
+        try:
+            output = hash_file(filepath)
+        except FileNotFoundError:
+            return
+        self.artifacts[str(filename)] = {"inputs": inputs, "output": output}
+
+    def get_layout(self, key: str) -> Optional[dict]:
+        cached = self.previous.get("layout")
+        if cached and cached.get("key") == key:
+            self.layout = cached
+            return decode_tagged(cached["value"])
+        return None
+
+    def set_layout(self, key: str, layout: dict):
+        self.layout = {"key": key, "value": encode_tagged(layout)}
+
+    def save(self):
+        data = {
+            "format": MANIFEST_FORMAT,
+            "generator": self.generator,
+            "layout": self.layout,
+            "artifacts": self.artifacts,
+        }
+        write_atomic(self.path, json.dumps(data, indent=4).encode("utf-8"))
+        print(f"GENERATED: {self.path}")
@@ -236,6 +236,9 @@ GLSL_TYPE_MAP = {
 from enum import Enum
 
 class StringEnum(str, Enum):
+    def __str__(self):
+        return self.value
+
     def __format__(self, format_spec):
         return format(self.value, format_spec)
 
@@ -243,6 +246,8 @@ class SHADER(StringEnum):
     MODE      = "mode"
     ENTRYNAME = "entryname"
     BINPATH   = "binary_path"
+    CODEPATH  = "code_path"
+    DIGEST    = "digest"
     SRCPATH   = "source_path"
     REFLECT   = "reflect"
     LIST      = "shader_list"
@@ -260,6 +265,7 @@ class LAYOUT(StringEnum):
     RAW_LAYOUT      = "raw_layouts"
     LAYOUTS         = "layouts"
     REFERENCES      = "references"
+    FREQUENCIES     = "frequencies"
 
 class REFLECT(StringEnum):
     TEXTURE       = "textures"
@@ -299,4 +305,7 @@ class FILE(StringEnum):
     LAYOUT_C   = "vkforge_layout.c"
     CMAKE      = "CMakeLists.txt"
     LAYOUT_H   = "vkforge_layout.h"
+    SHADER_PACK = "vkforge_shaders.pack"
+    PIPELINE_CACHE = "vkforge_pipeline_cache.bin"
+    PRIME      = "vkforge_prime.c"
 
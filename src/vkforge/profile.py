@@ -0,0 +1,105 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+import subprocess
+import threading
+import time
+
+# Generator profiler
+#
+# Spans are recorded as Chrome trace events ("ph": "X") and can be loaded in
+# chrome://tracing or https://ui.perfetto.dev. Profiling is off unless enable()
+# is called, in which case span() costs nothing beyond a None check.
+
+
+class Profiler:
+    def __init__(self):
+        self.events: List[dict] = []
+        self.start_ns = time.perf_counter_ns()
+        self.lock = threading.Lock()
+
+    def add(self, name: str, cat: str, start_ns: int, end_ns: int, args: dict = None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start_ns / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+
+    def drain(self) -> List[dict]:
+        with self.lock:
+            events, self.events = self.events, []
+        return events
+
+    def extend(self, events: List[dict]):
+        with self.lock:
+            self.events.extend(events)
+
+    def save(self, path: str):
+        # perf_counter is a system-wide monotonic clock, so spans from worker processes line up
+        events = [dict(event, ts=event["ts"] - self.start_ns / 1000) for event in self.events]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        print(f"GENERATED: {path}")
+
+    def summary(self) -> str:
+        wall = (time.perf_counter_ns() - self.start_ns) / 1e6
+        totals = {}
+        for event in self.events:
+            calls, total, longest = totals.get(event["name"], (0, 0.0, 0.0))
+            duration = event["dur"] / 1000
+            totals[event["name"]] = (calls + 1, total + duration, max(longest, duration))
+
+        width = max([len("Phase")] + [len(name) for name in totals])
+        lines = [
+            f"{'Phase':<{width}}  {'Calls':>6}  {'Total ms':>10}  {'Max ms':>10}  {'% wall':>7}",
+            "-" * (width + 41),
+        ]
+        for name, (calls, total, longest) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            lines.append(
+                f"{name:<{width}}  {calls:>6}  {total:>10.1f}  {longest:>10.1f}  {100 * total / wall:>6.1f}%"
+            )
+        lines.append(f"Wall time: {wall:.1f} ms (parallel phases can add up to more than 100%)")
+        return "\n".join(lines)
+
+
+PROFILER: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    global PROFILER
+    PROFILER = Profiler()
+    return PROFILER
+
+
+def is_enabled() -> bool:
+    return PROFILER is not None
+
+
+@contextmanager
+def span(name: str, cat: str = "vkforge", **args):
+    if PROFILER is None:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        PROFILER.add(name, cat, start, time.perf_counter_ns(), {k: str(v) for k, v in args.items()})
+
+
+def run_tool(cmd: list, **kwargs) -> subprocess.CompletedProcess:
+    """subprocess.run, recorded as a span named after the tool."""
+    with span(Path(str(cmd[0])).name, "tool", command=" ".join(str(x) for x in cmd)):
+        return subprocess.run(cmd, **kwargs)
@@ -48,6 +48,34 @@ class UserDefinedModel(BaseModel):
         "Eg: - struct MyStruct; - extern int MyVar;"
     )
 
+class DescriptorFrequencyModel(BaseModel):
+    frequency: Literal["frame", "material", "draw"] = Field(
+        ...,
+        description="How often the descriptor changes: once per frame, per material or per draw. "
+        "Lower frequency data should sit in lower set numbers, so that binding a set only "
+        "disturbs the sets after it."
+    )
+    name: Optional[str] = Field(
+        default=None,
+        description="Name of the descriptor in the shaders, e.g. the uniform block instance or sampler name."
+    )
+    set: Optional[int] = Field(
+        default=None,
+        description="Descriptor set, for annotating by number instead of name."
+    )
+    binding: Optional[int] = Field(
+        default=None,
+        description="Binding within set. If omitted, the annotation covers the whole set."
+    )
+
+    @model_validator(mode="after")
+    def validate_target(self):
+        if (self.name is None) == (self.set is None):
+            raise ValueError("DescriptorFrequency: give either name or set.")
+        if self.binding is not None and self.set is None:
+            raise ValueError("DescriptorFrequency: binding requires set.")
+        return self
+
 class VkInstanceCreateInfoModel(BaseModel):
     
     useValidationFeatureEnableBestPracticesEXT: Optional[bool] = Field(
@@ -609,7 +637,8 @@ class VkForgeModel(BaseModel):
             FILE.TYPE,
             FILE.UTIL,
             FILE.LAYOUT_C,
-            FILE.LAYOUT_H
+            FILE.LAYOUT_H,
+            FILE.PRIME
         ]]
     ] = Field(
         default=None,
@@ -621,7 +650,8 @@ class VkForgeModel(BaseModel):
 
     CompileOnce: Optional[List[str]] = Field(
         default=None,
-        descriptions="List of shader source path you do not want to be re-compiled on each VkForge call. Path match path under Pipeline of config."
+        description="Deprecated and ignored. VkForge caches compiled shaders by the content of the source, "
+        "its includes, the compiler and its flags, so unchanged shaders are never re-compiled."
     )
 
     InstanceCreateInfo: Optional[VkInstanceCreateInfoModel] = Field(
@@ -643,6 +673,20 @@ class VkForgeModel(BaseModel):
 
     Pipeline: List[VkPipelineModel] = Field(..., description="List of graphics pipelines.")
 
+    DescriptorFrequency: Optional[List[DescriptorFrequencyModel]] = Field(
+        default=None,
+        description="Update frequency of descriptors. Descriptors that are not listed are inferred: "
+        "images and samplers are per-material, buffers shared by every pipeline are per-frame and "
+        "other buffers are per-draw. VkForge warns when a set changes more often than a set after it, "
+        "or when a set with a listed descriptor mixes frequencies."
+    )
+
+    PipelinePrewarm: Optional[List[str]] = Field(
+        default=None,
+        description="Names of the pipelines that the pre-warm thread of a VkForgePipelineTable creates first, "
+        "highest priority first. It then creates every other pipeline in id order, unless a bind created it already."
+    )
+
     @model_validator(mode="before")
     @classmethod
     def check_id_present_and_valid(cls, data):
@@ -652,6 +696,17 @@ class VkForgeModel(BaseModel):
             raise ValueError("Invalid VkForge Config")
         return data
     
+    @model_validator(mode="after")
+    def validate_pipeline_prewarm(self):
+        names = {pipeline.name for pipeline in self.Pipeline}
+        prewarm = self.PipelinePrewarm or []
+        unknown = [name for name in prewarm if name not in names]
+        if unknown:
+            raise ValueError(f"PipelinePrewarm: unknown pipelines {', '.join(unknown)}.")
+        if len(set(prewarm)) != len(prewarm):
+            raise ValueError("PipelinePrewarm: a pipeline is listed more than once.")
+        return self
+
     @model_validator(mode="after")
     def validate_user_defined_for_type_stride(self):
         """Ensure UserDefined is defined when stride uses a TYPE."""
@@ -1,12 +1,29 @@
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 from pathlib import Path
 import os
+import re
 import subprocess
 import json
-import subprocess
 from .schema import VkForgeModel
 from .mappings import *
+from .cache import ContentCache, MEBIBYTE, hash_bytes, hash_file, write_atomic
+from .spirv import SpirvError, reflect_spirv
+from .profile import run_tool, span
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+COMPILE_FLAGS = ["-V"]
+REFLECTORS = ["spirv-cross", "native"]
+LINKERS = ["native", "glslang"]
+
+STAGE_ORDER = ["vert", "tesc", "tese", "geom", "task", "mesh", "frag"]
+ARRAYED_INPUT_STAGES = {"tesc", "tese", "geom"}
+ARRAYED_OUTPUT_STAGES = {"tesc", "mesh"}
+DESCRIPTOR_REFLECT_KEYS = [
+    REFLECT.UBO, REFLECT.SSBO, REFLECT.TEXTURE, REFLECT.IMAGE,
+    REFLECT.SAMPLER_IMAGE, REFLECT.SAMPLER, REFLECT.SUBPASS, "acceleration_structures"
+]
+INCLUDE_PATTERN = re.compile(rb'^[ \t]*#[ \t]*include[ \t]*[<"]([^>"]+)[>"]', re.MULTILINE)
 
 def find_shader(roots: List[str], id: str) -> Path:
     file_path = Path(id)
@@ -37,7 +54,7 @@ def disassemble_shader(build_dir: str, shader_path: Path, mode: str) -> Path:
     Path(build_dir).mkdir(parents=True, exist_ok=True)
 
     try:
-        subprocess.run(
+        run_tool(
             ["spirv-cross", "-h"],
             check=True,
             stdout=subprocess.PIPE,
@@ -50,7 +67,7 @@ def disassemble_shader(build_dir: str, shader_path: Path, mode: str) -> Path:
     except subprocess.CalledProcessError:
         pass
 
-    result = subprocess.run(
+    result = run_tool(
         [
             "spirv-cross",
             str(shader_path),
@@ -84,9 +101,74 @@ def copy_shader(source_dir: str, copy_dir: str, shader_path: Path, fm: VkForgeMo
             shutil.copy2(source_from, copy_to)
             print(f"COPIED: -> {copy_to}")
 
-def compile_shader(build_dir: str, copy_dir: str, shader_path: Path, fm: VkForgeModel) -> Path:
+def find_shader_includes(shader_path: Path) -> List[Path]:
+    """Transitively collect every file #include'd by a GLSL source, itself first."""
+    files = []
+    seen = set()
+    pending = [Path(shader_path)]
+
+    while pending:
+        path = pending.pop(0)
+        resolved = path.resolve()
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+        files.append(path)
+
+        with open(path, "rb") as f:
+            source = f.read()
+        for match in INCLUDE_PATTERN.finditer(source):
+            include = path.parent / match.group(1).decode("utf-8")
+            if include.exists():
+                pending.append(include)
+    return files
+
+def get_compiler_identity() -> Optional[str]:
+    """Identify the glslangValidator executable without spawning it, or None if it is not on PATH."""
+    compiler = shutil.which("glslangValidator")
+    if not compiler:
+        return None
+    st = os.stat(compiler)
+    return f"{os.path.realpath(compiler)}:{st.st_size}:{st.st_mtime_ns}"
+
+def get_compile_keys(shader_path: Path) -> Tuple[Optional[str], str]:
+    """
+    Cache keys of a shader: one that also covers the compiler, None when the compiler
+    is not on PATH, and one that only covers the sources and flags.
+    """
+    parts = [" ".join(COMPILE_FLAGS), shader_path.suffix]
+    for include in find_shader_includes(shader_path):
+        with open(include, "rb") as f:
+            parts.extend([include.name, f.read()])
+    compiler = get_compiler_identity()
+    return (hash_bytes(compiler, *parts) if compiler else None), hash_bytes(*parts)
+
+def write_if_different(path: Path, data: bytes) -> bool:
+    if path.exists() and path.read_bytes() == data:
+        return False
+    write_atomic(path, data)
+    return True
+
+def compile_shader(build_dir: str, copy_dir: str, shader_path: Path, fm: VkForgeModel, cache: ContentCache = None) -> Path:
+    build_dir = Path(build_dir)
+    build_dir.mkdir(parents=True, exist_ok=True)
+
+    # Compose output path
+    output_file: Path = build_dir / (shader_path.name + ".spv")
+
+    key = source_key = None
+    if cache and cache.enabled:
+        with span("compile_key", shader=shader_path.name):
+            key, source_key = get_compile_keys(shader_path)
+        # Without the compiler, reuse what a compiler last built from the same sources and flags
+        cached = cache.get(key or source_key, ".spv")
+        if cached:
+            write_if_different(output_file, cached.read_bytes())
+            print(f"CACHED: {shader_path.name} -> {str(output_file)}")
+            return output_file
+
     try:
-        subprocess.run(
+        run_tool(
             ["glslangValidator", "-h"],
             check=True,
             stdout=subprocess.PIPE,
@@ -99,20 +181,9 @@ def compile_shader(build_dir: str, copy_dir: str, shader_path: Path, fm: VkForge
     except subprocess.CalledProcessError:
         pass
 
-    build_dir = Path(build_dir)
-    build_dir.mkdir(parents=True, exist_ok=True)
-
-    # Compose output path
-    output_file: Path = build_dir / (shader_path.name + ".spv")
-
-    if fm.CompileOnce:
-        if shader_path.name in fm.CompileOnce and output_file.exists():
-            print(f"SKIPPED (CompileOnce): {shader_path.name}")
-            return output_file
-
     # Compile GLSL to SPIR-V
-    result = subprocess.run(
-        ["glslangValidator", "-V", str(shader_path), "-o", str(output_file)],
+    result = run_tool(
+        ["glslangValidator"] + COMPILE_FLAGS + [str(shader_path), "-o", str(output_file)],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         text=True,
@@ -127,12 +198,18 @@ def compile_shader(build_dir: str, copy_dir: str, shader_path: Path, fm: VkForge
     
     print(f"COMPILED: {shader_path.name} -> {str(output_file)}")
 
+    if source_key:
+        data = output_file.read_bytes()
+        if key:
+            cache.put(key, data, ".spv")
+        cache.put(source_key, data, ".spv")
+
     return output_file
 
 
 def reflect_shader(shader_path: Path) -> dict:
     try:
-        subprocess.run(
+        run_tool(
             ["spirv-cross", "-h"],
             check=True,
             stdout=subprocess.PIPE,
@@ -146,7 +223,7 @@ def reflect_shader(shader_path: Path) -> dict:
         pass
 
     # Run reflection
-    result = subprocess.run(
+    result = run_tool(
         ["spirv-cross", str(shader_path), "--reflect"],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
@@ -170,6 +247,44 @@ def reflect_shader(shader_path: Path) -> dict:
     return reflection_data
 
 
+def reflect_shader_with(reflector: str, shader_path: Path, spirv: bytes) -> dict:
+    if reflector == "native":
+        try:
+            return reflect_spirv(spirv)
+        except SpirvError as e:
+            print(f"WARNING: native reflection failed for {shader_path} ({e}). Falling back to spirv-cross.")
+    return reflect_shader(shader_path)
+
+
+def reflect_shader_cached(
+    id: str, shader_path: Path, cache: ContentCache, reflector: str = "spirv-cross"
+) -> Tuple[dict, Tuple[str, str]]:
+    """
+    Reflect a SPIR-V binary and get its entrypoint. Results are cached under the
+    SHA-256 of the binary (and the reflector used) so an unchanged binary is never reflected again.
+    """
+    with open(shader_path, "rb") as f:
+        spirv = f.read()
+
+    key = None
+    if cache and cache.enabled:
+        key = hash_bytes(reflector, spirv)
+        cached = cache.get(key, ".json")
+        if cached:
+            data = json.loads(cached.read_bytes())
+            return data["reflect"], tuple(data["entrypoint"])
+
+    with span("reflect_shader", shader=id, reflector=reflector):
+        spirv_reflect = reflect_shader_with(reflector, shader_path, spirv)
+    entrypoint = get_shader_entrypoint(id, spirv_reflect)
+
+    if key:
+        data = {"reflect": spirv_reflect, "entrypoint": entrypoint}
+        cache.put(key, json.dumps(data, separators=(",", ":")).encode("utf-8"), ".json")
+
+    return spirv_reflect, entrypoint
+
+
 def get_shader_entrypoint(id: str, r: dict) -> Tuple[str, str]:
     entrypoints = r.get("entryPoints")
     if entrypoints:
@@ -190,9 +305,9 @@ def get_shader_entrypoint(id: str, r: dict) -> Tuple[str, str]:
     return (name, mode)
 
 
-def validate_shader_combination(build_dir: str, shader_list: List[dict]):
+def validate_shader_combination(build_dir: str, shader_list: List[dict], name: str = "shader_validation"):
     try:
-        subprocess.run(
+        run_tool(
             ["glslangValidator", "-h"],
             check=True,
             stdout=subprocess.PIPE,
@@ -208,9 +323,9 @@ def validate_shader_combination(build_dir: str, shader_list: List[dict]):
     shader_sources = [shader[SHADER.SRCPATH] for shader in shader_list]
     build_dir = Path(build_dir)
     build_dir.mkdir(parents=True, exist_ok=True)
-    output_file = build_dir / "validation" / ("shader_validation" + ".mod")  
+    output_file = build_dir / "validation" / (name + ".mod")
 
-    result = subprocess.run(
+    result = run_tool(
         ["glslangValidator", "-l"] + shader_sources + ["-V", "-o", output_file],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
@@ -225,74 +340,225 @@ def validate_shader_combination(build_dir: str, shader_list: List[dict]):
         )
 
 
+def get_interface_variables(shader: dict, key: str, arrayed: bool) -> Dict[int, dict]:
+    variables = {}
+    for variable in shader[SHADER.REFLECT].get(key, []):
+        location = variable.get(ATTR.LOCATION)
+        if location is None:
+            continue
+        variables[location] = {
+            MEMBER.TYPE: variable[MEMBER.TYPE],
+            MEMBER.NAME: variable.get(MEMBER.NAME, ""),
+            # Per-vertex interfaces (tessellation, geometry, mesh) carry an extra outer array
+            MEMBER.ARRAY: None if arrayed else variable.get(MEMBER.ARRAY, []),
+        }
+    return variables
+
+
+def get_descriptor_bindings(shader: dict) -> Dict[Tuple[int, int], tuple]:
+    bindings = {}
+    for key in DESCRIPTOR_REFLECT_KEYS:
+        for resource in shader[SHADER.REFLECT].get(key, []):
+            type = key if key in (REFLECT.UBO, REFLECT.SSBO) else resource[MEMBER.TYPE]
+            bindings[(resource.get(MEMBER.SET, 0), resource.get(MEMBER.BIND, 0))] = (
+                type, resource.get(MEMBER.ARRAY, [])
+            )
+    return bindings
+
+
+def link_shader_combination(pipeline_name: str, shaders: Dict[str, dict]):
+    """
+    Check in-process that the shaders of a pipeline fit together, from their reflections:
+    each stage input must be written by the previous stage at the same location with
+    the same type and array size, and a (set, binding) used by several stages must
+    have the same descriptor type and array size in all of them.
+    """
+    errors = []
+    ordered = sorted(
+        shaders.items(),
+        key=lambda item: STAGE_ORDER.index(item[1][SHADER.MODE]) if item[1][SHADER.MODE] in STAGE_ORDER else len(STAGE_ORDER)
+    )
+
+    modes = {}
+    for id, shader in ordered:
+        mode = shader[SHADER.MODE]
+        if mode in modes:
+            errors.append(f"{modes[mode]} and {id} are both {mode} shaders")
+        modes[mode] = id
+
+    stages = [(id, shader) for id, shader in ordered if shader[SHADER.MODE] in STAGE_ORDER]
+    for (producer_id, producer), (consumer_id, consumer) in zip(stages, stages[1:]):
+        if producer[SHADER.MODE] == "task":
+            continue  # task -> mesh communicates through the payload, not locations
+        outputs = get_interface_variables(producer, REFLECT.OUTPUT, producer[SHADER.MODE] in ARRAYED_OUTPUT_STAGES)
+        inputs = get_interface_variables(consumer, REFLECT.INPUT, consumer[SHADER.MODE] in ARRAYED_INPUT_STAGES)
+        for location, input in sorted(inputs.items()):
+            output = outputs.get(location)
+            if not output:
+                errors.append(
+                    f"{consumer_id} reads '{input[MEMBER.NAME]}' at location {location} "
+                    f"but {producer_id} writes nothing there"
+                )
+            elif output[MEMBER.TYPE] != input[MEMBER.TYPE]:
+                errors.append(
+                    f"location {location} is {output[MEMBER.TYPE]} '{output[MEMBER.NAME]}' in {producer_id} "
+                    f"but {input[MEMBER.TYPE]} '{input[MEMBER.NAME]}' in {consumer_id}"
+                )
+            elif None not in (output[MEMBER.ARRAY], input[MEMBER.ARRAY]) and output[MEMBER.ARRAY] != input[MEMBER.ARRAY]:
+                errors.append(
+                    f"location {location} has array size {output[MEMBER.ARRAY]} in {producer_id} "
+                    f"but {input[MEMBER.ARRAY]} in {consumer_id}"
+                )
+
+    seen = {}
+    for id, shader in ordered:
+        for (set1, binding), (type, array) in get_descriptor_bindings(shader).items():
+            if (set1, binding) not in seen:
+                seen[(set1, binding)] = (id, type, array)
+                continue
+            other_id, other_type, other_array = seen[(set1, binding)]
+            if (type, array) != (other_type, other_array):
+                errors.append(
+                    f"set {set1}, binding {binding} is {other_type}{other_array or ''} in {other_id} "
+                    f"but {type}{array or ''} in {id}"
+                )
+
+    if errors:
+        raise RuntimeError(
+            f"Shader interface mismatch in pipeline {pipeline_name}:\n  " + "\n  ".join(errors)
+        )
+
+
+def load_shader(
+    roots: List[str], build_dir: str, copy_dir: str|None, overwrite_dir:str|None, fm: VkForgeModel,
+    shader_cache: ContentCache, reflect_cache: ContentCache, reflector: str, linker: str, id: str
+) -> dict:
+    shader_path = find_shader(roots, id)
+    shader_ext = shader_path.suffix
+
+    if shader_is_source(shader_ext):
+        shader_source_path = shader_path
+        shader_binary_path = compile_shader(build_dir, copy_dir, shader_path, fm, shader_cache)
+        copy_shader(build_dir, copy_dir, shader_path, fm)
+        spirv_reflect, entrypoint = reflect_shader_cached(id, shader_binary_path, reflect_cache, reflector)
+        entryname, mode = entrypoint
+    elif shader_is_binary(shader_ext):
+        shader_binary_path = shader_path
+        copy_shader(shader_binary_path.stem, copy_dir, shader_path, fm)
+        spirv_reflect, entrypoint = reflect_shader_cached(id, shader_binary_path, reflect_cache, reflector)
+        entryname, mode = entrypoint
+        shader_source_path = None
+        if linker == "glslang":
+            # glslangValidator -l links GLSL, so binaries must be disassembled for it
+            shader_source_path = disassemble_shader(
+                build_dir, shader_binary_path, mode
+            )
+    else:
+        raise ValueError(
+            f"Can not determine if shader is GLSL source or "
+            "SPIR-V binary from the extension: {shader_ext}"
+        )
+
+    # The SPIR-V generated code embeds with --shader-storage embed, not the baked path
+    shader_code_path = shader_binary_path
+
+    if overwrite_dir:
+        baked_dir = Path(overwrite_dir) / shader_binary_path.name
+        print(f"BAKED({id}): {shader_binary_path} -> {baked_dir}")
+        shader_binary_path = baked_dir
+
+    return {
+        SHADER.MODE: mode,
+        SHADER.ENTRYNAME: entryname,
+        SHADER.BINPATH: shader_binary_path,
+        SHADER.CODEPATH: shader_code_path,
+        SHADER.DIGEST: hash_file(shader_code_path),
+        SHADER.SRCPATH: shader_source_path,
+        SHADER.REFLECT: spirv_reflect
+    }
+
 def load_shader_data(
-    roots: List[str], build_dir: str, copy_dir: str|None, overwrite_dir:str|None, fm: VkForgeModel
+    roots: List[str], build_dir: str, copy_dir: str|None, overwrite_dir:str|None, fm: VkForgeModel,
+    shader_cache_size: int = 256 * MEBIBYTE, jobs: int|None = None,
+    reflect_cache_size: int = 64 * MEBIBYTE, reflector: str = "spirv-cross",
+    known: Dict[str, dict] = None, validated: set = None, linker: str = "native"
 ):
+    """
+    Compile, reflect and validate every shader of every pipeline.
+    Shaders in known (id -> shader data from an earlier call) are reused as they are.
+    Each unique combination of shaders is linked once. Combinations in validated that are
+    made only of known shaders are not linked again; every linked combination is added to the set.
+    """
     shader_list: Dict[dict] = {}
     shader_combinations: Dict[str, List[list]] = {}
-    shader_seen = set()
+    shader_ids = []
+    shader_cache = ContentCache(build_dir, "spirv", shader_cache_size)
+    reflect_cache = ContentCache(build_dir, "reflect", reflect_cache_size)
 
+    if fm.CompileOnce:
+        print("WARNING: CompileOnce is deprecated and ignored. Compiled shaders are cached by content.")
+
+    known = known or {}
+    validated = validated if validated is not None else set()
+
+    # Phase 1: collect the unique shaders in config order
     for pipeline in fm.Pipeline:
-        pipeline_shader_list = []
         pipline_shader_combinations = []
-
         for shader_module in pipeline.ShaderModule:
             id = shader_module.path
             pipline_shader_combinations.append(id)
+            if not id in shader_list:
+                shader_list[id] = known.get(id)
+                if not id in known:
+                    shader_ids.append(id)
+        shader_combinations[pipeline.name] = pipline_shader_combinations
 
-            if not id in shader_seen:
-                shader_seen.add(id)
-
-                shader_path = find_shader(roots, id)
-                shader_ext = shader_path.suffix
-
-                if shader_is_source(shader_ext):
-                    shader_source_path = shader_path
-                    shader_binary_path = compile_shader(build_dir, copy_dir, shader_path, fm)
-                    copy_shader(build_dir, copy_dir, shader_path, fm)
-                    spirv_reflect = reflect_shader(shader_binary_path)
-                    entrypoint = get_shader_entrypoint(
-                        id, spirv_reflect
-                    )
-                    entryname, mode = entrypoint
-                elif shader_is_binary(shader_ext):
-                    shader_binary_path = shader_path
-                    copy_shader(shader_binary_path.stem, copy_dir, shader_path, fm)
-                    spirv_reflect = reflect_shader(shader_binary_path)
-                    entrypoint = get_shader_entrypoint(
-                        id, spirv_reflect
-                    )
-                    entryname, mode = entrypoint
-                    shader_source_path = disassemble_shader(
-                        build_dir, shader_binary_path, mode
-                    )
-                else:
-                    raise ValueError(
-                        f"Can not determine if shader is GLSL source or "
-                        "SPIR-V binary from the extension: {shader_ext}"
-                    )
-
-                if overwrite_dir:
-                    baked_dir = Path(overwrite_dir) / shader_binary_path.name
-                    print(f"BAKED({pipeline.name}): {shader_binary_path} -> {baked_dir}")
-                    shader_binary_path = baked_dir
-
-                shader = {
-                    SHADER.MODE: mode,
-                    SHADER.ENTRYNAME: entryname,
-                    SHADER.BINPATH: shader_binary_path,
-                    SHADER.SRCPATH: shader_source_path,
-                    SHADER.REFLECT: spirv_reflect
-                }
-
-                shader_list[id] = shader
+    # Phase 2: run each shader's tool chain on a worker pool.
+    # Shaders are independent so their tools can run concurrently;
+    # map() returns results in submission order which keeps the output deterministic.
+    def load(id: str) -> dict:
+        with span("load_shader", shader=id):
+            return load_shader(roots, build_dir, copy_dir, overwrite_dir, fm, shader_cache, reflect_cache, reflector, linker, id)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(shader_ids) > 1:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(shader_ids))) as pool:
+            shaders = list(pool.map(load, shader_ids))
+    else:
+        shaders = [load(id) for id in shader_ids]
+
+    for id, shader in zip(shader_ids, shaders):
+        shader_list[id] = shader
+
+    loaded = set(shader_ids)
+    pending = {}
+    for pipeline_name, shader_ids in shader_combinations.items():
+        # Pipelines sharing the same shaders only need to be linked once
+        combination = tuple(sorted(set(shader_ids)))
+        if combination in pending or (combination in validated and not loaded.intersection(shader_ids)):
+            continue
+        pending[combination] = pipeline_name
+
+    def link(combination: tuple):
+        pipeline_name = pending[combination]
+        with span("link_shaders", pipeline=pipeline_name, linker=linker):
+            if linker == "glslang":
+                pipeline_shader_list = [shader_list[id] for id in combination]
+                validate_shader_combination(build_dir, pipeline_shader_list, hash_bytes(*combination)[:16])
             else:
-                shader = shader_list.get(id)
-                if not shader:
-                    raise ValueError(f"Could not find shader details for {id}")
-            pipeline_shader_list.append(shader)
-        validate_shader_combination(build_dir, pipeline_shader_list)
-        shader_combinations[pipeline.name] = pipline_shader_combinations
+                link_shader_combination(pipeline_name, {id: shader_list[id] for id in combination})
+
+    if linker == "glslang" and jobs > 1 and len(pending) > 1:
+        with ThreadPoolExecutor(max_workers=min(jobs, len(pending))) as pool:
+            list(pool.map(link, pending))
+    else:
+        for combination in pending:
+            link(combination)
+    validated.update(pending)
+
+    with span("evict_caches"):
+        shader_cache.evict()
+        reflect_cache.evict()
     return {
         SHADER.LIST: shader_list,
         SHADER.COMBO: shader_combinations
@@ -0,0 +1,381 @@
+# Native SPIR-V Reflection
+#
+# Parses the SPIR-V word stream directly and produces the same dictionary
+# shape as `spirv-cross --reflect` for the subset of data VkForge consumes:
+# entry points, descriptor resources (set, binding, type, array size),
+# stage inputs/outputs and the struct types backing uniform/storage buffers.
+#
+# Reference: https://registry.khronos.org/SPIR-V/specs/unified1/SPIRV.html
+
+from array import array
+from typing import Dict, List, Tuple
+from .mappings import *
+
+MAGIC = 0x07230203
+MAGIC_SWAPPED = 0x03022307
+HEADER_WORDS = 5
+
+# Opcodes
+OP_NAME = 5
+OP_MEMBER_NAME = 6
+OP_ENTRY_POINT = 15
+OP_TYPE_VOID = 19
+OP_TYPE_BOOL = 20
+OP_TYPE_INT = 21
+OP_TYPE_FLOAT = 22
+OP_TYPE_VECTOR = 23
+OP_TYPE_MATRIX = 24
+OP_TYPE_IMAGE = 25
+OP_TYPE_SAMPLER = 26
+OP_TYPE_SAMPLED_IMAGE = 27
+OP_TYPE_ARRAY = 28
+OP_TYPE_RUNTIME_ARRAY = 29
+OP_TYPE_STRUCT = 30
+OP_TYPE_POINTER = 32
+OP_CONSTANT = 43
+OP_SPEC_CONSTANT = 50
+OP_VARIABLE = 59
+OP_DECORATE = 71
+OP_MEMBER_DECORATE = 72
+OP_TYPE_ACCELERATION_STRUCTURE = 5341
+
+# Decorations
+DEC_BLOCK = 2
+DEC_BUFFER_BLOCK = 3
+DEC_BUILTIN = 11
+DEC_LOCATION = 30
+DEC_BINDING = 33
+DEC_DESCRIPTOR_SET = 34
+DEC_OFFSET = 35
+
+# Storage classes
+SC_UNIFORM_CONSTANT = 0
+SC_INPUT = 1
+SC_UNIFORM = 2
+SC_OUTPUT = 3
+SC_PUSH_CONSTANT = 9
+SC_STORAGE_BUFFER = 12
+
+# Image dimensions
+DIM_NAMES = {0: "1D", 1: "2D", 2: "3D", 3: "Cube", 4: "2DRect", 5: "Buffer"}
+DIM_SUBPASS = 6
+
+EXECUTION_MODEL_MAP = {
+    0: "vert",
+    1: "tesc",
+    2: "tese",
+    3: "geom",
+    4: "frag",
+    5: "comp",
+    5267: "task",
+    5268: "mesh",
+    5313: "rgen",
+    5314: "rint",
+    5315: "rahit",
+    5316: "rchit",
+    5317: "rmiss",
+    5318: "rcall",
+    5364: "task",
+    5365: "mesh",
+}
+
+
+class SpirvError(ValueError):
+    pass
+
+
+def decode_string(words) -> str:
+    raw = bytearray()
+    for word in words:
+        chunk = word.to_bytes(4, "little")
+        end = chunk.find(0)
+        if end >= 0:
+            raw += chunk[:end]
+            break
+        raw += chunk
+    return raw.decode("utf-8")
+
+
+def read_words(data: bytes) -> array:
+    if len(data) < HEADER_WORDS * 4 or len(data) % 4:
+        raise SpirvError("SPIR-V binary size must be a non-zero multiple of 4 bytes")
+
+    words = array("I")
+    if words.itemsize != 4:
+        words = array("L")
+    words.frombytes(data)
+
+    if words[0] == MAGIC_SWAPPED:
+        words.byteswap()
+    elif words[0] != MAGIC:
+        raise SpirvError("Not a SPIR-V binary (bad magic number)")
+    return words
+
+
+class SpirvModule:
+    def __init__(self, data: bytes):
+        self.names: Dict[int, str] = {}
+        self.member_names: Dict[Tuple[int, int], str] = {}
+        self.decorations: Dict[int, Dict[int, list]] = {}
+        self.member_decorations: Dict[Tuple[int, int], Dict[int, list]] = {}
+        self.types: Dict[int, tuple] = {}
+        self.constants: Dict[int, Tuple[int, bool]] = {}
+        self.variables: List[Tuple[int, int, int]] = []
+        self.entry_points: List[Tuple[int, str]] = []
+        self.parse(read_words(data))
+
+    def parse(self, words: array):
+        view = memoryview(words)
+        i = HEADER_WORDS
+        end = len(words)
+
+        while i < end:
+            word = words[i]
+            count = word >> 16
+            op = word & 0xFFFF
+            if count == 0 or i + count > end:
+                raise SpirvError(f"Malformed SPIR-V instruction at word {i}")
+            args = view[i + 1:i + count]
+            i += count
+
+            if op == OP_NAME:
+                self.names[args[0]] = decode_string(args[1:])
+            elif op == OP_MEMBER_NAME:
+                self.member_names[(args[0], args[1])] = decode_string(args[2:])
+            elif op == OP_ENTRY_POINT:
+                self.entry_points.append((args[0], decode_string(args[2:])))
+            elif op == OP_DECORATE:
+                self.decorations.setdefault(args[0], {})[args[1]] = args[2:].tolist()
+            elif op == OP_MEMBER_DECORATE:
+                self.member_decorations.setdefault((args[0], args[1]), {})[args[2]] = args[3:].tolist()
+            elif op == OP_VARIABLE:
+                self.variables.append((args[0], args[1], args[2]))
+            elif op == OP_CONSTANT:
+                self.constants[args[1]] = (args[2] if len(args) > 2 else 0, True)
+            elif op == OP_SPEC_CONSTANT:
+                self.constants[args[1]] = (args[2] if len(args) > 2 else 0, False)
+            elif op in (
+                OP_TYPE_VOID, OP_TYPE_BOOL, OP_TYPE_INT, OP_TYPE_FLOAT, OP_TYPE_VECTOR,
+                OP_TYPE_MATRIX, OP_TYPE_IMAGE, OP_TYPE_SAMPLER, OP_TYPE_SAMPLED_IMAGE,
+                OP_TYPE_ARRAY, OP_TYPE_RUNTIME_ARRAY, OP_TYPE_STRUCT, OP_TYPE_POINTER,
+                OP_TYPE_ACCELERATION_STRUCTURE,
+            ):
+                self.types[args[0]] = (op,) + tuple(args[1:].tolist())
+
+    def decoration(self, id: int, decoration: int, default=None):
+        literals = self.decorations.get(id, {}).get(decoration)
+        if literals is None:
+            return default
+        return literals[0] if literals else True
+
+    def is_builtin(self, type_id: int) -> bool:
+        t = self.types[type_id]
+        if t[0] == OP_TYPE_STRUCT:
+            return any(
+                DEC_BUILTIN in self.member_decorations.get((type_id, m), {})
+                for m in range(len(t) - 1)
+            )
+        return False
+
+    def strip_arrays(self, type_id: int) -> Tuple[int, List[int], List[bool]]:
+        sizes = []
+        literals = []
+        t = self.types[type_id]
+        while t[0] in (OP_TYPE_ARRAY, OP_TYPE_RUNTIME_ARRAY):
+            if t[0] == OP_TYPE_ARRAY:
+                size, literal = self.constants.get(t[2], (0, False))
+            else:
+                size, literal = 0, True
+            sizes.append(size)
+            literals.append(literal)
+            type_id = t[1]
+            t = self.types[type_id]
+        return type_id, sizes, literals
+
+    def type_name(self, type_id: int) -> str:
+        t = self.types[type_id]
+        op = t[0]
+
+        if op == OP_TYPE_VOID:
+            return "void"
+        if op == OP_TYPE_BOOL:
+            return "bool"
+        if op == OP_TYPE_INT:
+            width, signed = t[1], t[2]
+            if width == 32:
+                return "int" if signed else "uint"
+            return f"{'' if signed else 'u'}int{width}_t"
+        if op == OP_TYPE_FLOAT:
+            return {16: "float16_t", 32: "float", 64: "double"}.get(t[1], f"float{t[1]}_t")
+        if op == OP_TYPE_VECTOR:
+            return f"{self.vector_prefix(t[1])}vec{t[2]}"
+        if op == OP_TYPE_MATRIX:
+            column = self.types[t[1]]
+            columns, rows = t[2], column[2]
+            prefix = "d" if self.types[column[1]] == (OP_TYPE_FLOAT, 64) else ""
+            if columns == rows:
+                return f"{prefix}mat{columns}"
+            return f"{prefix}mat{columns}x{rows}"
+        if op == OP_TYPE_IMAGE:
+            return self.image_name(type_id)
+        if op == OP_TYPE_SAMPLED_IMAGE:
+            return self.image_name(t[1], combined=True)
+        if op == OP_TYPE_SAMPLER:
+            return "sampler"
+        if op == OP_TYPE_STRUCT:
+            return f"_{type_id}"
+        if op == OP_TYPE_ACCELERATION_STRUCTURE:
+            return "accelerationStructureEXT"
+        if op in (OP_TYPE_ARRAY, OP_TYPE_RUNTIME_ARRAY):
+            return self.type_name(t[1])
+        raise SpirvError(f"Unsupported SPIR-V type opcode {op}")
+
+    def vector_prefix(self, component_id: int) -> str:
+        component = self.types[component_id]
+        if component[0] == OP_TYPE_BOOL:
+            return "b"
+        if component[0] == OP_TYPE_INT:
+            return "i" if component[2] else "u"
+        if component[0] == OP_TYPE_FLOAT and component[1] == 64:
+            return "d"
+        if component[0] == OP_TYPE_FLOAT and component[1] == 16:
+            return "f16"
+        return ""
+
+    def image_name(self, image_id: int, combined: bool = False) -> str:
+        _, sampled_type, dim, depth, arrayed, ms, sampled = self.types[image_id][:7]
+        prefix = self.vector_prefix(sampled_type)
+        if prefix in ("d", "f16", "b"):
+            prefix = ""
+
+        if dim == DIM_SUBPASS:
+            return prefix + "subpassInput" + ("MS" if ms else "")
+
+        dim_name = DIM_NAMES.get(dim, "2D")
+        suffix = ("MS" if ms else "") + ("Array" if arrayed else "")
+
+        if combined:
+            return prefix + "sampler" + dim_name + suffix + ("Shadow" if depth == 1 else "")
+        if sampled == 2:
+            return prefix + "image" + dim_name + suffix
+        if dim_name == "Buffer":
+            return prefix + "samplerBuffer"
+        return prefix + "texture" + dim_name + suffix
+
+    def resource_kind(self, type_id: int, storage: int) -> str:
+        t = self.types[type_id]
+        op = t[0]
+
+        if storage == SC_UNIFORM_CONSTANT:
+            if op == OP_TYPE_SAMPLED_IMAGE:
+                return REFLECT.TEXTURE
+            if op == OP_TYPE_IMAGE:
+                if t[2] == DIM_SUBPASS:
+                    return REFLECT.SUBPASS
+                if t[6] == 2:
+                    return REFLECT.IMAGE
+                return REFLECT.SAMPLER_IMAGE
+            if op == OP_TYPE_SAMPLER:
+                return REFLECT.SAMPLER
+            if op == OP_TYPE_ACCELERATION_STRUCTURE:
+                return "acceleration_structures"
+        elif storage == SC_UNIFORM:
+            if self.decoration(type_id, DEC_BUFFER_BLOCK):
+                return REFLECT.SSBO
+            return REFLECT.UBO
+        elif storage == SC_STORAGE_BUFFER:
+            return REFLECT.SSBO
+        elif storage == SC_PUSH_CONSTANT:
+            return "push_constants"
+        elif storage == SC_INPUT:
+            return REFLECT.INPUT
+        elif storage == SC_OUTPUT:
+            return REFLECT.OUTPUT
+        return None
+
+    def struct_types(self, type_id: int, out: dict):
+        type_id, _, _ = self.strip_arrays(type_id)
+        t = self.types[type_id]
+        if t[0] != OP_TYPE_STRUCT or f"_{type_id}" in out:
+            return
+
+        members = []
+        out[f"_{type_id}"] = {
+            "name": self.names.get(type_id, f"_{type_id}"),
+            "members": members,
+        }
+        for index, member_id in enumerate(t[1:]):
+            base_id, sizes, literals = self.strip_arrays(member_id)
+            member = {
+                MEMBER.NAME: self.member_names.get((type_id, index), f"_m{index}"),
+                MEMBER.TYPE: self.type_name(base_id),
+            }
+            offset = self.member_decorations.get((type_id, index), {}).get(DEC_OFFSET)
+            if offset:
+                member["offset"] = offset[0]
+            if sizes:
+                member[MEMBER.ARRAY] = sizes
+                member[MEMBER.ARRAY_LITERAL] = literals
+            members.append(member)
+            self.struct_types(member_id, out)
+
+    def reflect(self) -> dict:
+        if not self.entry_points:
+            raise SpirvError("SPIR-V binary has no entry point")
+
+        reflection = {
+            REFLECT.ENTRYPOINT: [
+                {"name": name, "mode": EXECUTION_MODEL_MAP.get(model, str(model))}
+                for model, name in self.entry_points
+            ]
+        }
+        types = {}
+        resources: Dict[str, list] = {}
+
+        for pointer_id, id, storage in self.variables:
+            pointer = self.types.get(pointer_id)
+            if not pointer or pointer[0] != OP_TYPE_POINTER:
+                raise SpirvError(f"Variable {id} does not have a pointer type")
+            type_id, sizes, literals = self.strip_arrays(pointer[2])
+
+            kind = self.resource_kind(type_id, storage)
+            if not kind:
+                continue
+
+            if kind in (REFLECT.INPUT, REFLECT.OUTPUT):
+                if self.decoration(id, DEC_BUILTIN) is not None or self.is_builtin(type_id):
+                    continue
+                entry = {
+                    MEMBER.TYPE: self.type_name(type_id),
+                    MEMBER.NAME: self.names.get(id, f"_{id}"),
+                    "location": self.decoration(id, DEC_LOCATION, 0),
+                }
+            else:
+                name = self.names.get(id) or self.names.get(type_id, f"_{id}")
+                entry = {
+                    MEMBER.TYPE: self.type_name(type_id),
+                    MEMBER.NAME: name,
+                }
+                if kind != "push_constants":
+                    entry[MEMBER.SET] = self.decoration(id, DEC_DESCRIPTOR_SET, 0)
+                    entry[MEMBER.BIND] = self.decoration(id, DEC_BINDING, 0)
+                self.struct_types(type_id, types)
+
+            if sizes:
+                entry[MEMBER.ARRAY] = sizes
+                entry[MEMBER.ARRAY_LITERAL] = literals
+            resources.setdefault(kind, []).append(entry)
+
+        if types:
+            reflection[REFLECT.TYPE] = types
+        for kind, entries in resources.items():
+            if kind in (REFLECT.INPUT, REFLECT.OUTPUT):
+                entries.sort(key=lambda x: x["location"])
+            reflection[kind] = entries
+
+        return reflection
+
+
+def reflect_spirv(data: bytes) -> dict:
+    """Reflect a SPIR-V binary into the dictionary shape produced by `spirv-cross --reflect`."""
+    return SpirvModule(data).reflect()
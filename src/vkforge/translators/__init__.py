@@ -5,6 +5,7 @@ from .type import GetTypeStrings
 from .layout import GetLayoutStrings, GetLayoutHeaderStrings
 from .func import GetFuncStrings
 from .cmake import GetCMakeStrings
+from .prime import GetPrimeStrings
 
 __all__ = [
     "GetCoreStrings",
@@ -15,5 +16,6 @@ __all__ = [
     "GetLayoutStrings",
     "GetLayoutHeaderStrings",
     "GetFuncStrings",
-    "GetCMakeStrings"
+    "GetCMakeStrings",
+    "GetPrimeStrings"
 ]
@@ -54,11 +54,29 @@ add_library(vkforge SHARED
 )
 
 target_link_libraries(vkforge PUBLIC vkforge_deps)
+
+# Pipeline cache that VkForge_CreateForgeLayout loads and VkForge_DestroyForgeLayout saves,
+# at the same absolute path whatever the working directory of the program
+set(VKFORGE_PIPELINE_CACHE_PATH "${{CMAKE_BINARY_DIR}}/{cache_file}" CACHE FILEPATH "VkForge pipeline cache file")
+target_compile_definitions(vkforge PUBLIC "VKFORGE_PIPELINE_CACHE_PATH=\\"${{VKFORGE_PIPELINE_CACHE_PATH}}\\"")
+
+# Creates every pipeline once and saves the driver's pipeline cache.
+# Build the vkforge_pipeline_cache target to write it where the programs load it from.
+add_executable(vkforge_prime {prime})
+target_link_libraries(vkforge_prime PRIVATE vkforge)
+
+add_custom_target(vkforge_pipeline_cache
+    COMMAND vkforge_prime ${{VKFORGE_PIPELINE_CACHE_PATH}}
+    DEPENDS vkforge_prime
+    COMMENT "Priming the Vulkan pipeline cache"
+)
 """
     return content.format(
         files=files,
         project=project.upper(),
-        version=version
+        version=version,
+        prime=FILE.PRIME,
+        cache_file=FILE.PIPELINE_CACHE
     )
 
 def GetCMakeStrings(ctx: VkForgeContext):
@@ -1,4 +1,7 @@
 from vkforge.context import VkForgeContext
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
 
 def GetCommonStrings(ctx: VkForgeContext):
     return [
@@ -6,4 +9,11 @@ def GetCommonStrings(ctx: VkForgeContext):
     ]
 
 # This Module will contain commonly used functions not
-# specifically unique to rendering
\ No newline at end of file
+# specifically unique to rendering
+
+def GetCachedValue(ctx: VkForgeContext, func: Callable[[VkForgeContext], T]) -> T:
+    """Compute func(ctx) once per context, keyed by the function name, and return it to every later caller."""
+    name = func.__name__
+    if name not in ctx.cachedValues:
+        ctx.cachedValues[name] = func(ctx)
+    return ctx.cachedValues[name]
@@ -1,7 +1,9 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
+from .registry import Declares
 
 
+@Declares("void VkForge_CreateInstance(VkInstance* retInstance)")
 def CreateInstance(ctx: VkForgeContext) -> str:
     define_validation_layers = "/** NO VALIDATIONS **/"
     define_debug_messenger = "/** NO DEBUG MESSENGER **/"
@@ -106,6 +108,7 @@ void VkForge_CreateInstance
 
     return output
 
+@Declares("void VkForge_CreateSurface(VkInstance instance, SDL_Window* window, VkSurfaceKHR* retSurface)")
 def CreateSurface(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_CreateSurface
@@ -135,6 +138,7 @@ void VkForge_CreateSurface
 
     return output
 
+@Declares("void VkForge_SelectPhysicalDevice(VkInstance instance, VkSurfaceKHR surface, VkPhysicalDevice* inPhysicalDevice, uint32_t* inQueueFamilyIndex)")
 def CreateSelectPhysicalDevice(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_SelectPhysicalDevice
@@ -194,6 +198,7 @@ void VkForge_SelectPhysicalDevice
     return output
 
 
+@Declares("void VkForge_CreateDevice(VkPhysicalDevice physical_device, uint32_t queue_family_index, const char** requested_extensions_buffer, uint32_t requested_extensions_count, VkDevice* retDevice, VkQueue* retQueue)")
 def CreateDevice(ctx: VkForgeContext) -> str:
     enabledFeaturesDefinition = "/** NO ENABLED FEATURES **/"
     enabledFeatures = "0"
@@ -366,6 +371,7 @@ void VkForge_CreateDevice
     return output
 
 
+@Declares("void VkForge_CreateSwapchain(VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkDevice device, VkSwapchainKHR old_swapchain, VkFormat req_format, uint32_t req_swapchain_size, VkPresentModeKHR req_present_mode, VkSwapchainKHR* retSwapchain, uint32_t* retSwapchainSize, VkImage** retSwapchainImages, VkImageView** retSwapchainImageViews)")
 def CreateSwapchain(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_CreateSwapchain
@@ -493,6 +499,7 @@ void VkForge_CreateSwapchain
     return output
 
 
+@Declares("void VkForge_CreateCommandPoolAndBuffers(uint32_t queue_family_index, VkDevice device, uint32_t bufferCount, VkCommandPool* retCommandPool, VkCommandBuffer* retCommandBuffers)")
 def CreateCommandBuffers(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_CreateCommandPoolAndBuffers
@@ -557,6 +564,7 @@ void VkForge_CreateCommandPoolAndBuffers
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
 
+@Declares("VkForgeCore* VkForge_CreateCore(SDL_Window* window, const char** requested_device_extensions_buffer, uint32_t requested_device_extensions_count)")
 def CreateCreateCore(ctx: VkForgeContext) -> str:
     content = """\
 VkForgeCore* VkForge_CreateCore
@@ -608,6 +616,7 @@ VkForgeCore* VkForge_CreateCore
 """
     return content.format()
 
+@Declares("void VkForge_DestroyCore(VkForgeCore* core)")
 def CreateDestroyCore(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_DestroyCore(VkForgeCore* core)
@@ -645,6 +654,7 @@ void VkForge_DestroyCore(VkForgeCore* core)
 """
     return content.format()
 
+@Declares("void VkForge_Destroy(VkDevice device, uint32_t count, VkForgeDestroyCallback* destroyers)")
 def CreateDestroy(ctx: VkForgeContext):
     content = """\
 void VkForge_Destroy(VkDevice device, uint32_t count, VkForgeDestroyCallback* destroyers)
@@ -658,6 +668,7 @@ void VkForge_Destroy(VkDevice device, uint32_t count, VkForgeDestroyCallback* de
 """
     return content.format()
 
+@Declares("VkForgeRender* VkForge_CreateRender(SDL_Window* window, VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkDevice device, VkQueue queue, VkCommandPool cmdPool, VkFormat req_format, uint32_t req_swapchain_size, VkPresentModeKHR req_present_mode, VkForgeRenderCallback copyCallback, VkForgeRenderCallback drawCallback, const char* clearColorHex, void* userData)")
 def CreateCreateRender(ctx: VkForgeContext):
     content = """\
 VkForgeRender* VkForge_CreateRender
@@ -753,6 +764,7 @@ VkForgeRender* VkForge_CreateRender
 """
     return content.format()
 
+@Declares("void VkForge_RefreshRenderData(VkForgeRender* r)")
 def CreateRefreshRender(ctx: VkForgeContext):
     content = """\
 void VkForge_RefreshRenderData(VkForgeRender* r)
@@ -763,6 +775,7 @@ void VkForge_RefreshRenderData(VkForgeRender* r)
 """
     return content.format()
 
+@Declares("void VkForge_ReCreateRenderSwapchain(VkForgeRender* r)")
 def CreateReCreateRenderSwapchain(ctx: VkForgeContext):
     content = """\
 void VkForge_ReCreateRenderSwapchain(VkForgeRender* r)
@@ -784,6 +797,7 @@ void VkForge_ReCreateRenderSwapchain(VkForgeRender* r)
 """
     return content.format()
 
+@Declares("void VkForge_DestroyRender(VkForgeRender* r)")
 def CreateDestroyRender(ctx: VkForgeContext):
     content = """\
 void VkForge_DestroyRender(VkForgeRender* r)
@@ -826,6 +840,7 @@ void VkForge_DestroyRender(VkForgeRender* r)
 """
     return content.format()
 
+@Declares("void VkForge_UpdateRender(VkForgeRender* render)")
 def CreateUpdateRender(ctx: VkForgeContext):
     content = """\
 int counter = 0;
@@ -993,20 +1008,22 @@ void VkForge_UpdateRender(VkForgeRender* render)
 """
     return content.format()
 
+CORE_CREATORS = [
+    CreateInstance,
+    CreateSurface,
+    CreateSelectPhysicalDevice,
+    CreateDevice,
+    CreateSwapchain,
+    CreateCommandBuffers,
+    CreateCreateCore,
+    CreateDestroyCore,
+    CreateDestroy,
+    CreateCreateRender,
+    CreateUpdateRender,
+    CreateRefreshRender,
+    CreateDestroyRender,
+    CreateReCreateRenderSwapchain,
+]
+
 def GetCoreStrings(ctx: VkForgeContext):
-    return [
-        CreateInstance(ctx),
-        CreateSurface(ctx),
-        CreateSelectPhysicalDevice(ctx),
-        CreateDevice(ctx),
-        CreateSwapchain(ctx),
-        CreateCommandBuffers(ctx),
-        CreateCreateCore(ctx),
-        CreateDestroyCore(ctx),
-        CreateDestroy(ctx),
-        CreateCreateRender(ctx),
-        CreateUpdateRender(ctx),
-        CreateRefreshRender(ctx),
-        CreateDestroyRender(ctx),
-        CreateReCreateRenderSwapchain(ctx)
-    ]
+    return [create(ctx) for create in CORE_CREATORS]
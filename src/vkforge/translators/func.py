@@ -1,8 +1,8 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
-from .core import GetCoreStrings
-from .util import GetUtilStrings
-import re
+from .core import CORE_CREATORS
+from .util import UTIL_CREATORS
+from .registry import CreateDeclarationList
 
 def CreateVoidEnum(ctx: VkForgeContext) -> str:
     content = """\
@@ -30,65 +30,9 @@ def CreateEnum(ctx: VkForgeContext) -> str:
 
     return output
 
-def extract_function_declarations(content: str) -> list[str]:
-    """Extract all function declarations using regex, including pointer return types."""
-    # This pattern is stricter to avoid catastrophic backtracking.
-    # - Return type: sequences of identifiers/keywords + optional pointer stars/qualifiers
-    # - Stops before function name (group 2)
-    pattern = r"""
-        ^\s*
-        (                               # Group 1: return type
-            (?:[a-zA-Z_]\w*             # Identifier (type or qualifier)
-                (?:\s+[a-zA-Z_]\w*)*    # More identifiers (e.g., 'unsigned long')
-            )
-            (?:\s*\*+\s*(?:const\s*)?)* # Optional pointer stars with optional const
-        )
-        \s+                             # Space between type and name
-        ([a-zA-Z_]\w*)                  # Group 2: function name
-        \s*
-        \(                              # Opening parenthesis
-        ([^)]*)                         # Group 3: parameters
-        \)                              # Closing parenthesis
-        \s*
-        (?:__attribute__\s*\(\([^)]*\)\)\s*)? # Optional attributes
-        (?={)                           # Lookahead for opening brace
-    """
-
-    functions = []
-    for match in re.finditer(pattern, content, re.VERBOSE | re.MULTILINE):
-        return_type = match.group(1).strip()
-        name = match.group(2).strip()
-        params = match.group(3).strip()
-
-        if return_type.startswith("static "):
-            continue
-
-        decl = f"{return_type} {name}({params});"
-        
-        if decl.startswith("else "):
-            continue
-
-        functions.append(decl)
-
-    return functions
-
-
-
 def CreateDeclarations(ctx: VkForgeContext) -> str:
-    """Generate ONLY function forward declarations using robust regex parsing."""
-    declarations = "// Function Declarations\n\n"
-    
-    # Collect all content from all modules
-    all_content = []
-    all_content.extend(GetCoreStrings(ctx))
-    all_content.extend(GetUtilStrings(ctx))
-    
-    # Process each content block
-    for content in all_content:
-        for decl in extract_function_declarations(content):
-            declarations += decl + "\n\n"
-    
-    return declarations
+    """Generate ONLY function forward declarations from the signatures registered by each template."""
+    return CreateDeclarationList(CORE_CREATORS + UTIL_CREATORS)
 
 def GetFuncStrings(ctx: VkForgeContext):
     return [
@@ -1,5 +1,6 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
+from .pipeline import GetPipelineShaderModuleIndices
 
 def Create_LayoutMaxes(ctx: VkForgeContext) -> str:
     content = """\
@@ -167,6 +168,7 @@ struct VkForgeLayoutDescriptorSetLayoutDesign
 {{
     uint32_t bind_design_count;
     VkForgeLayoutBindDesign** bind_design_buffer;
+    uint32_t set_layout_index; // index in the unique descriptor set layout designs
 }};
     
 typedef struct VkForgeLayoutPipelineLayoutDesign VkForgeLayoutPipelineLayoutDesign;
@@ -190,6 +192,8 @@ struct VkForgeReferencedLayoutDesign
     VkForgeLayoutPipelineLayoutDesign** pipeline_layout_design_buffer;
     uint32_t reference_count;
     VkForgeLayoutReferenceDesign** reference_buffer;
+    uint32_t descriptorset_layout_design_count;
+    VkForgeLayoutDescriptorSetLayoutDesign** descriptorset_layout_design_buffer;
 }};
 
 {static_arrays}
@@ -207,7 +211,9 @@ static VkForgeReferencedLayoutDesign VKFORGE_REFERENCED_LAYOUT_DESIGN =
     {pipeline_layout_design_count},
     {pipeline_layout_design_buffer},
     {reference_count},
-    {reference_buffer}
+    {reference_buffer},
+    {descriptorset_layout_design_count},
+    {descriptorset_layout_design_buffer}
 }};
 """
     if ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.LAYOUTS]:
@@ -215,7 +221,8 @@ static VkForgeReferencedLayoutDesign VKFORGE_REFERENCED_LAYOUT_DESIGN =
         references = ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.REFERENCES]
         
         # Generate all the static components
-        static_components = GetStaticSubComponents(layouts, references)
+        static_components = GetStaticSubComponents(layouts, references, ctx.layout.get(LAYOUT.FREQUENCIES))
+        set_designs, _ = GetSetLayoutDesigns(layouts)
         
         # Filter out empty components
         filtered_components = {}
@@ -234,7 +241,9 @@ static VkForgeReferencedLayoutDesign VKFORGE_REFERENCED_LAYOUT_DESIGN =
             pipeline_layout_design_count=len(layouts),
             pipeline_layout_design_buffer="PIPELINE_LAYOUT_DESIGNS" if layouts else "NULL",
             reference_count=len(references),
-            reference_buffer="REFERENCES" if references else "NULL"
+            reference_buffer="REFERENCES" if references else "NULL",
+            descriptorset_layout_design_count=len(set_designs),
+            descriptorset_layout_design_buffer="DESCRIPTOR_SET_LAYOUT_DESIGNS" if set_designs else "NULL"
         )
     else:
         output = content.format(
@@ -246,12 +255,46 @@ static VkForgeReferencedLayoutDesign VKFORGE_REFERENCED_LAYOUT_DESIGN =
             pipeline_layout_design_count=0,
             pipeline_layout_design_buffer="NULL",
             reference_count=0,
-            reference_buffer="NULL"
+            reference_buffer="NULL",
+            descriptorset_layout_design_count=0,
+            descriptorset_layout_design_buffer="NULL"
         )
     
     return output
 
-def GetStaticSubComponents(layouts, references):
+def GetBindKey(bind):
+    if not bind:
+        return None
+    type1, count, stages = bind
+    return (type1, count, tuple(sorted(stages)))
+
+def GetSetLayoutDesigns(layouts):
+    """
+    Deduplicate the descriptor set layouts of all pipeline layouts.
+    Returns the unique set designs (each a tuple of bind keys, None for unused bindings)
+    and, per pipeline layout, the design index of each of its sets. Unused set numbers
+    get the empty design, so that every set index of a pipeline layout has a design.
+    """
+    designs = []
+    design_indices = {}
+    layout_sets = []
+    for layout in layouts:
+        set_indices = []
+        for set1 in layout or []:
+            key = tuple(GetBindKey(bind) for bind in set1 or [])
+            if not key in design_indices:
+                design_indices[key] = len(designs)
+                designs.append(key)
+            set_indices.append(design_indices[key])
+        layout_sets.append(set_indices)
+    return designs, layout_sets
+
+def GetFrequencyComment(frequencies) -> str:
+    """Comment line naming how often each set of a pipeline layout is rebound."""
+    sets = [f"set {set1} per-{frequency}" for set1, frequency in enumerate(frequencies or []) if frequency]
+    return f"// {', '.join(sets)}\n" if sets else ""
+
+def GetStaticSubComponents(layouts, references, frequencies=None):
     """Generate all static components needed for the global variable"""
     components = {
         'static_arrays': "",
@@ -260,102 +303,73 @@ def GetStaticSubComponents(layouts, references):
         'static_pipeline_layouts': "",
         'static_references': ""
     }
-    
-    # Generate unique stage arrays and mapping
-    stage_signatures = {}  # stage_list -> unique_name
-    stage_mappings = {}    # original_name -> unique_name
+
+    set_designs, layout_sets = GetSetLayoutDesigns(layouts)
+
+    # Unique stage arrays and bind designs
+    stage_names = {}  # stage tuple -> array name
     stage_arrays = []
-    stage_counter = 0
-    
-    # First pass: collect all unique stage combinations
-    for layout_idx, layout in enumerate(layouts):
-        if layout:
-            for set_idx, set1 in enumerate(layout):
-                if set1:
-                    for bind_idx, bind in enumerate(set1):
-                        if bind:  # Only for non-empty bindings
-                            _, _, stages = bind
-                            # Convert stages to sorted tuple for uniqueness
-                            stages_tuple = tuple(sorted([map_value(SHADER_STAGE_MAP, stage) for stage in stages]))
-                            
-                            if stages_tuple not in stage_signatures:
-                                unique_name = f"STAGE_UNIT_{stage_counter:02d}"
-                                stage_signatures[stages_tuple] = unique_name
-                                stage_arrays.append(f"static uint32_t {unique_name}[] = {{ {', '.join(map(str, stages_tuple))} }};")
-                                stage_counter += 1
-                            
-                            # Map original name to unique name
-                            original_name = f"STAGE_{layout_idx}_{set_idx}_{bind_idx}"
-                            stage_mappings[original_name] = stage_signatures[stages_tuple]
-    
-    # Generate stage arrays and macros
+    bind_names = {}   # bind key -> bind design name
+    bind_designs = []
+
+    for set_design in set_designs:
+        for bind_key in set_design:
+            if bind_key and not bind_key in bind_names:
+                type1, count, stages = bind_key
+                stages_tuple = tuple(sorted([map_value(SHADER_STAGE_MAP, stage) for stage in stages]))
+                if stages_tuple not in stage_names:
+                    stage_names[stages_tuple] = f"STAGE_UNIT_{len(stage_names):02d}"
+                    stage_arrays.append(f"static uint32_t {stage_names[stages_tuple]}[] = {{ {', '.join(map(str, stages_tuple))} }};")
+
+                bind_names[bind_key] = f"BIND_{len(bind_names)}"
+                bind_designs.append(
+                    f"static VkForgeLayoutBindDesign {bind_names[bind_key]} = {{\n" +
+                    f"    {map_value(DESCRIPTOR_TYPE_MAP, type1)}, {count}, {len(stages)}, {stage_names[stages_tuple]}\n" +
+                    "};"
+                )
+
     if stage_arrays:
         components['static_arrays'] = "\n".join(stage_arrays)
-        
-        # Generate macro mappings
-        macro_mappings = []
-        for original_name, unique_name in stage_mappings.items():
-            macro_mappings.append(f"#define {original_name} {unique_name}")
-        
-        components['static_arrays'] += "\n\n" + "\n".join(macro_mappings)
 
-    # Generate bind designs
-    bind_designs = []
+    # Bind design arrays of each unique set design
     bind_design_arrays = []
-    
-    for layout_idx, layout in enumerate(layouts):
-        if layout:
-            for set_idx, set1 in enumerate(layout):
-                set_bind_designs = []
-                if set1:
-                    for bind_idx, bind in enumerate(set1):
-                        if bind:
-                            type1, count, stages = bind
-                            type1 = map_value(DESCRIPTOR_TYPE_MAP, type1)
-                            # Use the mapped stage name via macro
-                            stage_name = f"STAGE_{layout_idx}_{set_idx}_{bind_idx}"
-                            bind_designs.append(
-                                "static VkForgeLayoutBindDesign BIND_" + f"{layout_idx}_{set_idx}_{bind_idx}" + " = {\n" +
-                                f"    {type1}, {count}, {len(stages)}, {stage_name}\n" +
-                                "};"
-                            )
-                            set_bind_designs.append("&BIND_" + f"{layout_idx}_{set_idx}_{bind_idx}")
-                        else:
-                            set_bind_designs.append("NULL")
-                    
-                    # Create array for this set's bind designs
-                    bind_design_arrays.append(
-                        "static VkForgeLayoutBindDesign* BIND_DESIGNS_" + f"{layout_idx}_{set_idx}" + "[] = {\n" +
-                        "    " + ", ".join(set_bind_designs) + "\n" +
-                        "};"
-                    )
-    
+    for set_idx, set_design in enumerate(set_designs):
+        if set_design:
+            entries = [f"&{bind_names[bind_key]}" if bind_key else "NULL" for bind_key in set_design]
+            bind_design_arrays.append(
+                "static VkForgeLayoutBindDesign* BIND_DESIGNS_" + f"{set_idx}" + "[] = {\n" +
+                "    " + ", ".join(entries) + "\n" +
+                "};"
+            )
+
     if bind_designs or bind_design_arrays:
         components['static_bind_designs'] = "\n".join(bind_designs + bind_design_arrays)
-    
-    # Generate descriptor set layouts
+
+    # Unique descriptor set layout designs, shared by the pipeline layouts
     descriptor_set_layouts = []
+    for set_idx, set_design in enumerate(set_designs):
+        bind_buffer = f"BIND_DESIGNS_{set_idx}" if set_design else "NULL"
+        descriptor_set_layouts.append(
+            "static VkForgeLayoutDescriptorSetLayoutDesign DESCRIPTOR_SET_LAYOUT_" + f"{set_idx}" + " = {\n" +
+            f"    {len(set_design)}, {bind_buffer}, {set_idx}\n" +
+            "};"
+        )
+    if set_designs:
+        descriptor_set_layouts.append(
+            "static VkForgeLayoutDescriptorSetLayoutDesign* DESCRIPTOR_SET_LAYOUT_DESIGNS[] = {\n" +
+            "    " + ",\n    ".join(f"&DESCRIPTOR_SET_LAYOUT_{i}" for i in range(len(set_designs))) + "\n" +
+            "};"
+        )
+
     descriptor_set_layout_arrays = []
-    for layout_idx, layout in enumerate(layouts):
-        layout_descriptor_sets = []
-        if layout:
-            for set_idx, set1 in enumerate(layout):
-                if set1:
-                    descriptor_set_layouts.append(
-                        "static VkForgeLayoutDescriptorSetLayoutDesign DESCRIPTOR_SET_LAYOUT_" + f"{layout_idx}_{set_idx}" + " = {\n" +
-                        f"    {len(set1)}, BIND_DESIGNS_{layout_idx}_{set_idx}\n" +
-                        "};"
-                    )
-                    layout_descriptor_sets.append("&DESCRIPTOR_SET_LAYOUT_" + f"{layout_idx}_{set_idx}")
-            
-            # Create array for this layout's descriptor sets
-            if layout_descriptor_sets:
-                descriptor_set_layout_arrays.append(
-                    "static VkForgeLayoutDescriptorSetLayoutDesign* DESCRIPTOR_SET_LAYOUTS_" + f"{layout_idx}" + "[] = {\n" +
-                    "    " + ", ".join(layout_descriptor_sets) + "\n" +
-                    "};"
-                )
-    
+    for layout_idx, set_indices in enumerate(layout_sets):
+        if set_indices:
+            descriptor_set_layout_arrays.append(
+                "static VkForgeLayoutDescriptorSetLayoutDesign* DESCRIPTOR_SET_LAYOUTS_" + f"{layout_idx}" + "[] = {\n" +
+                "    " + ", ".join(f"&DESCRIPTOR_SET_LAYOUT_{i}" for i in set_indices) + "\n" +
+                "};"
+            )
+
     if descriptor_set_layouts or descriptor_set_layout_arrays:
         components['static_descriptor_set_layouts'] = "\n".join(descriptor_set_layouts + descriptor_set_layout_arrays)
     
@@ -367,6 +381,7 @@ def GetStaticSubComponents(layouts, references):
         # Always generate pipeline layout, even if empty
         if layout:  # If layout has descriptor sets
             pipeline_layouts.append(
+                GetFrequencyComment(frequencies[layout_idx] if frequencies else None) +
                 "static VkForgeLayoutPipelineLayoutDesign PIPELINE_LAYOUT_" + f"{layout_idx}" + " = {\n" +
                 f"    {len(layout)}, DESCRIPTOR_SET_LAYOUTS_{layout_idx}\n" +
                 "};"
@@ -421,10 +436,14 @@ struct VkForgePipelineFunction
         VkAllocationCallbacks* allocator,
         void* next,
         VkDevice device,
-        VkPipelineLayout pipeline_layout
+        VkPipelineLayout pipeline_layout,
+        VkPipelineCache pipeline_cache,
+        const VkShaderModule* shader_modules
     );
     const char* pipeline_name;
     uint32_t pipeline_index;
+    uint32_t shader_module_count;
+    const uint32_t* shader_module_indices;
 }};
 
 {static_pipeline_functions}
@@ -435,12 +454,17 @@ static uint32_t VKFORGE_PIPELINE_FUNCTION_COUNT = {pipeline_count};
     if ctx.forgeModel.Pipeline:
         # Generate static pipeline function structs
         pipeline_funcs = []
+        shader_module_indices = GetPipelineShaderModuleIndices(ctx)
         for i, pipeline in enumerate(ctx.forgeModel.Pipeline):
+            indices = shader_module_indices[pipeline.name]
             pipeline_funcs.append(
+                f"static const uint32_t PIPELINE_SHADER_MODULES_{i}[] = {{ {', '.join(map(str, indices))} }};\n"
                 f"static VkForgePipelineFunction PIPELINE_FUNC_{i} = {{\n"
                 f"    VkForge_CreatePipelineFor{pipeline.name},\n"
                 f"    \"{pipeline.name}\",\n"
-                f"    {i}\n"
+                f"    {i},\n"
+                f"    {len(indices)},\n"
+                f"    PIPELINE_SHADER_MODULES_{i}\n"
                 "};"
             )
         
@@ -463,13 +487,134 @@ static uint32_t VKFORGE_PIPELINE_FUNCTION_COUNT = {pipeline_count};
     
     return output
 
+def CreatePipelineCache(ctx: VkForgeContext) -> str:
+    content = """\
+// A cache file is only used by the driver and device that wrote it
+static bool IsPipelineCacheCompatible(VkPhysicalDevice physical_device, const void* data, size_t size)
+{{
+    VkPipelineCacheHeaderVersionOne header;
+    if (size < sizeof(header))
+    {{
+        return false;
+    }}
+    SDL_memcpy(&header, data, sizeof(header));
+
+    VkPhysicalDeviceProperties properties;
+    vkGetPhysicalDeviceProperties(physical_device, &properties);
+
+    return header.headerSize >= sizeof(header) &&
+           header.headerVersion == VK_PIPELINE_CACHE_HEADER_VERSION_ONE &&
+           header.vendorID == properties.vendorID &&
+           header.deviceID == properties.deviceID &&
+           SDL_memcmp(header.pipelineCacheUUID, properties.pipelineCacheUUID, VK_UUID_SIZE) == 0;
+}}
+
+static VkPipelineCache CreatePipelineCache(VkPhysicalDevice physical_device, VkDevice device, const char* cachePath)
+{{
+    size_t size = 0;
+    void* data = cachePath ? SDL_LoadFile(cachePath, &size) : NULL;
+    if (data && !IsPipelineCacheCompatible(physical_device, data, size))
+    {{
+        SDL_Log("Ignoring pipeline cache %s: it was written by another driver or device", cachePath);
+        SDL_free(data);
+        data = NULL;
+        size = 0;
+    }}
+
+    VkPipelineCacheCreateInfo createInfo = {{0}};
+    createInfo.sType = VK_STRUCTURE_TYPE_PIPELINE_CACHE_CREATE_INFO;
+    createInfo.initialDataSize = size;
+    createInfo.pInitialData = data;
+
+    VkPipelineCache cache = VK_NULL_HANDLE;
+    VkResult result = vkCreatePipelineCache(device, &createInfo, NULL, &cache);
+    if (result != VK_SUCCESS && data)
+    {{
+        SDL_Log("Ignoring pipeline cache %s: %s", cachePath, VkForge_StringifyResult(result));
+        createInfo.initialDataSize = 0;
+        createInfo.pInitialData = NULL;
+        result = vkCreatePipelineCache(device, &createInfo, NULL, &cache);
+    }}
+    SDL_free(data);
+
+    if (result != VK_SUCCESS)
+    {{
+        // Pipelines are still created, only without a cache
+        SDL_LogWarn(0, "Failed to create pipeline cache: %s", VkForge_StringifyResult(result));
+        return VK_NULL_HANDLE;
+    }}
+
+    if (size)
+    {{
+        SDL_Log("Loaded pipeline cache %s (%zu bytes)", cachePath, size);
+    }}
+    return cache;
+}}
+
+/**
+ * @brief Writes the pipeline cache to the file it was loaded from. Done by
+ * VkForge_DestroyForgeLayout, call it earlier to keep the pipelines built so far.
+ */
+bool VkForge_SaveForgePipelineCache(VkForgeLayout* forgeLayout)
+{{
+    assert(forgeLayout);
+
+    if (forgeLayout->pipeline_cache == VK_NULL_HANDLE || !forgeLayout->pipeline_cache_path)
+    {{
+        return false;
+    }}
+
+    size_t size = 0;
+    VkResult result = vkGetPipelineCacheData(forgeLayout->device, forgeLayout->pipeline_cache, &size, NULL);
+    if (result != VK_SUCCESS || size == 0)
+    {{
+        return false;
+    }}
+
+    void* data = SDL_malloc(size);
+    if (!data)
+    {{
+        SDL_LogError(0, "Failed to allocate memory for the pipeline cache");
+        return false;
+    }}
+    result = vkGetPipelineCacheData(forgeLayout->device, forgeLayout->pipeline_cache, &size, data);
+
+    // Write to a temporary file first so that a crash never leaves a partial cache behind
+    char* temp_path = NULL;
+    bool saved = result == VK_SUCCESS &&
+                 SDL_asprintf(&temp_path, "%s.tmp", forgeLayout->pipeline_cache_path) > 0 &&
+                 SDL_SaveFile(temp_path, data, size) &&
+                 SDL_RenamePath(temp_path, forgeLayout->pipeline_cache_path);
+
+    if (saved)
+    {{
+        SDL_Log("Saved pipeline cache %s (%zu bytes)", forgeLayout->pipeline_cache_path, size);
+    }}
+    else
+    {{
+        SDL_LogWarn(0, "Failed to save pipeline cache %s: %s", forgeLayout->pipeline_cache_path, SDL_GetError());
+    }}
+
+    SDL_free(temp_path);
+    SDL_free(data);
+    return saved;
+}}
+"""
+    return content.format()
+
 def CreateCreateForgeLayout(ctx: VkForgeContext) -> str:
     content = """\
-VkForgeLayout* VkForge_CreateForgeLayout
+/**
+ * @brief Creates the layout with a VkPipelineCache loaded from cachePath, if it exists and was
+ * written by this driver and device. The cache is saved back there by VkForge_DestroyForgeLayout.
+ * With a NULL cachePath the cache only lives as long as the layout.
+ */
+VkForgeLayout* VkForge_CreateForgeLayoutWithPipelineCache
 (
-    VkSurfaceKHR surface, 
-    VkPhysicalDevice physical_device, 
-    VkDevice device
+    VkSurfaceKHR surface,
+    VkPhysicalDevice physical_device,
+    VkDevice device,
+    const char* cachePath
 )
 {{
     assert(device);
@@ -487,8 +632,20 @@ VkForgeLayout* VkForge_CreateForgeLayout
     layout->surface = surface;
     layout->physical_device = physical_device;
     layout->device = device;
+    layout->pipeline_cache = CreatePipelineCache(physical_device, device, cachePath);
+    layout->pipeline_cache_path = cachePath ? SDL_strdup(cachePath) : NULL;
     return layout;
 }}
+
+VkForgeLayout* VkForge_CreateForgeLayout
+(
+    VkSurfaceKHR surface, 
+    VkPhysicalDevice physical_device, 
+    VkDevice device
+)
+{{
+    return VkForge_CreateForgeLayoutWithPipelineCache(surface, physical_device, device, VKFORGE_PIPELINE_CACHE_PATH);
+}}
 """
     return content.format()
 
@@ -498,6 +655,13 @@ void VkForge_DestroyForgeLayout(VkForgeLayout* forgeLayout)
 {{
     if (forgeLayout)
     {{
+        ReleaseShaderModules(forgeLayout);
+        if (forgeLayout->pipeline_cache != VK_NULL_HANDLE)
+        {{
+            VkForge_SaveForgePipelineCache(forgeLayout);
+            vkDestroyPipelineCache(forgeLayout->device, forgeLayout->pipeline_cache, NULL);
+        }}
+        SDL_free(forgeLayout->pipeline_cache_path);
         SDL_free(forgeLayout);
     }}
 }}
@@ -529,37 +693,155 @@ void VkForge_DestroyForgeLayoutQueue(VkForgeLayoutQueue* queue)
 """
     return content.format()
 
-def CreateFindPipelineFunction(ctx: VkForgeContext) -> str:
+FNV_OFFSET_BASIS = 2166136261
+FNV_PRIME = 16777619
+MAX_PIPELINE_NAME_DISPLACEMENT = 1 << 24
+
+def HashPipelineName(name: str) -> int:
+    """32-bit FNV-1a of the name. Matches the generated C."""
+    hash = FNV_OFFSET_BASIS
+    for byte in name.encode("utf-8"):
+        hash ^= byte
+        hash = (hash * FNV_PRIME) & 0xFFFFFFFF
+    return hash
+
+def MixPipelineNameHash(hash: int, seed: int) -> int:
+    """Murmur3 finalizer of hash xor seed, so every seed gives a well spread hash."""
+    hash = (hash ^ seed) & 0xFFFFFFFF
+    hash ^= hash >> 16
+    hash = (hash * 0x85EBCA6B) & 0xFFFFFFFF
+    hash ^= hash >> 13
+    hash = (hash * 0xC2B2AE35) & 0xFFFFFFFF
+    hash ^= hash >> 16
+    return hash
+
+def BuildPipelineNameHash(names: list):
+    """
+    Minimal perfect hash of the pipeline names (hash and displace).
+
+    Names are split into buckets by MixPipelineNameHash(hash, 0). Buckets are placed
+    largest first: each gets the first displacement d for which MixPipelineNameHash(hash, d)
+    sends its names to distinct free slots. Lookup is then one string hash, two mixes
+    and one strcmp to reject unknown names. Returns the bucket displacements and the
+    pipeline id in each slot.
+    """
+    count = len(names)
+    bucket_count = max((count + 1) // 2, 1)
+    buckets = [[] for _ in range(bucket_count)]
+    hashes = [HashPipelineName(name) for name in names]
+    seen = {}
+    for id, name in enumerate(names):
+        if name in seen:
+            raise ValueError(f"Pipeline name {name} is used more than once")
+        seen[name] = id
+        buckets[MixPipelineNameHash(hashes[id], 0) % bucket_count].append(id)
+
+    displacements = [0] * bucket_count
+    slots = [None] * count
+    for bucket_index in sorted(range(bucket_count), key=lambda b: (-len(buckets[b]), b)):
+        bucket = buckets[bucket_index]
+        if not bucket:
+            continue
+        for displacement in range(1, MAX_PIPELINE_NAME_DISPLACEMENT):
+            placed = [MixPipelineNameHash(hashes[id], displacement) % count for id in bucket]
+            if len(set(placed)) == len(placed) and all(slots[slot] is None for slot in placed):
+                break
+        else:
+            names_in_bucket = ", ".join(names[id] for id in bucket)
+            raise RuntimeError(f"Could not build a perfect hash for the pipeline names {names_in_bucket}")
+        displacements[bucket_index] = displacement
+        for id, slot in zip(bucket, placed):
+            slots[slot] = id
+    return displacements, slots
+
+def GetPipelineIdName(pipelineName: str) -> str:
+    return f"VKFORGE_PIPELINE_ID_{pipelineName}"
+
+def CreatePipelineIdTables(ctx: VkForgeContext) -> str:
+    content = """\
+// Pipeline layout design index of each VkForgePipelineId
+static const uint32_t PIPELINE_LAYOUT_INDICES[] = {{ {layout_indices} }};
+
+// Perfect hash of the pipeline names, see VkForge_GetPipelineId
+#define VKFORGE_PIPELINE_NAME_BUCKET_COUNT {bucket_count}
+static const uint32_t PIPELINE_NAME_DISPLACEMENTS[] = {{ {displacements} }};
+static const uint32_t PIPELINE_NAME_SLOTS[] = {{ {slots} }};
+
+// Pipelines a VkForgePipelineTable pre-warms before the others, highest priority first, up to VKFORGE_PIPELINE_ID_COUNT
+static const VkForgePipelineId PIPELINE_PREWARM_ORDER[] = {{ {prewarm_order} }};
+"""
+    names = [pipeline.name for pipeline in ctx.forgeModel.Pipeline]
+    references = ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.REFERENCES]
+    displacements, slots = BuildPipelineNameHash(names)
+
+    return content.format(
+        layout_indices=", ".join(str(references[name]) for name in names) or "0",
+        bucket_count=len(displacements),
+        displacements=", ".join(str(d) for d in displacements),
+        slots=", ".join(str(id) for id in slots) or "0",
+        prewarm_order=", ".join([GetPipelineIdName(name) for name in ctx.forgeModel.PipelinePrewarm or []] + ["VKFORGE_PIPELINE_ID_COUNT"]),
+    )
+
+def CreateGetPipelineId(ctx: VkForgeContext) -> str:
     content = """\
-static const VkForgePipelineFunction* FindPipelineFunction(const char* pipeline_name)
+static uint32_t HashPipelineName(const char* pipeline_name)
 {{
-    for( uint32_t i = 0; i < VKFORGE_PIPELINE_FUNCTION_COUNT; i++ )
+    uint32_t hash = {offset_basis}u;
+    for (const unsigned char* c = (const unsigned char*)pipeline_name; *c; c++)
     {{
-        if( strcmp(pipeline_name, VKFORGE_PIPELINE_FUNCTIONS[i]->pipeline_name) == 0 )
-        {{
-            return VKFORGE_PIPELINE_FUNCTIONS[i];
-        }}
+        hash ^= *c;
+        hash *= {prime}u;
     }}
-    return NULL;
+    return hash;
 }}
-"""
-    return content.format()
 
-def CreateFindPipelineLayoutIndex(ctx: VkForgeContext) -> str:
-    content = """\
-static uint32_t FindPipelineLayoutIndex(const char* pipeline_name)
+static uint32_t MixPipelineNameHash(uint32_t hash, uint32_t seed)
+{{
+    hash ^= seed;
+    hash ^= hash >> 16;
+    hash *= 0x85EBCA6Bu;
+    hash ^= hash >> 13;
+    hash *= 0xC2B2AE35u;
+    hash ^= hash >> 16;
+    return hash;
+}}
+
+/**
+ * @brief Finds the id of a pipeline by name with a generated perfect hash
+ * @return The pipeline id, or VKFORGE_PIPELINE_ID_COUNT if there is no such pipeline
+ */
+VkForgePipelineId VkForge_GetPipelineId(const char* pipelineName)
+{{
+    assert(pipelineName);
+
+{lookup}
+}}
+
+const char* VkForge_GetPipelineName(VkForgePipelineId pipelineId)
 {{
-    for( uint32_t i = 0; i < VKFORGE_REFERENCED_LAYOUT_DESIGN.reference_count; i++ )
+    if (pipelineId >= VKFORGE_PIPELINE_ID_COUNT)
     {{
-        if( strcmp(pipeline_name, VKFORGE_REFERENCED_LAYOUT_DESIGN.reference_buffer[i]->pipeline_name) == 0 )
-        {{
-            return VKFORGE_REFERENCED_LAYOUT_DESIGN.reference_buffer[i]->pipeline_layout_design_index;
-        }}
+        return NULL;
     }}
-    return UINT32_MAX;
+    return VKFORGE_PIPELINE_FUNCTIONS[pipelineId]->pipeline_name;
 }}
 """
-    return content.format()
+    lookup = """\
+    uint32_t hash = HashPipelineName(pipelineName);
+    uint32_t displacement = PIPELINE_NAME_DISPLACEMENTS[
+        MixPipelineNameHash(hash, 0) % VKFORGE_PIPELINE_NAME_BUCKET_COUNT];
+    uint32_t id = PIPELINE_NAME_SLOTS[
+        MixPipelineNameHash(hash, displacement) % VKFORGE_PIPELINE_ID_COUNT];
+
+    if (strcmp(pipelineName, VKFORGE_PIPELINE_FUNCTIONS[id]->pipeline_name) == 0)
+    {
+        return (VkForgePipelineId)id;
+    }
+    return VKFORGE_PIPELINE_ID_COUNT;"""
+    if not ctx.forgeModel.Pipeline:
+        lookup = "    (void)HashPipelineName;\n    (void)MixPipelineNameHash;\n    return VKFORGE_PIPELINE_ID_COUNT;"
+
+    return content.format(offset_basis=FNV_OFFSET_BASIS, prime=FNV_PRIME, lookup=lookup)
 
 def CreateBuildStageFlags(ctx: VkForgeContext) -> str:
     content = """\
@@ -579,22 +861,24 @@ static VkShaderStageFlags BuildStageFlags(const VkForgeLayoutBindDesign* bind)
 
 def CreateDescriptorSetLayoutBindings(ctx: VkForgeContext) -> str:
     content = """\
-static void CreateDescriptorSetLayoutBindings(
+static uint32_t CreateDescriptorSetLayoutBindings(
     const VkForgeLayoutDescriptorSetLayoutDesign* set_design,
     VkDescriptorSetLayoutBinding* out_bindings)
 {{
+    uint32_t binding_count = 0;
     for (uint32_t j = 0; j < set_design->bind_design_count; j++)
     {{
         const VkForgeLayoutBindDesign* bind = set_design->bind_design_buffer[j];
         if( !bind ) continue;
 
-        out_bindings[j] = (VkDescriptorSetLayoutBinding){{
+        out_bindings[binding_count++] = (VkDescriptorSetLayoutBinding){{
             .binding = j,
             .descriptorType = bind->type,
             .descriptorCount = bind->count,
             .stageFlags = BuildStageFlags(bind)
         }};
     }}
+    return binding_count;
 }}
 """
     return content.format()
@@ -607,11 +891,11 @@ static VkResult CreateDescriptorSetLayout(
     VkDescriptorSetLayout* out_dsetLayout)
 {{
     VkDescriptorSetLayoutBinding bindings[VKFORGE_MAX_DESCRIPTOR_BINDINGS] = {{0}};
-    CreateDescriptorSetLayoutBindings(set_design, bindings);
+    uint32_t binding_count = CreateDescriptorSetLayoutBindings(set_design, bindings);
 
     VkDescriptorSetLayoutCreateInfo setLayoutInfo = {{
         .sType = VK_STRUCTURE_TYPE_DESCRIPTOR_SET_LAYOUT_CREATE_INFO,
-        .bindingCount = set_design->bind_design_count,
+        .bindingCount = binding_count,
         .pBindings = bindings
     }};
 
@@ -619,6 +903,54 @@ static VkResult CreateDescriptorSetLayout(
 
     return result;
 }}
+
+/**
+ * Descriptor set layouts with the same design are created once per VkForgeLayout
+ * and shared by every pipeline layout that uses them, counting references.
+ */
+static VkResult AcquireDescriptorSetLayout(
+    VkForgeLayout* forgeLayout,
+    const VkForgeLayoutDescriptorSetLayoutDesign* set_design,
+    VkDescriptorSetLayout* out_dsetLayout)
+{{
+    uint32_t index = set_design->set_layout_index;
+
+    if (forgeLayout->descriptor_set_layout_refcounts[index] == 0)
+    {{
+        VkResult result = CreateDescriptorSetLayout(
+            forgeLayout->device,
+            set_design,
+            &forgeLayout->descriptor_set_layouts[index]);
+
+        if (result != VK_SUCCESS)
+        {{
+            return result;
+        }}
+    }}
+
+    forgeLayout->descriptor_set_layout_refcounts[index]++;
+    *out_dsetLayout = forgeLayout->descriptor_set_layouts[index];
+    return VK_SUCCESS;
+}}
+
+static void ReleaseDescriptorSetLayout(
+    VkForgeLayout* forgeLayout,
+    const VkForgeLayoutDescriptorSetLayoutDesign* set_design)
+{{
+    uint32_t index = set_design->set_layout_index;
+
+    if (forgeLayout->descriptor_set_layout_refcounts[index] == 0)
+    {{
+        return;
+    }}
+
+    forgeLayout->descriptor_set_layout_refcounts[index]--;
+    if (forgeLayout->descriptor_set_layout_refcounts[index] == 0)
+    {{
+        vkDestroyDescriptorSetLayout(forgeLayout->device, forgeLayout->descriptor_set_layouts[index], NULL);
+        forgeLayout->descriptor_set_layouts[index] = VK_NULL_HANDLE;
+    }}
+}}
 """
     return content.format()
 
@@ -724,6 +1056,11 @@ void VkForge_QueueDescriptorResourceForForgePipelineLayout(
     }}
 
     const VkForgeLayoutBindDesign *bind_design = set_design->bind_design_buffer[binding];
+    if (!bind_design)
+    {{
+        SDL_LogError(0, "Binding %u of set %u is not used by the pipeline layout", binding, set);
+        exit(1);
+    }}
     VkDescriptorType expected_type = bind_design->type;
 
     // Validate resource based on descriptor type
@@ -898,6 +1235,7 @@ void VkForge_WriteDescriptorResourceQueueForCurrentlyBoundForgePipelineLayout(
 
         // Mark as about to be written
         entry->written = true;
+        pipelineLayout->dirty_set_mask |= 1u << entry->set;
 
         SDL_Log("Preparing to write resource for set %u binding %u", entry->set, entry->binding);
         write_count++;
@@ -972,6 +1310,12 @@ def CreateBindForgePipelineLayoutPerWriteDescriptorResourceQueue(ctx: VkForgeCon
     content = """\
 /**
  * @brief Binds descriptor sets for the current pipeline layout and writes queued resources
+ *
+ * Only the sets from the first one that changed since the last bind on the same command
+ * buffer and pipeline layout are rebound. Beginning a command buffer with VkForge_BeginCommandBuffer
+ * starts a new command buffer epoch, after which every set is bound again. Call
+ * VkForge_ResetForgeBindState after a command buffer begun with vkBeginCommandBuffer directly.
+ *
  * @param layout The VkForge layout instance
  * @param queue The VkForge layout queue instance
  * @param pipelineLayout The pipeline layout to bind
@@ -991,21 +1335,51 @@ void VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
     // First write any queued descriptor resources
     VkForge_WriteDescriptorResourceQueueForCurrentlyBoundForgePipelineLayout(layout, queue, pipelineLayout);
 
-    // Bind descriptor sets to the command buffer
-    if (pipelineLayout->descriptor_set_count > 0)
+    // Sets below the first changed set are still bound when the same pipeline layout
+    // was last bound on this command buffer, so only rebind from the first change.
+    VkForgeBindState *state = &queue->bind_state;
+    uint32_t epoch = VkForge_GetCommandBufferEpoch();
+    uint32_t first_set = 0;
+
+    if (state->epoch == epoch &&
+        state->command_buffer == commandBuffer &&
+        state->pipeline_layout == pipelineLayout->pipelineLayout)
+    {{
+        first_set = pipelineLayout->descriptor_set_count;
+        for (uint32_t i = 0; i < pipelineLayout->descriptor_set_count; i++)
+        {{
+            if (state->descriptor_sets[i] != pipelineLayout->descriptor_sets[i] ||
+                (pipelineLayout->dirty_set_mask & (1u << i)))
+            {{
+                first_set = i;
+                break;
+            }}
+        }}
+    }}
+
+    if (first_set < pipelineLayout->descriptor_set_count)
     {{
         vkCmdBindDescriptorSets(
             commandBuffer,
             VK_PIPELINE_BIND_POINT_GRAPHICS,
             pipelineLayout->pipelineLayout,
-            0, // firstSet
-            pipelineLayout->descriptor_set_count,
-            pipelineLayout->descriptor_sets,
+            first_set,
+            pipelineLayout->descriptor_set_count - first_set,
+            &pipelineLayout->descriptor_sets[first_set],
             0,   // dynamicOffsetCount
             NULL // pDynamicOffsets
         );
     }}
 
+    state->epoch = epoch;
+    state->command_buffer = commandBuffer;
+    state->pipeline_layout = pipelineLayout->pipelineLayout;
+    for (uint32_t i = 0; i < pipelineLayout->descriptor_set_count; i++)
+    {{
+        state->descriptor_sets[i] = pipelineLayout->descriptor_sets[i];
+    }}
+    pipelineLayout->dirty_set_mask = 0;
+
     if (!pipelineLayout->alreadyLoggedBindInfo)
     {{
         if (pipelineLayout->descriptor_set_count > 0)
@@ -1025,23 +1399,37 @@ void VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
 """
     return content.format()
 
+def CreateResetForgeBindState(ctx: VkForgeContext) -> str:
+    content = """\
+/**
+ * @brief Forgets which descriptor sets are bound, so the next bind binds every set
+ * @param queue The VkForge layout queue instance
+ */
+void VkForge_ResetForgeBindState(VkForgeLayoutQueue *queue)
+{{
+    assert(queue);
+    SDL_memset(&queue->bind_state, 0, sizeof(queue->bind_state));
+}}
+"""
+    return content.format()
+
 def CreateCreateForgePipelineLayout(ctx: VkForgeContext) -> str:
     content = """\
-VkForgePipelineLayout VkForge_CreateForgePipelineLayout(
+VkForgePipelineLayout VkForge_CreateForgePipelineLayoutById(
     VkForgeLayout *forgeLayout,
-    const char *pipelineName)
+    VkForgePipelineId pipelineId)
 {{
     assert(forgeLayout);
-    assert(pipelineName);
 
-    // Find the pipeline layout index for the given pipeline name
-    uint32_t pipeline_layout_index = FindPipelineLayoutIndex(pipelineName);
-    if (pipeline_layout_index == UINT32_MAX)
+    if (pipelineId >= VKFORGE_PIPELINE_ID_COUNT)
     {{
-        SDL_LogError(0, "Pipeline layout not found for pipeline: %s", pipelineName);
+        SDL_LogError(0, "Pipeline layout not found for pipeline id: %u", (uint32_t)pipelineId);
         exit(1);
     }}
 
+    const char *pipelineName = VKFORGE_PIPELINE_FUNCTIONS[pipelineId]->pipeline_name;
+    uint32_t pipeline_layout_index = PIPELINE_LAYOUT_INDICES[pipelineId];
+
     // Get the pipeline layout design
     const VkForgeLayoutPipelineLayoutDesign *pipeline_design =
         VKFORGE_REFERENCED_LAYOUT_DESIGN.pipeline_layout_design_buffer[pipeline_layout_index];
@@ -1051,14 +1439,14 @@ VkForgePipelineLayout VkForge_CreateForgePipelineLayout(
     pipelineLayout.design = (VkForgeLayoutPipelineLayoutDesign *)pipeline_design;
     pipelineLayout.descriptor_set_count = pipeline_design->descriptorset_layout_design_count;
 
-    // Create descriptor set layouts (only if there are any)
+    // Get the shared descriptor set layouts (only if there are any)
     for (uint32_t i = 0; i < pipeline_design->descriptorset_layout_design_count; i++)
     {{
         const VkForgeLayoutDescriptorSetLayoutDesign *set_design =
             pipeline_design->descriptorset_layout_design_buffer[i];
 
-        VkResult result = CreateDescriptorSetLayout(
-            forgeLayout->device,
+        VkResult result = AcquireDescriptorSetLayout(
+            forgeLayout,
             set_design,
             &pipelineLayout.descriptor_set_layouts[i]);
 
@@ -1162,6 +1550,21 @@ VkForgePipelineLayout VkForge_CreateForgePipelineLayout(
     SDL_Log("Created pipeline layout for pipeline: %s", pipelineName);
     return pipelineLayout;
 }}
+
+VkForgePipelineLayout VkForge_CreateForgePipelineLayout(
+    VkForgeLayout *forgeLayout,
+    const char *pipelineName)
+{{
+    assert(pipelineName);
+
+    VkForgePipelineId pipelineId = VkForge_GetPipelineId(pipelineName);
+    if (pipelineId == VKFORGE_PIPELINE_ID_COUNT)
+    {{
+        SDL_LogError(0, "Pipeline layout not found for pipeline: %s", pipelineName);
+        exit(1);
+    }}
+    return VkForge_CreateForgePipelineLayoutById(forgeLayout, pipelineId);
+}}
 """
     return content.format()
 
@@ -1190,7 +1593,7 @@ void VkForge_DestroyForgePipelineLayout(
     {{
         if (pipelineLayout->descriptor_set_layouts[i] != VK_NULL_HANDLE)
         {{
-            vkDestroyDescriptorSetLayout(forgeLayout->device, pipelineLayout->descriptor_set_layouts[i], NULL);
+            ReleaseDescriptorSetLayout(forgeLayout, pipelineLayout->design->descriptorset_layout_design_buffer[i]);
             pipelineLayout->descriptor_set_layouts[i] = VK_NULL_HANDLE;
         }}
     }}
@@ -1203,46 +1606,107 @@ void VkForge_DestroyForgePipelineLayout(
 
 def CreateIsForgePipelineLayoutCompatible(ctx: VkForgeContext) -> str:
     content = """\
+bool VkForge_IsForgePipelineLayoutCompatibleById(
+    VkForgeLayout* forgeLayout,
+    VkForgePipelineId pipelineId,
+    VkForgePipelineLayout forgePipelineLayout)
+{{
+    assert(forgeLayout);
+
+    return (pipelineId < VKFORGE_PIPELINE_ID_COUNT &&
+            PIPELINE_LAYOUT_INDICES[pipelineId] == forgePipelineLayout.pipeline_layout_index);
+}}
+
 bool VkForge_IsForgePipelineLayoutCompatible(
     VkForgeLayout* forgeLayout,
     const char* pipelineName,
     VkForgePipelineLayout forgePipelineLayout)
 {{
-    assert(forgeLayout);
     assert(pipelineName);
 
-    uint32_t pipeline_layout_index = FindPipelineLayoutIndex(pipelineName);
-    return (pipeline_layout_index != UINT32_MAX && 
-            pipeline_layout_index == forgePipelineLayout.pipeline_layout_index);
+    return VkForge_IsForgePipelineLayoutCompatibleById(
+        forgeLayout, VkForge_GetPipelineId(pipelineName), forgePipelineLayout);
+}}
+"""
+    return content.format()
+
+def CreateShaderModuleRegistry(ctx: VkForgeContext) -> str:
+    content = """\
+static void AcquireShaderModules(VkForgeLayout* forgeLayout, const VkForgePipelineFunction* pipeline_func)
+{{
+    for (uint32_t i = 0; i < pipeline_func->shader_module_count; i++)
+    {{
+        uint32_t index = pipeline_func->shader_module_indices[i];
+        if (forgeLayout->shader_modules[index] == VK_NULL_HANDLE)
+        {{
+            forgeLayout->shader_modules[index] = VkForge_CreateForgeShaderModule(forgeLayout->device, index);
+            if (forgeLayout->shader_modules[index] == VK_NULL_HANDLE)
+            {{
+                SDL_LogError(0, "Failed to create shader module %u for pipeline %s", index, pipeline_func->pipeline_name);
+                exit(1);
+            }}
+        }}
+    }}
+}}
+
+static void ReleaseShaderModules(VkForgeLayout* forgeLayout)
+{{
+    for (uint32_t i = 0; i < VKFORGE_MAX_SHADER_MODULES; i++)
+    {{
+        if (forgeLayout->shader_modules[i] != VK_NULL_HANDLE)
+        {{
+            vkDestroyShaderModule(forgeLayout->device, forgeLayout->shader_modules[i], NULL);
+            forgeLayout->shader_modules[i] = VK_NULL_HANDLE;
+        }}
+    }}
+}}
+
+/**
+ * @brief Keeps the shader modules created for a pipeline until VkForge_EndForgePipelineBatch,
+ * so that pipelines sharing a shader created in between only create its module once.
+ */
+void VkForge_BeginForgePipelineBatch(VkForgeLayout* forgeLayout)
+{{
+    assert(forgeLayout);
+    forgeLayout->keep_shader_modules = true;
+}}
+
+void VkForge_EndForgePipelineBatch(VkForgeLayout* forgeLayout)
+{{
+    assert(forgeLayout);
+    forgeLayout->keep_shader_modules = false;
+    ReleaseShaderModules(forgeLayout);
 }}
 """
     return content.format()
 
 def CreateCreateForgePipeline(ctx: VkForgeContext) -> str:
     content = """\
-VkForgePipeline VkForge_CreateForgePipeline(
+VkForgePipeline VkForge_CreateForgePipelineById(
     VkForgeLayout* forgeLayout,
-    const char* pipelineName,
+    VkForgePipelineId pipelineId,
     VkForgePipelineLayout compatibleForgePipelineLayout)
 {{
     assert(forgeLayout);
-    assert(pipelineName);
 
-    // Verify compatibility
-    if (!VkForge_IsForgePipelineLayoutCompatible(forgeLayout, pipelineName, compatibleForgePipelineLayout))
+    if (pipelineId >= VKFORGE_PIPELINE_ID_COUNT)
     {{
-        SDL_LogError(0, "Pipeline layout is not compatible with pipeline: %s", pipelineName);
+        SDL_LogError(0, "Pipeline function not found for pipeline id: %u", (uint32_t)pipelineId);
         exit(1);
     }}
 
-    // Find the pipeline function
-    const VkForgePipelineFunction* pipeline_func = FindPipelineFunction(pipelineName);
-    if (!pipeline_func)
+    const VkForgePipelineFunction* pipeline_func = VKFORGE_PIPELINE_FUNCTIONS[pipelineId];
+    const char* pipelineName = pipeline_func->pipeline_name;
+
+    // Verify compatibility
+    if (!VkForge_IsForgePipelineLayoutCompatibleById(forgeLayout, pipelineId, compatibleForgePipelineLayout))
     {{
-        SDL_LogError(0, "Pipeline function not found for: %s", pipelineName);
+        SDL_LogError(0, "Pipeline layout is not compatible with pipeline: %s", pipelineName);
         exit(1);
     }}
 
+    AcquireShaderModules(forgeLayout, pipeline_func);
+
     /// DYNAMIC RENDERING REQUIRED STRUCTURE ///
     VkSurfaceFormatKHR surfaceFormat = VkForge_GetSurfaceFormat(
         forgeLayout->surface,
@@ -1263,9 +1727,16 @@ VkForgePipeline VkForge_CreateForgePipeline(
         NULL, // allocator
         &renderingInfo, // next Vulkan 1.3 dynamic rendering
         forgeLayout->device,
-        compatibleForgePipelineLayout.pipelineLayout
+        compatibleForgePipelineLayout.pipelineLayout,
+        forgeLayout->pipeline_cache,
+        forgeLayout->shader_modules
     );
 
+    if (!forgeLayout->keep_shader_modules)
+    {{
+        ReleaseShaderModules(forgeLayout);
+    }}
+
     if (pipeline == VK_NULL_HANDLE)
     {{
         SDL_LogError(0, "Failed to create pipeline %s", pipelineName);
@@ -1279,6 +1750,453 @@ VkForgePipeline VkForge_CreateForgePipeline(
     SDL_Log("Created pipeline: %s", pipelineName);
     return result;
 }}
+
+VkForgePipeline VkForge_CreateForgePipeline(
+    VkForgeLayout* forgeLayout,
+    const char* pipelineName,
+    VkForgePipelineLayout compatibleForgePipelineLayout)
+{{
+    assert(pipelineName);
+
+    VkForgePipelineId pipelineId = VkForge_GetPipelineId(pipelineName);
+    if (pipelineId == VKFORGE_PIPELINE_ID_COUNT)
+    {{
+        SDL_LogError(0, "Pipeline function not found for: %s", pipelineName);
+        exit(1);
+    }}
+    return VkForge_CreateForgePipelineById(forgeLayout, pipelineId, compatibleForgePipelineLayout);
+}}
+"""
+    return content.format()
+
+def CreateCreateAllForgePipelines(ctx: VkForgeContext) -> str:
+    content = """\
+#ifndef VKFORGE_MAX_PIPELINE_THREADS
+#define VKFORGE_MAX_PIPELINE_THREADS 32
+#endif
+
+typedef struct VkForgePipelineJob VkForgePipelineJob;
+
+// Pipelines created by VkForge_CreateAllForgePipelines. Workers take the next pipeline id
+// until none is left. Everything but next_pipeline_id and the pipelines is read only.
+struct VkForgePipelineJob
+{{
+    VkForgeLayout* forgeLayout;
+    const VkForgePipelineLayout* pipelineLayouts;
+    VkForgePipeline* pipelines;
+    const VkPipelineRenderingCreateInfo* renderingInfo;
+    SDL_AtomicInt next_pipeline_id;
+}};
+
+static int SDLCALL CreatePipelinesOfJob(void* data)
+{{
+    VkForgePipelineJob* job = (VkForgePipelineJob*)data;
+    VkForgeLayout* forgeLayout = job->forgeLayout;
+
+    for (;;)
+    {{
+        int pipelineId = SDL_AddAtomicInt(&job->next_pipeline_id, 1);
+        if (pipelineId >= VKFORGE_PIPELINE_ID_COUNT)
+        {{
+            return 0;
+        }}
+
+        const VkForgePipelineFunction* pipeline_func = VKFORGE_PIPELINE_FUNCTIONS[pipelineId];
+
+        // The pipeline cache is internally synchronized, and the shader modules were created up front
+        job->pipelines[pipelineId].pipeline = pipeline_func->CreatePipelineForFunc(
+            NULL, // allocator
+            (void*)job->renderingInfo,
+            forgeLayout->device,
+            job->pipelineLayouts[pipelineId].pipelineLayout,
+            forgeLayout->pipeline_cache,
+            forgeLayout->shader_modules
+        );
+        job->pipelines[pipelineId].pipeline_index = pipeline_func->pipeline_index;
+    }}
+}}
+
+/**
+ * @brief Creates every pipeline, pipelines[id] with pipelineLayouts[id], spread over threadCount
+ * threads (0 for one per logical CPU core). Both arrays hold VKFORGE_PIPELINE_ID_COUNT entries.
+ */
+void VkForge_CreateAllForgePipelines(
+    VkForgeLayout* forgeLayout,
+    const VkForgePipelineLayout* pipelineLayouts,
+    VkForgePipeline* pipelines,
+    uint32_t threadCount)
+{{
+    assert(forgeLayout);
+    assert(pipelineLayouts || VKFORGE_PIPELINE_ID_COUNT == 0);
+    assert(pipelines || VKFORGE_PIPELINE_ID_COUNT == 0);
+
+    // Check every pipeline and create all of their shader modules before any worker starts
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        const VkForgePipelineFunction* pipeline_func = VKFORGE_PIPELINE_FUNCTIONS[id];
+        if (!VkForge_IsForgePipelineLayoutCompatibleById(forgeLayout, (VkForgePipelineId)id, pipelineLayouts[id]))
+        {{
+            SDL_LogError(0, "Pipeline layout is not compatible with pipeline: %s", pipeline_func->pipeline_name);
+            exit(1);
+        }}
+        AcquireShaderModules(forgeLayout, pipeline_func);
+    }}
+
+    VkSurfaceFormatKHR surfaceFormat = VkForge_GetSurfaceFormat(
+        forgeLayout->surface,
+        forgeLayout->physical_device,
+        VK_FORMAT_B8G8R8A8_UNORM // Default format
+    );
+
+    VkPipelineRenderingCreateInfo renderingInfo = {{0}};
+    renderingInfo.sType = VK_STRUCTURE_TYPE_PIPELINE_RENDERING_CREATE_INFO;
+    renderingInfo.viewMask = 0;
+    renderingInfo.colorAttachmentCount = 1;
+    renderingInfo.pColorAttachmentFormats = &surfaceFormat.format;
+
+    VkForgePipelineJob job = {{0}};
+    job.forgeLayout = forgeLayout;
+    job.pipelineLayouts = pipelineLayouts;
+    job.pipelines = pipelines;
+    job.renderingInfo = &renderingInfo;
+
+    if (threadCount == 0)
+    {{
+        threadCount = (uint32_t)SDL_max(SDL_GetNumLogicalCPUCores(), 1);
+    }}
+    threadCount = SDL_min(threadCount, SDL_min((uint32_t)VKFORGE_PIPELINE_ID_COUNT, (uint32_t)VKFORGE_MAX_PIPELINE_THREADS));
+
+    // The calling thread is one of the workers. A worker that fails to start only costs parallelism.
+    SDL_Thread* threads[VKFORGE_MAX_PIPELINE_THREADS] = {{0}};
+    for (uint32_t i = 1; i < threadCount; i++)
+    {{
+        threads[i] = SDL_CreateThread(CreatePipelinesOfJob, "VkForgePipeline", &job);
+    }}
+    CreatePipelinesOfJob(&job);
+    for (uint32_t i = 1; i < threadCount; i++)
+    {{
+        SDL_WaitThread(threads[i], NULL);
+    }}
+
+    if (!forgeLayout->keep_shader_modules)
+    {{
+        ReleaseShaderModules(forgeLayout);
+    }}
+
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        if (pipelines[id].pipeline == VK_NULL_HANDLE)
+        {{
+            SDL_LogError(0, "Failed to create pipeline %s", VKFORGE_PIPELINE_FUNCTIONS[id]->pipeline_name);
+            exit(1);
+        }}
+    }}
+
+    SDL_Log("Created %u pipelines on %u threads", (uint32_t)VKFORGE_PIPELINE_ID_COUNT, SDL_max(threadCount, 1u));
+}}
+"""
+    return content.format()
+
+def CreateForgePipelineTable(ctx: VkForgeContext) -> str:
+    content = """\
+// States of a pipeline in a VkForgePipelineTable
+enum
+{{
+    VKFORGE_PIPELINE_EMPTY,
+    VKFORGE_PIPELINE_CREATING,
+    VKFORGE_PIPELINE_READY,
+    VKFORGE_PIPELINE_FAILED
+}};
+
+typedef struct VkForgePipelineTableEntry VkForgePipelineTableEntry;
+
+struct VkForgePipelineTableEntry
+{{
+    SDL_AtomicInt state; // Only the thread that moved it from EMPTY to CREATING writes pipeline
+    VkForgePipeline pipeline;
+    VkPipelineLayout pipeline_layout;
+    bool created_on_bind;
+    bool waited_on_bind;
+    Uint64 bind_ns; // Time VkForge_GetForgePipeline spent creating or waiting for it
+}};
+
+struct VkForgePipelineTable
+{{
+    VkForgeLayout* forgeLayout;
+    VkFormat color_format;
+    VkPipelineRenderingCreateInfo rendering_info;
+    VkForgePipelineTableEntry entries[VKFORGE_PIPELINE_ID_COUNT + 1]; // one spare so that it is never empty
+
+    // Signalled whenever a pipeline leaves the CREATING state
+    SDL_Mutex* mutex;
+    SDL_Condition* created;
+
+    SDL_Thread* prewarm_thread;
+    SDL_AtomicInt stop_prewarm;
+}};
+
+// Creates a pipeline that the calling thread moved to CREATING. Each creation makes its own shader modules,
+// since the shader module registry of the layout belongs to the thread that owns the layout.
+static void CreateTablePipeline(VkForgePipelineTable* table, VkForgePipelineId pipelineId, bool onBind)
+{{
+    const VkForgePipelineFunction* pipeline_func = VKFORGE_PIPELINE_FUNCTIONS[pipelineId];
+    VkForgePipelineTableEntry* entry = &table->entries[pipelineId];
+
+    entry->pipeline.pipeline = pipeline_func->CreatePipelineForFunc(
+        NULL, // allocator
+        &table->rendering_info,
+        table->forgeLayout->device,
+        entry->pipeline_layout,
+        table->forgeLayout->pipeline_cache,
+        NULL // shader modules
+    );
+    entry->pipeline.pipeline_index = pipeline_func->pipeline_index;
+    entry->created_on_bind = onBind;
+
+    SDL_LockMutex(table->mutex);
+    SDL_SetAtomicInt(&entry->state, entry->pipeline.pipeline != VK_NULL_HANDLE ? VKFORGE_PIPELINE_READY : VKFORGE_PIPELINE_FAILED);
+    SDL_BroadcastCondition(table->created);
+    SDL_UnlockMutex(table->mutex);
+}}
+
+// Creates pipelineId unless it was already claimed. Returns false once the table asks the thread to stop.
+static bool PrewarmPipeline(VkForgePipelineTable* table, VkForgePipelineId pipelineId)
+{{
+    if (SDL_GetAtomicInt(&table->stop_prewarm))
+    {{
+        return false;
+    }}
+
+    if (SDL_CompareAndSwapAtomicInt(&table->entries[pipelineId].state, VKFORGE_PIPELINE_EMPTY, VKFORGE_PIPELINE_CREATING))
+    {{
+        CreateTablePipeline(table, pipelineId, false);
+    }}
+    return true;
+}}
+
+static int SDLCALL PrewarmPipelines(void* data)
+{{
+    VkForgePipelineTable* table = (VkForgePipelineTable*)data;
+    SDL_SetCurrentThreadPriority(SDL_THREAD_PRIORITY_LOW);
+
+    // The PipelinePrewarm pipelines first, then the rest in id order
+    for (uint32_t i = 0; PIPELINE_PREWARM_ORDER[i] != VKFORGE_PIPELINE_ID_COUNT; i++)
+    {{
+        if (!PrewarmPipeline(table, PIPELINE_PREWARM_ORDER[i]))
+        {{
+            return 0;
+        }}
+    }}
+
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        if (!PrewarmPipeline(table, (VkForgePipelineId)id))
+        {{
+            return 0;
+        }}
+    }}
+    return 0;
+}}
+
+/**
+ * @brief Creates a table of every pipeline, pipelineLayouts[id] being the layout of pipeline id.
+ * No pipeline is created up front: each one is created by its first VkForge_GetForgePipeline,
+ * unless prewarm is set and a low priority thread already created it. That thread creates the
+ * PipelinePrewarm pipelines of the config first, in order, then every other pipeline by id.
+ */
+VkForgePipelineTable* VkForge_CreateForgePipelineTable(
+    VkForgeLayout* forgeLayout,
+    const VkForgePipelineLayout* pipelineLayouts,
+    bool prewarm)
+{{
+    assert(forgeLayout);
+    assert(pipelineLayouts || VKFORGE_PIPELINE_ID_COUNT == 0);
+
+    VkForgePipelineTable* table = (VkForgePipelineTable*)SDL_calloc(1, sizeof(VkForgePipelineTable));
+    if (!table)
+    {{
+        SDL_LogError(0, "Failed to allocate memory for VkForgePipelineTable");
+        exit(1);
+    }}
+    table->forgeLayout = forgeLayout;
+
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        if (!VkForge_IsForgePipelineLayoutCompatibleById(forgeLayout, (VkForgePipelineId)id, pipelineLayouts[id]))
+        {{
+            SDL_LogError(0, "Pipeline layout is not compatible with pipeline: %s", VKFORGE_PIPELINE_FUNCTIONS[id]->pipeline_name);
+            exit(1);
+        }}
+        table->entries[id].pipeline_layout = pipelineLayouts[id].pipelineLayout;
+    }}
+
+    table->color_format = VkForge_GetSurfaceFormat(
+        forgeLayout->surface,
+        forgeLayout->physical_device,
+        VK_FORMAT_B8G8R8A8_UNORM // Default format
+    ).format;
+
+    table->rendering_info.sType = VK_STRUCTURE_TYPE_PIPELINE_RENDERING_CREATE_INFO;
+    table->rendering_info.viewMask = 0;
+    table->rendering_info.colorAttachmentCount = 1;
+    table->rendering_info.pColorAttachmentFormats = &table->color_format;
+
+    table->mutex = SDL_CreateMutex();
+    table->created = SDL_CreateCondition();
+    if (!table->mutex || !table->created)
+    {{
+        SDL_LogError(0, "Failed to create the pipeline table lock: %s", SDL_GetError());
+        exit(1);
+    }}
+
+    if (prewarm && VKFORGE_PIPELINE_ID_COUNT > 0)
+    {{
+        table->prewarm_thread = SDL_CreateThread(PrewarmPipelines, "VkForgePrewarm", table);
+        if (!table->prewarm_thread)
+        {{
+            SDL_LogWarn(0, "Pipelines are not pre-warmed: %s", SDL_GetError());
+        }}
+    }}
+
+    return table;
+}}
+
+/**
+ * @brief Returns pipeline pipelineId, creating it first if neither a previous call nor the
+ * pre-warm thread did. Safe to call from any thread.
+ */
+VkForgePipeline VkForge_GetForgePipeline(VkForgePipelineTable* table, VkForgePipelineId pipelineId)
+{{
+    assert(table);
+
+    if (pipelineId >= VKFORGE_PIPELINE_ID_COUNT)
+    {{
+        SDL_LogError(0, "Pipeline function not found for pipeline id: %u", (uint32_t)pipelineId);
+        exit(1);
+    }}
+
+    VkForgePipelineTableEntry* entry = &table->entries[pipelineId];
+    if (SDL_GetAtomicInt(&entry->state) == VKFORGE_PIPELINE_READY)
+    {{
+        return entry->pipeline;
+    }}
+
+    // On the critical path from here on
+    Uint64 start = SDL_GetTicksNS();
+    if (SDL_CompareAndSwapAtomicInt(&entry->state, VKFORGE_PIPELINE_EMPTY, VKFORGE_PIPELINE_CREATING))
+    {{
+        CreateTablePipeline(table, pipelineId, true);
+    }}
+
+    SDL_LockMutex(table->mutex);
+    while (SDL_GetAtomicInt(&entry->state) == VKFORGE_PIPELINE_CREATING)
+    {{
+        entry->waited_on_bind = true;
+        SDL_WaitCondition(table->created, table->mutex);
+    }}
+    entry->bind_ns += SDL_GetTicksNS() - start;
+    int state = SDL_GetAtomicInt(&entry->state);
+    SDL_UnlockMutex(table->mutex);
+
+    if (state != VKFORGE_PIPELINE_READY)
+    {{
+        SDL_LogError(0, "Failed to create pipeline %s", VKFORGE_PIPELINE_FUNCTIONS[pipelineId]->pipeline_name);
+        exit(1);
+    }}
+    return entry->pipeline;
+}}
+
+void VkForge_BindForgePipeline(VkForgePipelineTable* table, VkForgePipelineId pipelineId, VkCommandBuffer commandBuffer)
+{{
+    VkForgePipeline pipeline = VkForge_GetForgePipeline(table, pipelineId);
+    vkCmdBindPipeline(commandBuffer, VK_PIPELINE_BIND_POINT_GRAPHICS, pipeline.pipeline);
+}}
+
+VkForgePipelineTableStats VkForge_GetForgePipelineTableStats(VkForgePipelineTable* table)
+{{
+    assert(table);
+
+    VkForgePipelineTableStats stats = {{0}};
+    SDL_LockMutex(table->mutex);
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        VkForgePipelineTableEntry* entry = &table->entries[id];
+        if (SDL_GetAtomicInt(&entry->state) != VKFORGE_PIPELINE_READY)
+        {{
+            stats.pending++;
+            continue;
+        }}
+
+        if (entry->created_on_bind)
+        {{
+            stats.created_on_bind++;
+        }}
+        else
+        {{
+            stats.created_by_prewarm++;
+            stats.waited_on_bind += entry->waited_on_bind;
+        }}
+        stats.bind_ns += entry->bind_ns;
+    }}
+    SDL_UnlockMutex(table->mutex);
+    return stats;
+}}
+
+/**
+ * @brief Logs the pipeline table stats and every pipeline that was created, or waited for,
+ * on the critical path. These are the pipelines to move up in PipelinePrewarm.
+ */
+void VkForge_LogForgePipelineTableStats(VkForgePipelineTable* table)
+{{
+    VkForgePipelineTableStats stats = VkForge_GetForgePipelineTableStats(table);
+    SDL_Log(
+        "Pipelines: %u created on bind, %u pre-warmed (%u waited for on bind), %u not created, %.3f ms spent on bind",
+        stats.created_on_bind, stats.created_by_prewarm, stats.waited_on_bind, stats.pending, stats.bind_ns / 1e6
+    );
+
+    SDL_LockMutex(table->mutex);
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        const VkForgePipelineTableEntry* entry = &table->entries[id];
+        if (entry->created_on_bind || entry->waited_on_bind)
+        {{
+            SDL_Log(
+                "  %s %s on bind: %.3f ms",
+                VKFORGE_PIPELINE_FUNCTIONS[id]->pipeline_name,
+                entry->created_on_bind ? "created" : "waited for",
+                entry->bind_ns / 1e6
+            );
+        }}
+    }}
+    SDL_UnlockMutex(table->mutex);
+}}
+
+/**
+ * @brief Stops the pre-warm thread and destroys every pipeline created. No other thread
+ * may use the table anymore.
+ */
+void VkForge_DestroyForgePipelineTable(VkForgePipelineTable* table)
+{{
+    if (!table)
+    {{
+        return;
+    }}
+
+    SDL_SetAtomicInt(&table->stop_prewarm, 1);
+    SDL_WaitThread(table->prewarm_thread, NULL);
+
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        if (SDL_GetAtomicInt(&table->entries[id].state) == VKFORGE_PIPELINE_READY)
+        {{
+            vkDestroyPipeline(table->forgeLayout->device, table->entries[id].pipeline.pipeline, NULL);
+        }}
+    }}
+
+    SDL_DestroyCondition(table->created);
+    SDL_DestroyMutex(table->mutex);
+    SDL_free(table);
+}}
 """
     return content.format()
 
@@ -1305,11 +2223,13 @@ def GetLayoutStrings(ctx: VkForgeContext):
         Create_LayoutMaxes(ctx),
         CreateForgeReferencedLayoutDesign(ctx),
         CreatePipelineFunctionStruct(ctx),
+        CreateShaderModuleRegistry(ctx),
+        CreatePipelineCache(ctx),
         CreateCreateForgeLayout(ctx),
         CreateDestroyForgeLayout(ctx),
         CreateForgeLayoutQueue(ctx),
-        CreateFindPipelineFunction(ctx),
-        CreateFindPipelineLayoutIndex(ctx),
+        CreatePipelineIdTables(ctx),
+        CreateGetPipelineId(ctx),
         CreateBuildStageFlags(ctx),
         CreateDescriptorSetLayoutBindings(ctx),
         CreateDescriptorSetLayout(ctx),
@@ -1318,10 +2238,13 @@ def GetLayoutStrings(ctx: VkForgeContext):
         CreateWriteDescriptorResourceQueueForCurrentlyBoundForgePipelineLayout(ctx),
         CreateClearDescriptorResourceQueueFunctions(ctx),
         CreateBindForgePipelineLayoutPerWriteDescriptorResourceQueue(ctx),
+        CreateResetForgeBindState(ctx),
         CreateCreateForgePipelineLayout(ctx),
         CreateDestroyForgePipelineLayout(ctx),
         CreateIsForgePipelineLayoutCompatible(ctx),
         CreateCreateForgePipeline(ctx),
+        CreateCreateAllForgePipelines(ctx),
+        CreateForgePipelineTable(ctx),
         CreateDestroyForgePipeline(ctx),
     ]
 
@@ -1336,10 +2259,18 @@ def CreateForgeLayout_Header(ctx: VkForgeContext):
 /** DEFINES **/
 #define VKFORGE_MAX_DESCRIPTOR_RESOURCES VKFORGE_MAX_DESCRIPTOR_BINDINGS
 
+// Pipeline cache file of VkForge_CreateForgeLayout. The generated CMakeLists.txt defines it as an absolute
+// path in the build directory; otherwise it is relative to the working directory.
+#ifndef VKFORGE_PIPELINE_CACHE_PATH
+#define VKFORGE_PIPELINE_CACHE_PATH "{cache_file}"
+#endif
+
 /** Main Types **/
 typedef struct VkForgeLayout VkForgeLayout;
 typedef struct VkForgePipelineLayout VkForgePipelineLayout;
 typedef struct VkForgePipeline VkForgePipeline;
+typedef struct VkForgePipelineTable VkForgePipelineTable;
+typedef struct VkForgePipelineTableStats VkForgePipelineTableStats;
 typedef struct VkForgeLayoutQueue VkForgeLayoutQueue;
 
 // Extern Types
@@ -1347,6 +2278,7 @@ typedef struct VkForgeLayoutPipelineLayoutDesign VkForgeLayoutPipelineLayoutDesi
 
 // Other Types
 typedef struct VkForgeDescriptorResourceQueue VkForgeDescriptorResourceQueue;
+typedef struct VkForgeBindState VkForgeBindState;
 
 struct VkForgeDescriptorResourceQueue
 {{
@@ -1365,6 +2297,28 @@ struct VkForgeLayout
     VkSurfaceKHR surface;
     VkPhysicalDevice physical_device;
     VkDevice device;
+
+    // Descriptor set layouts shared by the pipeline layouts, one per unique design
+    VkDescriptorSetLayout descriptor_set_layouts[VKFORGE_MAX_DESCRIPTORSET_LAYOUT_DESIGNS];
+    uint32_t descriptor_set_layout_refcounts[VKFORGE_MAX_DESCRIPTORSET_LAYOUT_DESIGNS];
+
+    // Shader modules shared by the pipelines created between
+    // VkForge_BeginForgePipelineBatch and VkForge_EndForgePipelineBatch
+    VkShaderModule shader_modules[VKFORGE_MAX_SHADER_MODULES];
+    bool keep_shader_modules;
+
+    // Pipeline cache loaded from and saved to pipeline_cache_path
+    VkPipelineCache pipeline_cache;
+    char* pipeline_cache_path;
+}};
+
+// Descriptor sets last bound, so that a bind only rebinds from the first changed set
+struct VkForgeBindState
+{{
+    uint32_t epoch; // VkForge_GetCommandBufferEpoch at the last bind
+    VkCommandBuffer command_buffer;
+    VkPipelineLayout pipeline_layout;
+    VkDescriptorSet descriptor_sets[VKFORGE_MAX_DESCRIPTORSET_LAYOUTS];
 }};
 
 struct VkForgeLayoutQueue
@@ -1372,6 +2326,7 @@ struct VkForgeLayoutQueue
     VkForgeDescriptorResourceQueue descriptor_resource_queue[VKFORGE_MAX_DESCRIPTOR_RESOURCES];
     VkWriteDescriptorSet write_descriptor_set[VKFORGE_MAX_DESCRIPTOR_RESOURCES];
     uint32_t descriptor_resource_queue_count;
+    VkForgeBindState bind_state;
 }};
 
 struct VkForgePipelineLayout
@@ -1383,6 +2338,7 @@ struct VkForgePipelineLayout
     VkDescriptorSetLayout descriptor_set_layouts[VKFORGE_MAX_DESCRIPTORSET_LAYOUTS];
     VkDescriptorSet descriptor_sets[VKFORGE_MAX_DESCRIPTORSET_LAYOUTS];
     VkDescriptorPool descriptor_pool;
+    uint32_t dirty_set_mask; // sets written since they were last bound
     bool alreadyLoggedBindInfo;
 }};
 
@@ -1392,24 +2348,60 @@ struct VkForgePipeline
     uint32_t pipeline_index;
 }};
 
+struct VkForgePipelineTableStats
+{{
+    uint32_t created_on_bind;    // created by VkForge_GetForgePipeline, on the critical path
+    uint32_t created_by_prewarm; // created by the pre-warm thread
+    uint32_t waited_on_bind;     // pre-warmed, but still being created when first bound
+    uint32_t pending;            // not created yet
+    Uint64 bind_ns;              // time VkForge_GetForgePipeline spent creating or waiting for pipelines
+}};
+
 /** API **/
 // Layout management
 VkForgeLayout *VkForge_CreateForgeLayout(VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkDevice device);
+VkForgeLayout *VkForge_CreateForgeLayoutWithPipelineCache(VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkDevice device, const char *cachePath);
 void VkForge_DestroyForgeLayout(VkForgeLayout *forgeLayout);
+bool VkForge_SaveForgePipelineCache(VkForgeLayout *forgeLayout);
 
 // Layout queue management
 VkForgeLayoutQueue *VkForge_CreateForgeLayoutQueue(void);
 void VkForge_DestroyForgeLayoutQueue(VkForgeLayoutQueue *queue);
 
+// Pipeline ids. The name taking functions below look the name up with a perfect hash
+// and call their ById variant, so prefer the ById variants in frame loops.
+VkForgePipelineId VkForge_GetPipelineId(const char *pipelineName);
+const char *VkForge_GetPipelineName(VkForgePipelineId pipelineId);
+
 // Pipeline layout management
 VkForgePipelineLayout VkForge_CreateForgePipelineLayout(VkForgeLayout *forgeLayout, const char *pipelineName);
+VkForgePipelineLayout VkForge_CreateForgePipelineLayoutById(VkForgeLayout *forgeLayout, VkForgePipelineId pipelineId);
 void VkForge_DestroyForgePipelineLayout(VkForgeLayout *forgeLayout, VkForgePipelineLayout *pipelineLayout);
 bool VkForge_IsForgePipelineLayoutCompatible(VkForgeLayout *forgeLayout, const char *pipelineName, VkForgePipelineLayout forgePipelineLayout);
+bool VkForge_IsForgePipelineLayoutCompatibleById(VkForgeLayout *forgeLayout, VkForgePipelineId pipelineId, VkForgePipelineLayout forgePipelineLayout);
 
 // Pipeline management
 VkForgePipeline VkForge_CreateForgePipeline(VkForgeLayout *forgeLayout, const char *pipelineName, VkForgePipelineLayout compatibleForgePipelineLayout);
+VkForgePipeline VkForge_CreateForgePipelineById(VkForgeLayout *forgeLayout, VkForgePipelineId pipelineId, VkForgePipelineLayout compatibleForgePipelineLayout);
 void VkForge_DestroyForgePipeline(VkForgeLayout *forgeLayout, VkForgePipeline *pipeline);
 
+// Create every pipeline at once, on threadCount threads (0 for one per logical CPU core).
+// pipelineLayouts and pipelines are indexed by VkForgePipelineId.
+void VkForge_CreateAllForgePipelines(VkForgeLayout *forgeLayout, const VkForgePipelineLayout *pipelineLayouts, VkForgePipeline *pipelines, uint32_t threadCount);
+
+// Lazy pipelines, created on first use. A low priority thread can pre-warm the PipelinePrewarm list of the config.
+// pipelineLayouts is indexed by VkForgePipelineId. VkForge_GetForgePipeline and VkForge_BindForgePipeline are thread safe.
+VkForgePipelineTable *VkForge_CreateForgePipelineTable(VkForgeLayout *forgeLayout, const VkForgePipelineLayout *pipelineLayouts, bool prewarm);
+void VkForge_DestroyForgePipelineTable(VkForgePipelineTable *table);
+VkForgePipeline VkForge_GetForgePipeline(VkForgePipelineTable *table, VkForgePipelineId pipelineId);
+void VkForge_BindForgePipeline(VkForgePipelineTable *table, VkForgePipelineId pipelineId, VkCommandBuffer commandBuffer);
+VkForgePipelineTableStats VkForge_GetForgePipelineTableStats(VkForgePipelineTable *table);
+void VkForge_LogForgePipelineTableStats(VkForgePipelineTable *table);
+
+// Share shader modules between the pipelines created in between, instead of creating them per pipeline
+void VkForge_BeginForgePipelineBatch(VkForgeLayout *forgeLayout);
+void VkForge_EndForgePipelineBatch(VkForgeLayout *forgeLayout);
+
 // Descriptor resource queueing
 void VkForge_QueueDescriptorResourceForForgePipelineLayout(
     VkForgeLayoutQueue *queue,
@@ -1430,6 +2422,8 @@ void VkForge_BindForgePipelineLayoutPerWriteDescriptorResourceQueue(
     VkForgePipelineLayout *pipelineLayout,
     VkCommandBuffer commandBuffer);
 
+void VkForge_ResetForgeBindState(VkForgeLayoutQueue *queue);
+
 // Queue clearing
 void VkForge_ClearDescriptorResourceQueueForForgePipelineLayout(
     VkForgeLayoutQueue *queue,
@@ -1437,7 +2431,7 @@ void VkForge_ClearDescriptorResourceQueueForForgePipelineLayout(
 
 void VkForge_ClearDescriptorResourceQueue(VkForgeLayoutQueue *queue);
 """
-    return content.format()
+    return content.format(cache_file=FILE.PIPELINE_CACHE)
 
 def GetLayoutHeaderStrings(ctx: VkForgeContext):
     return [
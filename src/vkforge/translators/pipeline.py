@@ -1,7 +1,146 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
 from vkforge.schema import VkPipelineModel
-from .func import extract_function_declarations
+from .common import GetCachedValue
+from pathlib import Path
+import array
+import struct
+import sys
+
+PIPELINE_FUNCTION_PARAMS = [
+    "VkAllocationCallbacks* allocator",
+    "void* next",
+    "VkDevice device",
+    "VkPipelineLayout pipeline_layout",
+    "VkPipelineCache pipeline_cache",
+    "const VkShaderModule* shader_modules",
+]
+
+def GetPipelineFunctionPrototype(pipelineName: str) -> str:
+    return f"VkPipeline VkForge_CreatePipelineFor{pipelineName}({', '.join(PIPELINE_FUNCTION_PARAMS)})"
+
+SPIRV_MAGIC = 0x07230203
+SPIRV_WORDS_PER_LINE = 8
+
+def GetShaderCodeName(shader: dict) -> str:
+    return f"VKFORGE_SPIRV_{shader[SHADER.DIGEST][:16]}"
+
+def ReadShaderCode(path) -> array.array:
+    """Read a SPIR-V binary as host-order words, whatever endianness it was written in."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < 4 or len(data) % 4:
+        raise ValueError(f"{path} is not SPIR-V: its size {len(data)} is not a multiple of 4")
+    words = array.array("I")
+    words.frombytes(data)
+    if words[0] != SPIRV_MAGIC:
+        words.byteswap()
+        if words[0] != SPIRV_MAGIC:
+            raise ValueError(f"{path} is not SPIR-V: bad magic number")
+    return words
+
+# Shader pack: header (magic, version, entry count, reserved), then one (offset, size)
+# entry per unique SPIR-V binary, then the binaries. Little endian, offsets and sizes
+# in bytes from the start of the file, every binary 4 byte aligned.
+SHADER_PACK_MAGIC = 0x50464B56  # "VKFP"
+SHADER_PACK_VERSION = 1
+SHADER_PACK_HEADER = struct.Struct("<4I")
+SHADER_PACK_ENTRY = struct.Struct("<2I")
+
+def FindShaderCodes(ctx: VkForgeContext) -> dict:
+    """Unique SPIR-V binaries used by the pipelines, in order of first use: digest -> (index, shader id, shader)."""
+    codes = {}
+    for pipelineModule in ctx.forgeModel.Pipeline:
+        for shaderId in ctx.shaderData[SHADER.COMBO][pipelineModule.name]:
+            shader = ctx.shaderData[SHADER.LIST][shaderId]
+            if shader[SHADER.DIGEST] not in codes:
+                codes[shader[SHADER.DIGEST]] = (len(codes), shaderId, shader)
+    return codes
+
+def GetShaderCodes(ctx: VkForgeContext) -> dict:
+    # Every shader module looks its binary up, so find them once per context
+    return GetCachedValue(ctx, FindShaderCodes)
+
+def GetShaderPackPath(ctx: VkForgeContext) -> Path:
+    """Path the generated code opens the shader pack from, baked like the .spv paths."""
+    return Path(ctx.overwriteShaderDir or ctx.buildDir) / FILE.SHADER_PACK
+
+def BuildShaderPack(ctx: VkForgeContext) -> bytes:
+    blobs = []
+    for _, _, shader in GetShaderCodes(ctx).values():
+        words = ReadShaderCode(shader[SHADER.CODEPATH])
+        if sys.byteorder == "big":
+            words.byteswap()
+        blobs.append(words.tobytes())
+
+    offset = SHADER_PACK_HEADER.size + SHADER_PACK_ENTRY.size * len(blobs)
+    header = [SHADER_PACK_HEADER.pack(SHADER_PACK_MAGIC, SHADER_PACK_VERSION, len(blobs), 0)]
+    for blob in blobs:
+        header.append(SHADER_PACK_ENTRY.pack(offset, len(blob)))
+        offset += len(blob)
+    return b"".join(header + blobs)
+
+def CreateShaderCode(ctx: VkForgeContext) -> str:
+    """One static array per unique SPIR-V binary, for --shader-storage embed."""
+    arrays = []
+    for _, shaderId, shader in GetShaderCodes(ctx).values():
+        name = GetShaderCodeName(shader)
+        words = ReadShaderCode(shader[SHADER.CODEPATH])
+        lines = [
+            "    " + ", ".join(f"0x{word:08x}" for word in words[i:i + SPIRV_WORDS_PER_LINE])
+            for i in range(0, len(words), SPIRV_WORDS_PER_LINE)
+        ]
+        arrays.append(
+            f"// {shaderId}\n"
+            f"static const uint32_t {name}[] =\n"
+            "{\n" + ",\n".join(lines) + "\n};\n"
+        )
+    return "\n".join(arrays)
+
+def GetShaderModuleIndex(ctx: VkForgeContext, shader: dict) -> int:
+    return GetShaderCodes(ctx)[shader[SHADER.DIGEST]][0]
+
+def GetPipelineShaderModuleIndices(ctx: VkForgeContext) -> dict:
+    """Shader module index of every stage of every pipeline: pipeline name -> [index]."""
+    return {
+        pipelineModule.name: [
+            GetShaderModuleIndex(ctx, ctx.shaderData[SHADER.LIST][shaderId])
+            for shaderId in ctx.shaderData[SHADER.COMBO][pipelineModule.name]
+        ]
+        for pipelineModule in ctx.forgeModel.Pipeline
+    }
+
+def BuildShaderModule(ctx: VkForgeContext, shader: dict) -> str:
+    if ctx.shaderStorage == "embed":
+        name = GetShaderCodeName(shader)
+        return f"VkForge_CreateShaderModuleFromCode(device, {name}, sizeof({name}))"
+    if ctx.shaderStorage == "pack":
+        index = GetShaderModuleIndex(ctx, shader)
+        return f"VkForge_CreateShaderModuleFromPack(device, \"{GetShaderPackPath(ctx).as_posix()}\", {index})"
+    return f"VkForge_CreateShaderModule(device, \"{shader[SHADER.BINPATH].as_posix()}\")"
+
+def CreateForgeShaderModule(ctx: VkForgeContext) -> str:
+    content = """\
+/**
+ * @brief Creates the shader module with the given index. Pipelines sharing a shader
+ * share its index, see VkForge_BeginForgePipelineBatch.
+ */
+VkShaderModule VkForge_CreateForgeShaderModule(VkDevice device, uint32_t shaderIndex)
+{{
+    switch (shaderIndex)
+    {{
+{cases}
+        default:
+            SDL_LogError(0, "Unknown shader module %u", shaderIndex);
+            return VK_NULL_HANDLE;
+    }}
+}}
+"""
+    cases = ""
+    for index, shaderId, shader in GetShaderCodes(ctx).values():
+        cases += f"        case {index}: // {shaderId}\n"
+        cases += f"            return {BuildShaderModule(ctx, shader)};\n"
+    return content.format(cases=cases)
 
 def BuildShaderStage(
         ctx: VkForgeContext, 
@@ -16,8 +155,9 @@ def BuildShaderStage(
 
     for shaderId in shaderIds:
         shader = ctx.shaderData[SHADER.LIST][shaderId]
-        stageInfo += "\t" * indent + f"VkShaderModule shader_{shader[SHADER.MODE]} = "
-        stageInfo += f"VkForge_CreateShaderModule(device, \"{shader[SHADER.BINPATH].as_posix()}\");\n"
+        index = GetShaderModuleIndex(ctx, shader)
+        stageInfo += "\t" * indent + f"VkShaderModule shader_{shader[SHADER.MODE]} = shader_modules ? "
+        stageInfo += f"shader_modules[{index}] : VkForge_CreateForgeShaderModule(device, {index});\n"
         stageInfo += "\t" * indent + f"if( VK_NULL_HANDLE == shader_{shader[SHADER.MODE]} )\n"
         stageInfo += "\t" * indent + "{\n"
         stageInfo += "\t" * indent2 + f'SDL_LogError(0, "Failed to create {shader[SHADER.MODE]} shader for {pipelineName} pipeline\\n");\n'
@@ -430,30 +570,31 @@ def BuildPipeline(ctx: VkForgeContext, pipelineModule: VkPipelineModel) -> str:
     pipeline += BuildPipelineInfo(ctx, pipelineModule, pipelineName, shaderIds)
     
     # Pipeline creation call
-    pipeline += "\t" * indent + f"result = vkCreateGraphicsPipelines(device, VK_NULL_HANDLE, 1, &pipelineInfo, allocator, &pipeline);\n"
+    pipeline += "\t" * indent + f"result = vkCreateGraphicsPipelines(device, pipeline_cache, 1, &pipelineInfo, allocator, &pipeline);\n\n"
+
+    # Cleanup shader modules, unless they are borrowed from the caller
+    pipeline += "\t" * indent + "if (!shader_modules)\n"
+    pipeline += "\t" * indent + "{\n"
+    for shaderId in shaderIds:
+        shader = ctx.shaderData[SHADER.LIST][shaderId]
+        shader_mode = shader[SHADER.MODE]
+        pipeline += "\t" * indent2 + f"vkDestroyShaderModule(device, shader_{shader_mode}, allocator);\n"
+    pipeline += "\t" * indent + "}\n\n"
+
     pipeline += "\t" * indent + "if (result != VK_SUCCESS) {\n"
     pipeline += "\t" * indent2 + "SDL_LogError(0, \"Failed to create pipeline %s\");\n" % pipelineName
     pipeline += "\t" * indent2 + "return VK_NULL_HANDLE;\n"
     pipeline += "\t" * indent + "}\n\n"
     
-    # Cleanup shader modules
-    for shaderId in shaderIds:
-        shader = ctx.shaderData[SHADER.LIST][shaderId]
-        shader_mode = shader[SHADER.MODE]
-        pipeline += "\t" * indent + f"vkDestroyShaderModule(device, shader_{shader_mode}, allocator);\n"
-    pipeline += "\n"
-    
     pipeline += "\t" * indent + "return pipeline;\n"
     
     # Wrap in function
     function_body = pipeline
+    function_params = ",\n    ".join(PIPELINE_FUNCTION_PARAMS)
     function_def = f"""\
 VkPipeline VkForge_CreatePipelineFor{pipelineName}
 (
-    VkAllocationCallbacks* allocator,
-    void* next,
-    VkDevice device,
-    VkPipelineLayout pipeline_layout
+    {function_params}
 )\n{{\n{function_body}}}\n
 """
     
@@ -467,22 +608,22 @@ def CreatePipelines(ctx: VkForgeContext):
     return pipelines
 
 def CreatePipelineDeclarations(ctx: VkForgeContext) -> str:
-    """Generate ONLY function forward declarations using robust regex parsing."""
+    """Generate ONLY function forward declarations, one per configured pipeline."""
     declarations = "// Function Declarations\n\n"
-    
-    # Collect all content from all modules
-    all_content = []
-    all_content.extend([CreatePipelines(ctx)])
-    
-    # Process each content block
-    for content in all_content:
-        for decl in extract_function_declarations(content):
-            declarations += decl + "\n\n"
-    
+    declarations += "VkShaderModule VkForge_CreateForgeShaderModule(VkDevice device, uint32_t shaderIndex);\n\n"
+    for pipelineModule in ctx.forgeModel.Pipeline:
+        declarations += GetPipelineFunctionPrototype(pipelineModule.name) + ";\n\n"
     return declarations
 
 def GetPipelineStrings(ctx: VkForgeContext):
+    if ctx.shaderStorage == "embed":
+        return [
+            CreateShaderCode(ctx),
+            CreateForgeShaderModule(ctx),
+            CreatePipelines(ctx),
+        ]
     return [
+        CreateForgeShaderModule(ctx),
         CreatePipelines(ctx),
     ]
 
@@ -0,0 +1,74 @@
+from vkforge.context import VkForgeContext
+from vkforge.mappings import *
+
+def CreatePrimeMain(ctx: VkForgeContext) -> str:
+    content = """\
+/**
+ * Creates every pipeline once so that the driver compiles them into the pipeline cache,
+ * then saves it. Run it at install time, or after a driver update, so that the first
+ * launch of the program does not compile pipelines on the fly.
+ *
+ * Usage: vkforge_prime [cache path, default {cache_file}]
+ */
+int main(int argc, char** argv)
+{{
+    const char* cachePath = argc > 1 ? argv[1] : VKFORGE_PIPELINE_CACHE_PATH;
+
+    if (!SDL_Init(SDL_INIT_VIDEO))
+    {{
+        SDL_LogError(0, "Failed to initialize SDL: %s", SDL_GetError());
+        return 1;
+    }}
+
+    // The surface is only needed to select the same device as the program
+    SDL_Window* window = SDL_CreateWindow("vkforge_prime", 64, 64, SDL_WINDOW_VULKAN | SDL_WINDOW_HIDDEN);
+    if (!window)
+    {{
+        SDL_LogError(0, "Failed to create window: %s", SDL_GetError());
+        SDL_Quit();
+        return 1;
+    }}
+
+    VkForgeCore* core = VkForge_CreateCore(window, NULL, 0);
+    VkForgeLayout* forgeLayout = VkForge_CreateForgeLayoutWithPipelineCache(
+        core->surface, core->physical_device, core->device, cachePath
+    );
+
+    // Pipeline creation exits on failure, so every pipeline is in the cache once they are created
+    VkForgePipelineLayout* pipelineLayouts = SDL_calloc(VKFORGE_PIPELINE_ID_COUNT + 1, sizeof(VkForgePipelineLayout));
+    VkForgePipeline* pipelines = SDL_calloc(VKFORGE_PIPELINE_ID_COUNT + 1, sizeof(VkForgePipeline));
+    if (!pipelineLayouts || !pipelines)
+    {{
+        SDL_LogError(0, "Failed to allocate memory for the pipelines");
+        exit(1);
+    }}
+
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        pipelineLayouts[id] = VkForge_CreateForgePipelineLayoutById(forgeLayout, (VkForgePipelineId)id);
+    }}
+    VkForge_CreateAllForgePipelines(forgeLayout, pipelineLayouts, pipelines, 0);
+    for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)
+    {{
+        VkForge_DestroyForgePipeline(forgeLayout, &pipelines[id]);
+        VkForge_DestroyForgePipelineLayout(forgeLayout, &pipelineLayouts[id]);
+    }}
+    SDL_free(pipelines);
+    SDL_free(pipelineLayouts);
+
+    bool saved = VkForge_SaveForgePipelineCache(forgeLayout);
+    SDL_Log("Primed %u pipelines into %s", (uint32_t)VKFORGE_PIPELINE_ID_COUNT, cachePath);
+
+    VkForge_DestroyForgeLayout(forgeLayout);
+    VkForge_DestroyCore(core);
+    SDL_DestroyWindow(window);
+    SDL_Quit();
+    return saved ? 0 : 1;
+}}
+"""
+    return content.format(cache_file=FILE.PIPELINE_CACHE)
+
+def GetPrimeStrings(ctx: VkForgeContext):
+    return [
+        CreatePrimeMain(ctx),
+    ]
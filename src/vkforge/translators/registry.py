@@ -0,0 +1,40 @@
+from typing import Callable, List
+
+# Signature registry
+#
+# Each Create* template that defines public C functions declares their prototypes
+# next to its body with @Declares. Declaration headers are then emitted straight
+# from this metadata instead of being parsed back out of the rendered C code.
+
+
+def Declares(*prototypes: str):
+    """Register the prototypes (without the trailing ';') of the C functions a template defines."""
+    def decorator(creator: Callable) -> Callable:
+        creator.declarations = list(prototypes)
+        return creator
+    return decorator
+
+
+def GetDeclarations(creators: List[Callable]) -> List[str]:
+    declarations = []
+    for creator in creators:
+        declarations.extend(getattr(creator, "declarations", []))
+    return declarations
+
+
+def CreateDeclarationList(creators: List[Callable]) -> str:
+    declarations = "// Function Declarations\n\n"
+    for declaration in GetDeclarations(creators):
+        declarations += declaration + ";\n\n"
+    return declarations
+
+
+def FindUnusedCreators(module, creators: List[Callable]) -> List[str]:
+    """Names of Create* templates defined in a translator module but never rendered."""
+    used = {creator.__name__ for creator in creators}
+    return sorted(
+        name for name, value in vars(module).items()
+        if name.startswith("Create") and callable(value)
+        and getattr(value, "__module__", None) == module.__name__
+        and name not in used
+    )
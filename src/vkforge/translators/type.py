@@ -1,5 +1,7 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
+from .layout import GetSetLayoutDesigns, GetPipelineIdName
+from .pipeline import GetShaderCodes
 
 
 def CreateCore(ctx: VkForgeContext) -> str:
@@ -52,6 +54,43 @@ struct VkForgeImageAlloc
 
     return output
 
+def CreateAllocatorTypes(ctx: VkForgeContext) -> str:
+    content = """\
+typedef struct VkForgeAllocator VkForgeAllocator;
+typedef struct VkForgeAllocation VkForgeAllocation;
+typedef struct VkForgeBufferSubAlloc VkForgeBufferSubAlloc;
+typedef struct VkForgeImageSubAlloc VkForgeImageSubAlloc;
+
+// VkForgeAllocation.block of an allocation with a device memory of its own
+#define VKFORGE_ALLOCATION_DEDICATED UINT32_MAX
+
+struct VkForgeAllocation
+{{
+    VkDeviceMemory memory;
+    VkDeviceSize   offset;
+    VkDeviceSize   size;   // Size of the range reserved, at least the size required
+    uint32_t       block;  // Block of the allocator the range is in, or VKFORGE_ALLOCATION_DEDICATED
+    void*          mapped; // Host pointer to offset if the memory is host visible, NULL otherwise
+}};
+
+struct VkForgeBufferSubAlloc
+{{
+    VkBuffer          buffer;
+    VkDeviceSize      size;
+    VkForgeAllocation allocation;
+}};
+
+struct VkForgeImageSubAlloc
+{{
+    VkImage           image;
+    VkDeviceSize      size;
+    VkForgeAllocation allocation;
+}};
+"""
+    output = content.format()
+
+    return output
+
 def CreateLayout(ctx: VkForgeContext) -> str:
     content = """\
 typedef struct VkForgeLayout VkForgeLayout;
@@ -60,6 +99,21 @@ typedef struct VkForgeLayout VkForgeLayout;
 
     return output
 
+def CreatePipelineIds(ctx: VkForgeContext) -> str:
+    content = """\
+typedef enum VkForgePipelineId VkForgePipelineId;
+
+enum VkForgePipelineId
+{{
+{ids}
+}};
+"""
+    ids = [GetPipelineIdName(pipeline.name) for pipeline in ctx.forgeModel.Pipeline]
+    ids.append("VKFORGE_PIPELINE_ID_COUNT")
+    output = content.format(ids=",\n".join(f"    {id}" for id in ids))
+
+    return output
+
 def GetMaxPipelines(ctx: VkForgeContext):
     references = ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.REFERENCES]
     return max(len(references), 1)
@@ -77,6 +131,11 @@ def GetMaxDescriptorSetLayouts(ctx: VkForgeContext):
                 max_descriptorset_layout = len(layout)
     return max(max_descriptorset_layout, 1)
 
+def GetMaxDescriptorSetLayoutDesigns(ctx: VkForgeContext):
+    layouts = ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.LAYOUTS]
+    set_designs, _ = GetSetLayoutDesigns(layouts)
+    return max(len(set_designs), 1)
+
 def GetMaxDescriptorBindings(ctx: VkForgeContext):
     layouts = ctx.layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.LAYOUTS]
     max_descriptor_binding = 0
@@ -88,18 +147,25 @@ def GetMaxDescriptorBindings(ctx: VkForgeContext):
                         max_descriptor_binding = len(set1)
     return max(max_descriptor_binding, 1)
 
+def GetMaxShaderModules(ctx: VkForgeContext):
+    return max(len(GetShaderCodes(ctx)), 1)
+
 def Create_Maxes(ctx: VkForgeContext) -> str:
     content = """\
 #define VKFORGE_MAX_PIPELINES {max_pipelines_value}
 #define VKFORGE_MAX_PIPELINE_LAYOUTS {max_pipeline_layouts_value}
 #define VKFORGE_MAX_DESCRIPTORSET_LAYOUTS {max_descriptorset_layouts_value}
+#define VKFORGE_MAX_DESCRIPTORSET_LAYOUT_DESIGNS {max_descriptorset_layout_designs_value}
 #define VKFORGE_MAX_DESCRIPTOR_BINDINGS {max_descriptor_bindings_value}
+#define VKFORGE_MAX_SHADER_MODULES {max_shader_modules_value}
 """
     output = content.format(
         max_pipelines_value=GetMaxPipelines(ctx),
         max_pipeline_layouts_value=GetMaxPipelineLayouts(ctx),
         max_descriptorset_layouts_value=GetMaxDescriptorSetLayouts(ctx),
-        max_descriptor_bindings_value=GetMaxDescriptorBindings(ctx)
+        max_descriptorset_layout_designs_value=GetMaxDescriptorSetLayoutDesigns(ctx),
+        max_descriptor_bindings_value=GetMaxDescriptorBindings(ctx),
+        max_shader_modules_value=GetMaxShaderModules(ctx)
     )
 
     return output
@@ -250,7 +316,9 @@ def GetTypeStrings(ctx: VkForgeContext):
         CreateCore(ctx),
         CreateBufferAllocType(ctx),
         CreateImageAllocType(ctx),
+        CreateAllocatorTypes(ctx),
         CreateLayout(ctx),
+        CreatePipelineIds(ctx),
         CreateTexture(ctx),
         CreateRender(ctx),
         CreateDestroyCallback(ctx),
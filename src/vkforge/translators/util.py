@@ -1,7 +1,10 @@
 from vkforge.context import VkForgeContext
 from vkforge.mappings import *
+from .registry import Declares
+from .pipeline import SHADER_PACK_MAGIC, SHADER_PACK_VERSION
 
 
+@Declares("VKAPI_ATTR VkBool32 VKAPI_CALL VkForge_DebugMsgCallback(VkDebugUtilsMessageSeverityFlagBitsEXT severity, VkDebugUtilsMessageTypeFlagsEXT type, const VkDebugUtilsMessengerCallbackDataEXT* callback, void* user)")
 def CreateDebugMsgCallback(ctx: VkForgeContext) -> str:
     content = """\
 VKAPI_ATTR VkBool32 VKAPI_CALL VkForge_DebugMsgCallback
@@ -46,6 +49,7 @@ VKAPI_ATTR VkBool32 VKAPI_CALL VkForge_DebugMsgCallback
     return output
 
 
+@Declares("VkDebugUtilsMessengerCreateInfoEXT VkForge_GetDebugUtilsMessengerCreateInfo()")
 def CreateDebugMsgInfo(ctx: VkForgeContext) -> str:
     if not ctx.forgeModel.DebugUtilsMessengerCreateInfoEXT.messageSeverity:
         messageSeverity = "0"
@@ -90,6 +94,7 @@ VkDebugUtilsMessengerCreateInfoEXT VkForge_GetDebugUtilsMessengerCreateInfo()
     return output
 
 
+@Declares("uint32_t VkForge_ScorePhysicalDeviceLimits(VkPhysicalDeviceLimits limits)")
 def CreateScorePhysicalDevice(ctx: VkForgeContext) -> str:
     content = """\
 uint32_t VkForge_ScorePhysicalDeviceLimits(VkPhysicalDeviceLimits limits)
@@ -180,6 +185,7 @@ uint32_t VkForge_ScorePhysicalDeviceLimits(VkPhysicalDeviceLimits limits)
     return output
 
 
+@Declares("VkFence VkForge_CreateFence(VkDevice device)")
 def CreateFence(ctx: VkForgeContext) -> str:
     content = """\
 VkFence VkForge_CreateFence(VkDevice device)
@@ -206,6 +212,7 @@ VkFence VkForge_CreateFence(VkDevice device)
     return output
 
 
+@Declares("VkSemaphore VkForge_CreateSemaphore(VkDevice device)")
 def CreateSemaphore(ctx: VkForgeContext) -> str:
     content = """\
 VkSemaphore VkForge_CreateSemaphore(VkDevice device)
@@ -232,6 +239,7 @@ VkSemaphore VkForge_CreateSemaphore(VkDevice device)
     return output
 
 
+@Declares("void VkForge_CmdImageBarrier(VkCommandBuffer cmdbuf, VkImage image, VkImageLayout oldLayout, VkImageLayout newLayout, VkAccessFlags srcAccessMask, VkAccessFlags dstAccessMask, VkPipelineStageFlags srcStageFlags, VkPipelineStageFlags dstStageFlags)")
 def CreateCmdImageBarrier(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_CmdImageBarrier
@@ -278,6 +286,7 @@ void VkForge_CmdImageBarrier
     return output
 
 
+@Declares("void VkForge_CmdBufferBarrier(VkCommandBuffer cmdbuf, VkBuffer buffer, VkDeviceSize offset, VkDeviceSize size, VkAccessFlags srcAccessMask, VkAccessFlags dstAccessMask, VkPipelineStageFlags srcStageFlags, VkPipelineStageFlags dstStageFlags)")
 def CreateCmdBufferBarrier(ctx: VkForgeContext) -> str:
     content = """\
 void VkForge_CmdBufferBarrier
@@ -320,6 +329,7 @@ void VkForge_CmdBufferBarrier
     return output
 
 
+@Declares("VkSurfaceFormatKHR VkForge_GetSurfaceFormat(VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkFormat req_format)")
 def CreateGetSurfaceFormat(ctx: VkForgeContext) -> str:
     content = """\
 VkSurfaceFormatKHR VkForge_GetSurfaceFormat
@@ -353,6 +363,7 @@ VkSurfaceFormatKHR VkForge_GetSurfaceFormat
     return output
 
 
+@Declares("VkSurfaceCapabilitiesKHR VkForge_GetSurfaceCapabilities(VkSurfaceKHR surface, VkPhysicalDevice physical_device)")
 def CreateGetSurfaceCapabilities(ctx: VkForgeContext) -> str:
     content = """\
 VkSurfaceCapabilitiesKHR VkForge_GetSurfaceCapabilities
@@ -378,6 +389,7 @@ VkSurfaceCapabilitiesKHR VkForge_GetSurfaceCapabilities
 
     return output
 
+@Declares("uint32_t VkForge_GetSwapchainSize(VkSurfaceKHR surface, VkPhysicalDevice physical_device, uint32_t req_size)")
 def CreateGetSwapchainSize(ctx:VkForgeContext) -> str:
     content = """\
 uint32_t VkForge_GetSwapchainSize
@@ -408,6 +420,7 @@ uint32_t VkForge_GetSwapchainSize
 
     return output
 
+@Declares("VkPresentModeKHR VkForge_GetPresentMode(VkSurfaceKHR surface, VkPhysicalDevice physical_device, VkPresentModeKHR req_mode)")
 def CreateGetPresentMode(ctx: VkForgeContext) -> str:
     content = """\
 VkPresentModeKHR VkForge_GetPresentMode
@@ -440,8 +453,35 @@ VkPresentModeKHR VkForge_GetPresentMode
     return output
 
 
+@Declares(
+    "uint32_t VkForge_FindMemoryTypeIndex(const VkPhysicalDeviceMemoryProperties* memProperties, uint32_t typeFilter, VkMemoryPropertyFlags properties)",
+    "uint32_t VkForge_GetMemoryTypeIndex(VkPhysicalDevice physical_device, uint32_t typeFilter, VkMemoryPropertyFlags properties)",
+)
 def CreateGetMemoryTypeIndex(ctx: VkForgeContext) -> str:
     content = """\
+/**
+ * @brief Finds a memory type in memProperties, which callers can query once and keep.
+ * @return The memory type index, or UINT32_MAX if no memory type is suitable
+ */
+uint32_t VkForge_FindMemoryTypeIndex
+(
+    const VkPhysicalDeviceMemoryProperties* memProperties,
+    uint32_t                                typeFilter,
+    VkMemoryPropertyFlags                   properties
+)
+{{
+    for (uint32_t i = 0; i < memProperties->memoryTypeCount; i++)
+    {{
+        if ((typeFilter & (1u << i)) &&
+            (memProperties->memoryTypes[i].propertyFlags & properties) == properties)
+        {{
+            return i;
+        }}
+    }}
+
+    return UINT32_MAX;
+}}
+
 uint32_t VkForge_GetMemoryTypeIndex
 (
     VkPhysicalDevice      physical_device,
@@ -452,18 +492,14 @@ uint32_t VkForge_GetMemoryTypeIndex
     VkPhysicalDeviceMemoryProperties memProperties = {{0}};
     vkGetPhysicalDeviceMemoryProperties(physical_device, &memProperties);
 
-    for (uint32_t i = 0; i < memProperties.memoryTypeCount; i++)
+    uint32_t index = VkForge_FindMemoryTypeIndex(&memProperties, typeFilter, properties);
+    if (index == UINT32_MAX)
     {{
-        if ((typeFilter & (1 << i)) &&
-            (memProperties.memoryTypes[i].propertyFlags & properties) == properties)
-        {{
-            return i;
-        }}
+        SDL_LogError(0, "Failed to find suitable Vulkan memory type");
+        exit(1);
     }}
 
-    SDL_LogError(0, "Failed to find suitable Vulkan memory type");
-    exit(1);
-    return 0;
+    return index;
 }}
 
 """
@@ -471,6 +507,7 @@ uint32_t VkForge_GetMemoryTypeIndex
 
     return output
 
+@Declares("VkForgeBufferAlloc VkForge_CreateBufferAlloc(VkPhysicalDevice physical_device, VkDevice device, VkDeviceSize size, VkBufferUsageFlags usage, VkMemoryPropertyFlags properties)")
 def CreateCreateBufferAlloc(ctx: VkForgeContext) -> str:
     content = """\
 VkForgeBufferAlloc VkForge_CreateBufferAlloc
@@ -496,6 +533,7 @@ VkForgeBufferAlloc VkForge_CreateBufferAlloc
 """
     return content.format()
 
+@Declares("VkForgeImageAlloc VkForge_CreateImageAlloc(VkPhysicalDevice physical_device, VkDevice device, uint32_t width, uint32_t height, VkFormat format, VkImageUsageFlags usage, VkMemoryPropertyFlags properties)")
 def CreateCreateImageAlloc(ctx: VkForgeContext) -> str:
     content = """\
 VkForgeImageAlloc VkForge_CreateImageAlloc
@@ -523,18 +561,11 @@ VkForgeImageAlloc VkForge_CreateImageAlloc
 """
     return content.format()
 
+@Declares("VkImage VkForge_CreateOffsetImage(VkDevice device, VkDeviceMemory memory, VkDeviceSize offset, uint32_t width, uint32_t height, VkFormat format, VkImageUsageFlags usage)")
 def CreateCreateImageOffset(ctx: VkForgeContext) -> str:
     content = """\
-VkImage VkForge_CreateOffsetImage
-(
-    VkDevice                   device,
-    VkDeviceMemory             memory,
-    VkDeviceSize               offset,
-    uint32_t                   width,
-    uint32_t                   height,
-    VkFormat                   format,
-    VkImageUsageFlags          usage
-)
+// Also used to query the memory requirements of an offset image before creating it
+static VkImageCreateInfo GetOffsetImageInfo(uint32_t width, uint32_t height, VkFormat format, VkImageUsageFlags usage)
 {{
     VkImageCreateInfo imageInfo = {{0}};
     imageInfo.sType         = VK_STRUCTURE_TYPE_IMAGE_CREATE_INFO;
@@ -550,6 +581,21 @@ VkImage VkForge_CreateOffsetImage
     imageInfo.usage         = usage;
     imageInfo.samples       = VK_SAMPLE_COUNT_1_BIT;
     imageInfo.sharingMode   = VK_SHARING_MODE_EXCLUSIVE;
+    return imageInfo;
+}}
+
+VkImage VkForge_CreateOffsetImage
+(
+    VkDevice                   device,
+    VkDeviceMemory             memory,
+    VkDeviceSize               offset,
+    uint32_t                   width,
+    uint32_t                   height,
+    VkFormat                   format,
+    VkImageUsageFlags          usage
+)
+{{
+    VkImageCreateInfo imageInfo = GetOffsetImageInfo(width, height, format, usage);
 
     VkImage image;
     VkResult result = vkCreateImage(device, &imageInfo, 0, &image);
@@ -571,8 +617,20 @@ VkImage VkForge_CreateOffsetImage
 """
     return content.format()
 
+@Declares("VkBuffer VkForge_CreateOffsetBuffer(VkDevice device, VkDeviceMemory memory, VkDeviceSize offset, VkDeviceSize size, VkBufferUsageFlags usage)")
 def CreateCreateBufferOffset(ctx: VkForgeContext) -> str:
     content = """\
+// Also used to query the memory requirements of an offset buffer before creating it
+static VkBufferCreateInfo GetOffsetBufferInfo(VkDeviceSize size, VkBufferUsageFlags usage)
+{{
+    VkBufferCreateInfo bufferInfo = {{0}};
+    bufferInfo.sType       = VK_STRUCTURE_TYPE_BUFFER_CREATE_INFO;
+    bufferInfo.size        = size;
+    bufferInfo.usage       = usage;
+    bufferInfo.sharingMode = VK_SHARING_MODE_EXCLUSIVE;
+    return bufferInfo;
+}}
+
 VkBuffer VkForge_CreateOffsetBuffer
 (
     VkDevice                   device,
@@ -582,11 +640,7 @@ VkBuffer VkForge_CreateOffsetBuffer
     VkBufferUsageFlags         usage
 )
 {{
-    VkBufferCreateInfo bufferInfo = {{0}};
-    bufferInfo.sType       = VK_STRUCTURE_TYPE_BUFFER_CREATE_INFO;
-    bufferInfo.size        = size;
-    bufferInfo.usage       = usage;
-    bufferInfo.sharingMode = VK_SHARING_MODE_EXCLUSIVE;
+    VkBufferCreateInfo bufferInfo = GetOffsetBufferInfo(size, usage);
 
     VkBuffer buffer;
     VkResult result = vkCreateBuffer(device, &bufferInfo, 0, &buffer);
@@ -608,6 +662,7 @@ VkBuffer VkForge_CreateOffsetBuffer
 """
     return content.format()
 
+@Declares("VkForgeBufferAlloc VkForge_CreateStagingBuffer(VkPhysicalDevice physical_device, VkDevice device, VkDeviceSize size)")
 def CreateStagingBuffer(ctx: VkForgeContext):
     content = """VkForgeBufferAlloc VkForge_CreateStagingBuffer
 (
@@ -628,6 +683,7 @@ def CreateStagingBuffer(ctx: VkForgeContext):
 """
     return content.format()
 
+@Declares("VkForgeTexture* VkForge_CreateTexture(VkPhysicalDevice physical_device, VkDevice device, VkQueue queue, VkCommandBuffer commandBuffer, const char* filename, const char* pixel_order)")
 def CreateCreateTexture(ctx: VkForgeContext):
     content = """\
 VkForgeTexture* VkForge_CreateTexture
@@ -747,6 +803,7 @@ VkForgeTexture* VkForge_CreateTexture
 """
     return content.format()
 
+@Declares("void VkForge_DestroyTexture(VkDevice device, VkForgeTexture* texture)")
 def CreateDestroyTexture(ctx: VkForgeContext):
     content = """\
 void VkForge_DestroyTexture(VkDevice device, VkForgeTexture* texture)
@@ -791,10 +848,25 @@ void VkForge_DestroyTexture(VkDevice device, VkForgeTexture* texture)
 """
     return content.format()
 
+@Declares(
+    "uint32_t VkForge_GetCommandBufferEpoch(void)",
+    "void VkForge_BeginCommandBuffer(VkCommandBuffer cmdBuf)",
+)
 def CreateBeginCommandBuffer(ctx: VkForgeContext):
     content = """\
+// Bumped by every VkForge_BeginCommandBuffer. A begun command buffer has nothing bound,
+// so descriptor sets recorded as bound in an earlier epoch must be bound again.
+static SDL_AtomicInt command_buffer_epoch;
+
+uint32_t VkForge_GetCommandBufferEpoch(void)
+{{
+    return (uint32_t)SDL_GetAtomicInt(&command_buffer_epoch);
+}}
+
 void VkForge_BeginCommandBuffer(VkCommandBuffer cmdBuf)
 {{
+    SDL_AddAtomicInt(&command_buffer_epoch, 1);
+
     VkCommandBufferBeginInfo beginInfo = {{0}};
     beginInfo.sType = VK_STRUCTURE_TYPE_COMMAND_BUFFER_BEGIN_INFO;
     beginInfo.flags = VK_COMMAND_BUFFER_USAGE_ONE_TIME_SUBMIT_BIT;
@@ -810,6 +882,7 @@ void VkForge_BeginCommandBuffer(VkCommandBuffer cmdBuf)
 """
     return content.format()
 
+@Declares("void VkForge_EndCommandBuffer(VkCommandBuffer cmdBuf)")
 def CreateEndCommandBuffer(ctx: VkForgeContext):
     content = """\
 void VkForge_EndCommandBuffer(VkCommandBuffer cmdBuf)
@@ -825,6 +898,7 @@ void VkForge_EndCommandBuffer(VkCommandBuffer cmdBuf)
 """
     return content.format()
 
+@Declares("void VkForge_CmdCopyBufferToImage(VkCommandBuffer cmdBuf, VkBuffer buffer, VkImage image, float x, float y, float w, float h, VkImageLayout layout)")
 def CreateCopyBufferToImage(ctx: VkForgeContext):
     content = """\
 void VkForge_CmdCopyBufferToImage
@@ -857,6 +931,7 @@ void VkForge_CmdCopyBufferToImage
 """
     return content.format()
 
+@Declares("void VkForge_QueueSubmit(VkQueue queue, VkCommandBuffer cmdBuf, VkPipelineStageFlags waitStage, VkSemaphore waitSemaphore, VkSemaphore signalSemaphore, VkFence fence)")
 def CreateQueueSubmit(ctx: VkForgeContext):
     content = """\
 void VkForge_QueueSubmit
@@ -890,6 +965,7 @@ void VkForge_QueueSubmit
 """
     return content.format()
 
+@Declares("VkImageView VkForge_CreateImageView(VkDevice device, VkImage image, VkFormat format)")
 def CreateImageView(ctx: VkForgeContext):
     content = """\
 VkImageView VkForge_CreateImageView
@@ -926,6 +1002,7 @@ VkImageView VkForge_CreateImageView
 """
     return content.format()
 
+@Declares("VkSampler VkForge_CreateSampler(VkDevice device, VkFilter filter, VkSamplerAddressMode addressMode)")
 def CreateSampler(ctx: VkForgeContext):
     content = """\
 VkSampler VkForge_CreateSampler
@@ -970,6 +1047,7 @@ VkSampler VkForge_CreateSampler
 """
     return content.format()
 
+@Declares("VkBuffer VkForge_CreateBuffer(VkDevice device, VkDeviceSize size, VkBufferUsageFlags usage, VkMemoryRequirements *inMemReqs)")
 def CreateCreateBuffer(ctx: VkForgeContext):
     content = """\
 VkBuffer VkForge_CreateBuffer
@@ -1009,6 +1087,7 @@ VkBuffer VkForge_CreateBuffer
 """
     return content.format()
 
+@Declares("VkImage VkForge_CreateImage(VkDevice device, uint32_t width, uint32_t height, VkFormat format, VkImageUsageFlags usage, VkMemoryRequirements *inMemReqs)")
 def CreateCreateImage(ctx: VkForgeContext):
     content = """\
 VkImage VkForge_CreateImage
@@ -1058,6 +1137,7 @@ VkImage VkForge_CreateImage
 """
     return content.format()
 
+@Declares("VkDeviceMemory VkForge_AllocDeviceMemory(VkPhysicalDevice physical_device, VkDevice device, VkMemoryRequirements memRequirements, VkMemoryPropertyFlags properties)")
 def CreateAllocDeviceMemory(ctx: VkForgeContext):
     content = """\
 VkDeviceMemory VkForge_AllocDeviceMemory
@@ -1092,6 +1172,7 @@ VkDeviceMemory VkForge_AllocDeviceMemory
 """
     return content.format()
 
+@Declares("void VkForge_BindBufferMemory(VkDevice device, VkBuffer buffer, VkDeviceMemory memory, VkDeviceSize offset)")
 def CreateBindBufferMemory(ctx: VkForgeContext):
     content = """\
 void VkForge_BindBufferMemory(VkDevice device, VkBuffer buffer, VkDeviceMemory memory, VkDeviceSize offset)
@@ -1107,6 +1188,7 @@ void VkForge_BindBufferMemory(VkDevice device, VkBuffer buffer, VkDeviceMemory m
 """
     return content.format()
 
+@Declares("void VkForge_BindImageMemory(VkDevice device, VkImage image, VkDeviceMemory memory, VkDeviceSize offset)")
 def CreateBindImageMemory(ctx: VkForgeContext):
     content = """\
 void VkForge_BindImageMemory(VkDevice device, VkImage image, VkDeviceMemory memory, VkDeviceSize offset)
@@ -1122,6 +1204,7 @@ void VkForge_BindImageMemory(VkDevice device, VkImage image, VkDeviceMemory memo
 """
     return content.format()
 
+@Declares("void VkForge_DestroyBufferAlloc(VkDevice device, VkForgeBufferAlloc bufferAlloc)")
 def CreateDestroyBufferAlloc(ctx: VkForgeContext):
     content = """\
 void VkForge_DestroyBufferAlloc(VkDevice device, VkForgeBufferAlloc bufferAlloc)
@@ -1132,26 +1215,507 @@ void VkForge_DestroyBufferAlloc(VkDevice device, VkForgeBufferAlloc bufferAlloc)
 """
     return content.format()
 
-def CreateDestroyBufferAlloc(ctx: VkForgeContext):
+@Declares("void VkForge_DestroyImageAlloc(VkDevice device, VkForgeImageAlloc imageAlloc)")
+def CreateDestroyImageAlloc(ctx: VkForgeContext):
     content = """\
-void VkForge_DestroyBufferAlloc(VkDevice device, VkForgeBufferAlloc bufferAlloc)
+void VkForge_DestroyImageAlloc(VkDevice device, VkForgeImageAlloc imageAlloc)
 {{
-    vkDestroyBuffer(device, bufferAlloc.buffer, 0);
-    vkFreeMemory(device, bufferAlloc.memory, 0);
+    vkDestroyImage(device, imageAlloc.image, 0);
+    vkFreeMemory(device, imageAlloc.memory, 0);
 }}
 """
     return content.format()
 
-def CreateDestroyImageAlloc(ctx: VkForgeContext):
+@Declares(
+    "VkForgeAllocator* VkForge_CreateAllocator(VkPhysicalDevice physical_device, VkDevice device)",
+    "void VkForge_DestroyAllocator(VkForgeAllocator* allocator)",
+    "VkForgeAllocation VkForge_AllocateMemory(VkForgeAllocator* allocator, VkMemoryRequirements memRequirements, VkMemoryPropertyFlags properties, bool linear)",
+    "void VkForge_FreeMemory(VkForgeAllocator* allocator, VkForgeAllocation allocation)",
+    "VkForgeBufferSubAlloc VkForge_CreateBufferSubAlloc(VkForgeAllocator* allocator, VkDeviceSize size, VkBufferUsageFlags usage, VkMemoryPropertyFlags properties)",
+    "VkForgeImageSubAlloc VkForge_CreateImageSubAlloc(VkForgeAllocator* allocator, uint32_t width, uint32_t height, VkFormat format, VkImageUsageFlags usage, VkMemoryPropertyFlags properties)",
+    "void VkForge_DestroyBufferSubAlloc(VkForgeAllocator* allocator, VkForgeBufferSubAlloc bufferSubAlloc)",
+    "void VkForge_DestroyImageSubAlloc(VkForgeAllocator* allocator, VkForgeImageSubAlloc imageSubAlloc)",
+)
+def CreateAllocator(ctx: VkForgeContext):
     content = """\
-void VkForge_DestroyImageAlloc(VkDevice device, VkForgeImageAlloc imageAlloc)
+// Size of the device memory blocks that allocations are carved from. Must be a power of two.
+#ifndef VKFORGE_ALLOCATOR_BLOCK_SIZE
+#define VKFORGE_ALLOCATOR_BLOCK_SIZE ((VkDeviceSize)64 * 1024 * 1024)
+#endif
+
+// Smallest range handed out of a block. Must be a power of two.
+#ifndef VKFORGE_ALLOCATOR_MIN_SIZE
+#define VKFORGE_ALLOCATOR_MIN_SIZE ((VkDeviceSize)1024)
+#endif
+
+// Allocations larger than this get their own device memory
+#ifndef VKFORGE_ALLOCATOR_DEDICATED_SIZE
+#define VKFORGE_ALLOCATOR_DEDICATED_SIZE (VKFORGE_ALLOCATOR_BLOCK_SIZE / 2)
+#endif
+
+#ifndef VKFORGE_MAX_ALLOCATOR_BLOCKS
+#define VKFORGE_MAX_ALLOCATOR_BLOCKS 256
+#endif
+
+typedef struct VkForgeAllocatorBlock VkForgeAllocatorBlock;
+
+/**
+ * A buddy allocator over one VkDeviceMemory. The block is a complete binary tree of
+ * ranges, the root covering the whole block and the leaves VKFORGE_ALLOCATOR_MIN_SIZE.
+ * free_orders[node] is 1 + the order of the largest free range under node (0 if none),
+ * where a range of order k is VKFORGE_ALLOCATOR_MIN_SIZE << k bytes. Children of node n
+ * are 2n + 1 and 2n + 2.
+ */
+struct VkForgeAllocatorBlock
 {{
-    vkDestroyImage(device, imageAlloc.image, 0);
-    vkFreeMemory(device, imageAlloc.memory, 0);
+    VkDeviceMemory memory;
+    VkDeviceSize   size;
+    uint32_t       memory_type_index;
+    bool           linear; // Buffers and images never share a block, so bufferImageGranularity is never a concern
+    uint8_t        max_order;
+    uint8_t*       free_orders;
+    void*          mapped; // Persistently mapped if the memory type is host visible
+}};
+
+struct VkForgeAllocator
+{{
+    VkPhysicalDevice physical_device;
+    VkDevice         device;
+    VkPhysicalDeviceMemoryProperties memory_properties; // Queried once
+    SDL_Mutex*       mutex;
+    uint32_t         block_count;
+    VkForgeAllocatorBlock blocks[VKFORGE_MAX_ALLOCATOR_BLOCKS];
+}};
+
+static uint8_t GetAllocationOrder(VkDeviceSize size)
+{{
+    uint8_t order = 0;
+    while ((VKFORGE_ALLOCATOR_MIN_SIZE << order) < size)
+    {{
+        order++;
+    }}
+    return order;
+}}
+
+static uint8_t MergeBuddyOrders(const VkForgeAllocatorBlock* block, uint32_t node, uint8_t order)
+{{
+    uint8_t left = block->free_orders[2 * node + 1];
+    uint8_t right = block->free_orders[2 * node + 2];
+
+    // Both halves free: the buddies merge back into one range
+    if (left == order && right == order)
+    {{
+        return order + 1;
+    }}
+    return SDL_max(left, right);
+}}
+
+static bool AllocateFromBlock(VkForgeAllocatorBlock* block, uint8_t order, VkDeviceSize* offset)
+{{
+    if (order > block->max_order || block->free_orders[0] < order + 1)
+    {{
+        return false;
+    }}
+
+    uint32_t node = 0;
+    uint8_t node_order = block->max_order;
+    while (node_order != order)
+    {{
+        uint32_t left = 2 * node + 1;
+        node = block->free_orders[left] >= order + 1 ? left : left + 1;
+        node_order--;
+    }}
+    block->free_orders[node] = 0;
+
+    uint32_t first_of_level = (1u << (block->max_order - node_order)) - 1;
+    *offset = (VkDeviceSize)(node - first_of_level) * (VKFORGE_ALLOCATOR_MIN_SIZE << node_order);
+
+    while (node)
+    {{
+        node = (node - 1) / 2;
+        node_order++;
+        block->free_orders[node] = MergeBuddyOrders(block, node, node_order);
+    }}
+    return true;
+}}
+
+static void FreeToBlock(VkForgeAllocatorBlock* block, VkDeviceSize offset)
+{{
+    // The allocated range is the lowest node marked used above the leaf at offset
+    uint32_t node = (uint32_t)(offset / VKFORGE_ALLOCATOR_MIN_SIZE) + (1u << block->max_order) - 1;
+    uint8_t node_order = 0;
+    while (block->free_orders[node] != 0)
+    {{
+        assert(node != 0 && "Offset was not allocated from this block");
+        node = (node - 1) / 2;
+        node_order++;
+    }}
+    block->free_orders[node] = node_order + 1;
+
+    while (node)
+    {{
+        node = (node - 1) / 2;
+        node_order++;
+        block->free_orders[node] = MergeBuddyOrders(block, node, node_order);
+    }}
+}}
+
+static VkDeviceMemory AllocateMappedMemory
+(
+    VkForgeAllocator* allocator,
+    VkDeviceSize      size,
+    uint32_t          memoryTypeIndex,
+    const void*       next,
+    void**            mapped
+)
+{{
+    VkMemoryAllocateInfo allocInfo = {{0}};
+    allocInfo.sType           = VK_STRUCTURE_TYPE_MEMORY_ALLOCATE_INFO;
+    allocInfo.pNext           = next;
+    allocInfo.allocationSize  = size;
+    allocInfo.memoryTypeIndex = memoryTypeIndex;
+
+    VkDeviceMemory memory = VK_NULL_HANDLE;
+    if (vkAllocateMemory(allocator->device, &allocInfo, 0, &memory) != VK_SUCCESS)
+    {{
+        return VK_NULL_HANDLE;
+    }}
+
+    *mapped = NULL;
+    VkMemoryPropertyFlags flags = allocator->memory_properties.memoryTypes[memoryTypeIndex].propertyFlags;
+    if (flags & VK_MEMORY_PROPERTY_HOST_VISIBLE_BIT)
+    {{
+        VkResult result = vkMapMemory(allocator->device, memory, 0, VK_WHOLE_SIZE, 0, mapped);
+        if (VK_SUCCESS != result)
+        {{
+            SDL_LogError(0, "Failed to map device memory: %s", VkForge_StringifyResult(result));
+            exit(1);
+        }}
+    }}
+    return memory;
+}}
+
+static bool CreateAllocatorBlock(VkForgeAllocator* allocator, uint32_t memoryTypeIndex, bool linear, VkDeviceSize minSize)
+{{
+    if (allocator->block_count == VKFORGE_MAX_ALLOCATOR_BLOCKS)
+    {{
+        return false;
+    }}
+
+    // Fall back to smaller blocks when the heap is short of memory
+    VkForgeAllocatorBlock* block = &allocator->blocks[allocator->block_count];
+    VkDeviceSize size = VKFORGE_ALLOCATOR_BLOCK_SIZE;
+    for (; size >= minSize; size /= 2)
+    {{
+        block->memory = AllocateMappedMemory(allocator, size, memoryTypeIndex, NULL, &block->mapped);
+        if (block->memory != VK_NULL_HANDLE)
+        {{
+            break;
+        }}
+    }}
+    if (block->memory == VK_NULL_HANDLE)
+    {{
+        return false;
+    }}
+
+    block->size = size;
+    block->memory_type_index = memoryTypeIndex;
+    block->linear = linear;
+    block->max_order = GetAllocationOrder(size);
+
+    uint32_t node_count = (2u << block->max_order) - 1;
+    block->free_orders = (uint8_t*)SDL_malloc(node_count);
+    if (!block->free_orders)
+    {{
+        SDL_LogError(0, "Failed to allocate memory for an allocator block");
+        exit(1);
+    }}
+    for (uint32_t node = 0, level = 0; level <= block->max_order; level++)
+    {{
+        for (uint32_t i = 0; i < (1u << level); i++, node++)
+        {{
+            block->free_orders[node] = (uint8_t)(block->max_order - level + 1);
+        }}
+    }}
+
+    allocator->block_count++;
+    return true;
+}}
+
+static VkForgeAllocation AllocateDedicatedMemory
+(
+    VkForgeAllocator*    allocator,
+    VkMemoryRequirements memRequirements,
+    uint32_t             memoryTypeIndex,
+    const void*          next
+)
+{{
+    VkForgeAllocation allocation = {{0}};
+    allocation.block  = VKFORGE_ALLOCATION_DEDICATED;
+    allocation.size   = memRequirements.size;
+    allocation.memory = AllocateMappedMemory(allocator, memRequirements.size, memoryTypeIndex, next, &allocation.mapped);
+    if (allocation.memory == VK_NULL_HANDLE)
+    {{
+        SDL_LogError(0, "Failed to Allocate Device Memory of %llu bytes", (unsigned long long)memRequirements.size);
+        exit(1);
+    }}
+    return allocation;
+}}
+
+static uint32_t FindAllocatorMemoryType(VkForgeAllocator* allocator, uint32_t typeFilter, VkMemoryPropertyFlags properties)
+{{
+    uint32_t index = VkForge_FindMemoryTypeIndex(&allocator->memory_properties, typeFilter, properties);
+    if (index == UINT32_MAX)
+    {{
+        SDL_LogError(0, "Failed to find suitable Vulkan memory type");
+        exit(1);
+    }}
+    return index;
+}}
+
+/**
+ * @brief Creates an allocator that places buffers and images in shared blocks of
+ * VKFORGE_ALLOCATOR_BLOCK_SIZE device memory, instead of one vkAllocateMemory each.
+ * Safe to use from several threads.
+ */
+VkForgeAllocator* VkForge_CreateAllocator
+(
+    VkPhysicalDevice physical_device,
+    VkDevice         device
+)
+{{
+    VkForgeAllocator* allocator = (VkForgeAllocator*)SDL_calloc(1, sizeof(VkForgeAllocator));
+    if (!allocator)
+    {{
+        SDL_LogError(0, "Failed to allocate memory for VkForgeAllocator");
+        exit(1);
+    }}
+
+    allocator->physical_device = physical_device;
+    allocator->device = device;
+    vkGetPhysicalDeviceMemoryProperties(physical_device, &allocator->memory_properties);
+
+    allocator->mutex = SDL_CreateMutex();
+    if (!allocator->mutex)
+    {{
+        SDL_LogError(0, "Failed to create the allocator lock: %s", SDL_GetError());
+        exit(1);
+    }}
+
+    return allocator;
+}}
+
+/**
+ * @brief Frees every block of the allocator. Resources still placed in them must be destroyed first.
+ */
+void VkForge_DestroyAllocator(VkForgeAllocator* allocator)
+{{
+    if (!allocator) return;
+
+    for (uint32_t i = 0; i < allocator->block_count; i++)
+    {{
+        vkFreeMemory(allocator->device, allocator->blocks[i].memory, 0);
+        SDL_free(allocator->blocks[i].free_orders);
+    }}
+
+    SDL_DestroyMutex(allocator->mutex);
+    SDL_free(allocator);
+}}
+
+/**
+ * @brief Reserves memory for a resource. linear is true for buffers and false for images.
+ * Host visible memory comes mapped, see VkForgeAllocation.mapped.
+ */
+VkForgeAllocation VkForge_AllocateMemory
+(
+    VkForgeAllocator*     allocator,
+    VkMemoryRequirements  memRequirements,
+    VkMemoryPropertyFlags properties,
+    bool                  linear
+)
+{{
+    assert(allocator);
+
+    uint32_t memoryTypeIndex = FindAllocatorMemoryType(allocator, memRequirements.memoryTypeBits, properties);
+
+    // A range of order k is aligned to its own size, so rounding up to the alignment aligns it too
+    VkDeviceSize size = SDL_max(memRequirements.size, memRequirements.alignment);
+    if (size > VKFORGE_ALLOCATOR_DEDICATED_SIZE)
+    {{
+        return AllocateDedicatedMemory(allocator, memRequirements, memoryTypeIndex, NULL);
+    }}
+    uint8_t order = GetAllocationOrder(size);
+
+    VkForgeAllocation allocation = {{0}};
+    SDL_LockMutex(allocator->mutex);
+
+    bool allocated = false;
+    for (uint32_t i = 0; i < allocator->block_count && !allocated; i++)
+    {{
+        VkForgeAllocatorBlock* block = &allocator->blocks[i];
+        if (block->memory_type_index == memoryTypeIndex && block->linear == linear)
+        {{
+            allocated = AllocateFromBlock(block, order, &allocation.offset);
+            allocation.block = i;
+        }}
+    }}
+
+    if (!allocated && CreateAllocatorBlock(allocator, memoryTypeIndex, linear, VKFORGE_ALLOCATOR_MIN_SIZE << order))
+    {{
+        allocation.block = allocator->block_count - 1;
+        allocated = AllocateFromBlock(&allocator->blocks[allocation.block], order, &allocation.offset);
+    }}
+
+    if (allocated)
+    {{
+        const VkForgeAllocatorBlock* block = &allocator->blocks[allocation.block];
+        allocation.memory = block->memory;
+        allocation.size   = VKFORGE_ALLOCATOR_MIN_SIZE << order;
+        allocation.mapped = block->mapped ? (char*)block->mapped + allocation.offset : NULL;
+    }}
+
+    SDL_UnlockMutex(allocator->mutex);
+
+    if (!allocated)
+    {{
+        // Out of blocks, try a memory of its own
+        return AllocateDedicatedMemory(allocator, memRequirements, memoryTypeIndex, NULL);
+    }}
+    return allocation;
+}}
+
+void VkForge_FreeMemory(VkForgeAllocator* allocator, VkForgeAllocation allocation)
+{{
+    assert(allocator);
+
+    if (allocation.memory == VK_NULL_HANDLE)
+    {{
+        return;
+    }}
+
+    if (allocation.block == VKFORGE_ALLOCATION_DEDICATED)
+    {{
+        vkFreeMemory(allocator->device, allocation.memory, 0);
+        return;
+    }}
+
+    // Empty blocks are kept for the next allocations until the allocator is destroyed
+    SDL_LockMutex(allocator->mutex);
+    FreeToBlock(&allocator->blocks[allocation.block], allocation.offset);
+    SDL_UnlockMutex(allocator->mutex);
+}}
+
+VkForgeBufferSubAlloc VkForge_CreateBufferSubAlloc
+(
+    VkForgeAllocator*     allocator,
+    VkDeviceSize          size,
+    VkBufferUsageFlags    usage,
+    VkMemoryPropertyFlags properties
+)
+{{
+    assert(allocator);
+
+    VkBufferCreateInfo bufferInfo = GetOffsetBufferInfo(size, usage);
+
+    VkDeviceBufferMemoryRequirements requirementsInfo = {{0}};
+    requirementsInfo.sType       = VK_STRUCTURE_TYPE_DEVICE_BUFFER_MEMORY_REQUIREMENTS;
+    requirementsInfo.pCreateInfo = &bufferInfo;
+
+    VkMemoryRequirements2 requirements = {{0}};
+    requirements.sType = VK_STRUCTURE_TYPE_MEMORY_REQUIREMENTS_2;
+    vkGetDeviceBufferMemoryRequirements(allocator->device, &requirementsInfo, &requirements);
+
+    VkForgeBufferSubAlloc subAlloc = {{0}};
+    subAlloc.allocation = VkForge_AllocateMemory(allocator, requirements.memoryRequirements, properties, true);
+    subAlloc.size       = requirements.memoryRequirements.size;
+    subAlloc.buffer     = VkForge_CreateOffsetBuffer
+    (
+        allocator->device,
+        subAlloc.allocation.memory,
+        subAlloc.allocation.offset,
+        size,
+        usage
+    );
+
+    return subAlloc;
+}}
+
+VkForgeImageSubAlloc VkForge_CreateImageSubAlloc
+(
+    VkForgeAllocator*     allocator,
+    uint32_t              width,
+    uint32_t              height,
+    VkFormat              format,
+    VkImageUsageFlags     usage,
+    VkMemoryPropertyFlags properties
+)
+{{
+    assert(allocator);
+
+    VkImageCreateInfo imageInfo = GetOffsetImageInfo(width, height, format, usage);
+
+    VkDeviceImageMemoryRequirements requirementsInfo = {{0}};
+    requirementsInfo.sType       = VK_STRUCTURE_TYPE_DEVICE_IMAGE_MEMORY_REQUIREMENTS;
+    requirementsInfo.pCreateInfo = &imageInfo;
+
+    VkMemoryDedicatedRequirements dedicated = {{0}};
+    dedicated.sType = VK_STRUCTURE_TYPE_MEMORY_DEDICATED_REQUIREMENTS;
+
+    VkMemoryRequirements2 requirements = {{0}};
+    requirements.sType = VK_STRUCTURE_TYPE_MEMORY_REQUIREMENTS_2;
+    requirements.pNext = &dedicated;
+    vkGetDeviceImageMemoryRequirements(allocator->device, &requirementsInfo, &requirements);
+
+    VkMemoryRequirements memRequirements = requirements.memoryRequirements;
+    VkForgeImageSubAlloc subAlloc = {{0}};
+    subAlloc.size = memRequirements.size;
+
+    // Big images (render targets, mostly) are faster in memory the driver knows is theirs alone
+    if (dedicated.prefersDedicatedAllocation || dedicated.requiresDedicatedAllocation ||
+        memRequirements.size > VKFORGE_ALLOCATOR_DEDICATED_SIZE)
+    {{
+        subAlloc.image = VkForge_CreateImage(allocator->device, width, height, format, usage, NULL);
+
+        VkMemoryDedicatedAllocateInfo dedicatedInfo = {{0}};
+        dedicatedInfo.sType = VK_STRUCTURE_TYPE_MEMORY_DEDICATED_ALLOCATE_INFO;
+        dedicatedInfo.image = subAlloc.image;
+
+        uint32_t memoryTypeIndex = FindAllocatorMemoryType(allocator, memRequirements.memoryTypeBits, properties);
+        subAlloc.allocation = AllocateDedicatedMemory(allocator, memRequirements, memoryTypeIndex, &dedicatedInfo);
+        VkForge_BindImageMemory(allocator->device, subAlloc.image, subAlloc.allocation.memory, 0);
+        return subAlloc;
+    }}
+
+    subAlloc.allocation = VkForge_AllocateMemory(allocator, memRequirements, properties, false);
+    subAlloc.image      = VkForge_CreateOffsetImage
+    (
+        allocator->device,
+        subAlloc.allocation.memory,
+        subAlloc.allocation.offset,
+        width,
+        height,
+        format,
+        usage
+    );
+
+    return subAlloc;
+}}
+
+void VkForge_DestroyBufferSubAlloc(VkForgeAllocator* allocator, VkForgeBufferSubAlloc bufferSubAlloc)
+{{
+    vkDestroyBuffer(allocator->device, bufferSubAlloc.buffer, 0);
+    VkForge_FreeMemory(allocator, bufferSubAlloc.allocation);
+}}
+
+void VkForge_DestroyImageSubAlloc(VkForgeAllocator* allocator, VkForgeImageSubAlloc imageSubAlloc)
+{{
+    vkDestroyImage(allocator->device, imageSubAlloc.image, 0);
+    VkForge_FreeMemory(allocator, imageSubAlloc.allocation);
 }}
 """
     return content.format()
 
+@Declares("void VkForge_SetColor(const char* hex, float alpha, float color[4])")
 def CreateSetColor(ctx: VkForgeContext):
     content = """\
 void VkForge_SetColor(const char* hex, float alpha, float color[4])
@@ -1187,6 +1751,7 @@ void VkForge_SetColor(const char* hex, float alpha, float color[4])
 """
     return content.format()
 
+@Declares("void VkForge_CmdBeginRendering(VkCommandBuffer cmdbuf, VkForgeImagePair imgPair, const char* clearColorHex, VkForgeQuad quad)")
 def CreateBeginRendering(ctx: VkForgeContext):
     content = """\
 void VkForge_CmdBeginRendering
@@ -1235,6 +1800,7 @@ void VkForge_CmdBeginRendering
 """
     return content.format()
 
+@Declares("void VkForge_CmdEndRendering(VkCommandBuffer cmdbuf, VkForgeImagePair imgPair)")
 def CreateEndRendering(ctx: VkForgeContext):
     content = """\
 void VkForge_CmdEndRendering(VkCommandBuffer cmdbuf, VkForgeImagePair imgPair)
@@ -1256,6 +1822,7 @@ void VkForge_CmdEndRendering(VkCommandBuffer cmdbuf, VkForgeImagePair imgPair)
 """
     return content.format()
 
+@Declares("VkResult VkForge_QueuePresent(VkQueue queue, VkSwapchainKHR swapchain, uint32_t index, VkSemaphore waitSemaphore)")
 def CreateQueuePresent(ctx: VkForgeContext):
     content = """\
 VkResult VkForge_QueuePresent
@@ -1279,6 +1846,7 @@ VkResult VkForge_QueuePresent
 """
     return content.format()
 
+@Declares("void* VkForge_ReadFile(const char* filePath, Sint64* inSize)")
 def CreateReadFile(ctx: VkForgeContext):
     content = """\
 void* VkForge_ReadFile(const char* filePath, Sint64* inSize)
@@ -1321,23 +1889,43 @@ void* VkForge_ReadFile(const char* filePath, Sint64* inSize)
 """
     return content.format()
 
-def CreateCreateShaderModule(ctx: VkForgeContext):
+@Declares("VkShaderModule VkForge_CreateShaderModuleFromCode(VkDevice device, const uint32_t* code, size_t codeSize)")
+def CreateCreateShaderModuleFromCode(ctx: VkForgeContext):
     content = """\
-VkShaderModule VkForge_CreateShaderModule(VkDevice device, const char* filePath)
+VkShaderModule VkForge_CreateShaderModuleFromCode(VkDevice device, const uint32_t* code, size_t codeSize)
 {{
     VkShaderModule shadermod = VK_NULL_HANDLE;
 
-    Sint64 size = 0;
-    const char* buffer = VkForge_ReadFile(filePath, &size);
-
     VkShaderModuleCreateInfo shadermod_create_info = {{0}};
     shadermod_create_info.sType = VK_STRUCTURE_TYPE_SHADER_MODULE_CREATE_INFO;
-    shadermod_create_info.codeSize = size;
-    shadermod_create_info.pCode = (uint32_t*)buffer;
+    shadermod_create_info.codeSize = codeSize;
+    shadermod_create_info.pCode = code;
 
     VkResult result = vkCreateShaderModule(device, &shadermod_create_info, 0, &shadermod);
 
     if ( VK_SUCCESS != result )
+    {{
+        SDL_LogError(0, "Failed to Create Shader Module: %s", VkForge_StringifyResult(result));
+        return VK_NULL_HANDLE;
+    }}
+
+    return shadermod;
+}}
+"""
+    return content.format()
+
+@Declares("VkShaderModule VkForge_CreateShaderModule(VkDevice device, const char* filePath)")
+def CreateCreateShaderModule(ctx: VkForgeContext):
+    content = """\
+VkShaderModule VkForge_CreateShaderModule(VkDevice device, const char* filePath)
+{{
+    Sint64 size = 0;
+    void* buffer = VkForge_ReadFile(filePath, &size);
+
+    VkShaderModule shadermod = VkForge_CreateShaderModuleFromCode(device, (const uint32_t*)buffer, (size_t)size);
+    SDL_free(buffer);
+
+    if ( VK_NULL_HANDLE == shadermod )
     {{
         SDL_LogError(0, "Failed to Create Shader Module for %s", filePath);
         exit(1);
@@ -1348,6 +1936,225 @@ VkShaderModule VkForge_CreateShaderModule(VkDevice device, const char* filePath)
 """
     return content.format()
 
+@Declares(
+    "bool VkForge_LoadShaderPack(const char* filePath)",
+    "void VkForge_UnloadShaderPack(void)",
+    "VkShaderModule VkForge_CreateShaderModuleFromPack(VkDevice device, const char* filePath, uint32_t index)",
+)
+def CreateShaderPack(ctx: VkForgeContext):
+    content = """\
+#if defined(_WIN32)
+#define WIN32_LEAN_AND_MEAN
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+#define VKFORGE_SHADER_PACK_MAGIC   0x{magic:08X}u
+#define VKFORGE_SHADER_PACK_VERSION {version}u
+
+typedef struct VkForgeShaderPackEntry VkForgeShaderPackEntry;
+
+struct VkForgeShaderPackEntry
+{{
+    uint32_t offset;
+    uint32_t size;
+}};
+
+static struct
+{{
+    SDL_InitState                 init;
+    const Uint8*                  data;
+    size_t                        size;
+    bool                          mapped;
+    uint32_t                      entry_count;
+    const VkForgeShaderPackEntry* entries;
+}} VKFORGE_SHADER_PACK;
+
+static const Uint8* MapShaderPack(const char* filePath, size_t* size)
+{{
+#if defined(_WIN32)
+    HANDLE file = CreateFileA(filePath, GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+    if (file == INVALID_HANDLE_VALUE) return NULL;
+
+    LARGE_INTEGER file_size;
+    HANDLE mapping = NULL;
+    const Uint8* data = NULL;
+    if (GetFileSizeEx(file, &file_size) && file_size.QuadPart > 0)
+    {{
+        mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+    }}
+    if (mapping)
+    {{
+        // The view keeps the mapping alive
+        data = (const Uint8*)MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+        CloseHandle(mapping);
+    }}
+    CloseHandle(file);
+
+    if (data) *size = (size_t)file_size.QuadPart;
+    return data;
+#else
+    int fd = open(filePath, O_RDONLY);
+    if (fd < 0) return NULL;
+
+    struct stat st;
+    void* data = NULL;
+    if (fstat(fd, &st) == 0 && st.st_size > 0)
+    {{
+        data = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+        if (data == MAP_FAILED) data = NULL;
+    }}
+    close(fd);
+
+    if (data) *size = (size_t)st.st_size;
+    return (const Uint8*)data;
+#endif
+}}
+
+static void ReleaseShaderPack(const Uint8* data, size_t size, bool mapped)
+{{
+    if (!mapped)
+    {{
+        SDL_free((void*)data);
+        return;
+    }}
+#if defined(_WIN32)
+    (void)size;
+    UnmapViewOfFile(data);
+#else
+    munmap((void*)data, size);
+#endif
+}}
+
+static bool ValidateShaderPack(const Uint8* data, size_t size, const char* filePath)
+{{
+    uint32_t header[4];
+    if (size < sizeof(header))
+    {{
+        SDL_LogError(0, "Shader pack %s is too small", filePath);
+        return false;
+    }}
+    SDL_memcpy(header, data, sizeof(header));
+
+    if (header[0] != VKFORGE_SHADER_PACK_MAGIC || header[1] != VKFORGE_SHADER_PACK_VERSION)
+    {{
+        SDL_LogError(0, "%s is not a version %u shader pack", filePath, VKFORGE_SHADER_PACK_VERSION);
+        return false;
+    }}
+
+    uint32_t count = header[2];
+    if ((size - sizeof(header)) / sizeof(VkForgeShaderPackEntry) < count)
+    {{
+        SDL_LogError(0, "Shader pack %s is truncated", filePath);
+        return false;
+    }}
+
+    const VkForgeShaderPackEntry* entries = (const VkForgeShaderPackEntry*)(data + sizeof(header));
+    for (uint32_t i = 0; i < count; i++)
+    {{
+        if (entries[i].offset % 4 || entries[i].size % 4 ||
+            entries[i].offset > size || entries[i].size > size - entries[i].offset)
+        {{
+            SDL_LogError(0, "Shader pack %s has a bad entry %u", filePath, i);
+            return false;
+        }}
+    }}
+    return true;
+}}
+
+/**
+ * @brief Maps the shader pack written by --shader-storage pack into memory, or reads it
+ * through SDL when it can not be mapped. Only the first successful call loads a pack;
+ * call it before creating pipelines to load the pack from another path than the generated one.
+ */
+bool VkForge_LoadShaderPack(const char* filePath)
+{{
+    assert(filePath);
+
+    if (!SDL_ShouldInit(&VKFORGE_SHADER_PACK.init))
+    {{
+        return VKFORGE_SHADER_PACK.data != NULL;
+    }}
+
+    size_t size = 0;
+    bool mapped = true;
+    const Uint8* data = MapShaderPack(filePath, &size);
+    if (!data)
+    {{
+        mapped = false;
+        data = (const Uint8*)SDL_LoadFile(filePath, &size);
+        if (!data)
+        {{
+            SDL_LogError(0, "Failed to read shader pack %s: %s", filePath, SDL_GetError());
+            SDL_SetInitialized(&VKFORGE_SHADER_PACK.init, false);
+            return false;
+        }}
+    }}
+
+    if (!ValidateShaderPack(data, size, filePath))
+    {{
+        ReleaseShaderPack(data, size, mapped);
+        SDL_SetInitialized(&VKFORGE_SHADER_PACK.init, false);
+        return false;
+    }}
+
+    VKFORGE_SHADER_PACK.data = data;
+    VKFORGE_SHADER_PACK.size = size;
+    VKFORGE_SHADER_PACK.mapped = mapped;
+    SDL_memcpy(&VKFORGE_SHADER_PACK.entry_count, data + 2 * sizeof(uint32_t), sizeof(uint32_t));
+    VKFORGE_SHADER_PACK.entries = (const VkForgeShaderPackEntry*)(data + 4 * sizeof(uint32_t));
+    SDL_SetInitialized(&VKFORGE_SHADER_PACK.init, true);
+    return true;
+}}
+
+void VkForge_UnloadShaderPack(void)
+{{
+    if (!SDL_ShouldQuit(&VKFORGE_SHADER_PACK.init))
+    {{
+        return;
+    }}
+
+    ReleaseShaderPack(VKFORGE_SHADER_PACK.data, VKFORGE_SHADER_PACK.size, VKFORGE_SHADER_PACK.mapped);
+    VKFORGE_SHADER_PACK.data = NULL;
+    VKFORGE_SHADER_PACK.size = 0;
+    VKFORGE_SHADER_PACK.entry_count = 0;
+    VKFORGE_SHADER_PACK.entries = NULL;
+    SDL_SetInitialized(&VKFORGE_SHADER_PACK.init, false);
+}}
+
+VkShaderModule VkForge_CreateShaderModuleFromPack(VkDevice device, const char* filePath, uint32_t index)
+{{
+    if (!VkForge_LoadShaderPack(filePath))
+    {{
+        exit(1);
+    }}
+
+    if (index >= VKFORGE_SHADER_PACK.entry_count)
+    {{
+        SDL_LogError(0, "Shader pack has no shader %u, it has %u", index, VKFORGE_SHADER_PACK.entry_count);
+        exit(1);
+    }}
+
+    const VkForgeShaderPackEntry* entry = &VKFORGE_SHADER_PACK.entries[index];
+    VkShaderModule shadermod = VkForge_CreateShaderModuleFromCode(
+        device, (const uint32_t*)(VKFORGE_SHADER_PACK.data + entry->offset), entry->size);
+
+    if ( VK_NULL_HANDLE == shadermod )
+    {{
+        SDL_LogError(0, "Failed to Create Shader Module for shader %u of the shader pack", index);
+        exit(1);
+    }}
+
+    return shadermod;
+}}
+"""
+    return content.format(magic=SHADER_PACK_MAGIC, version=SHADER_PACK_VERSION)
+
+@Declares("const char* VkForge_StringifyResult(VkResult result)")
 def CreateStringifyResult(ctx: VkForgeContext):
     content = """\
 const char* VkForge_StringifyResult(VkResult result)
@@ -1437,6 +2244,7 @@ const char* VkForge_StringifyResult(VkResult result)
 """
     return content.format()
 
+@Declares("void VkForge_LoadBuffer(VkPhysicalDevice physical_device, VkDevice device, VkQueue queue, VkCommandBuffer cmdBuffer, VkBuffer dstBuffer, VkDeviceSize dstOffset, VkDeviceSize size, const void* srcData)")
 def CreateLoadBuffer(ctx: VkForgeContext):
     content = """\
 void VkForge_LoadBuffer
@@ -1482,6 +2290,7 @@ void VkForge_LoadBuffer
 """
     return content.format()
 
+@Declares("void VkForge_CmdCopyBuffer(VkCommandBuffer cmdBuf, VkBuffer srcBuffer, VkBuffer dstBuffer, VkDeviceSize srcOffset, VkDeviceSize dstOffset, VkDeviceSize size)")
 def CreateCmdCopyBuffer(ctx: VkForgeContext):
     content = """\
 void VkForge_CmdCopyBuffer
@@ -1510,6 +2319,7 @@ void VkForge_CmdCopyBuffer
 """
     return content.format()
 
+@Declares("VkCommandBuffer VkForge_AllocateCommandBuffer(VkDevice device, VkCommandPool pool)")
 def CreateAllocateCommandBuffer(ctx: VkForgeContext):
     content = """\
 VkCommandBuffer VkForge_AllocateCommandBuffer
@@ -1537,6 +2347,7 @@ VkCommandBuffer VkForge_AllocateCommandBuffer
 """
     return content.format()
 
+@Declares("VkDescriptorPool VkForge_CreateDescriptorPool(VkDevice device, uint32_t max_sets, uint32_t pool_sizes_count, VkDescriptorPoolSize* pool_sizes)")
 def CreateCreateDescriptorPool(ctx: VkForgeContext):
     content = """\
 VkDescriptorPool VkForge_CreateDescriptorPool(
@@ -1567,6 +2378,7 @@ VkDescriptorPool VkForge_CreateDescriptorPool(
 """
     return content.format()
 
+@Declares("void VkForge_AllocateDescriptorSet(VkDevice device, VkDescriptorPool pool, uint32_t descriptorset_count, VkDescriptorSetLayout* descriptorset_layouts, VkDescriptorSet* outDescriptorSets)")
 def CreateAllocateDescriptorSet(ctx: VkForgeContext):
     content = """\
 /// @brief
@@ -1594,6 +2406,7 @@ void VkForge_AllocateDescriptorSet(
 """
     return content.format()
 
+@Declares("VkForgePixelFormatPair VkForge_GetPixelFormatFromString(const char* order)")
 def CreateGetPixelFormatFromString(ctx: VkForgeContext):
     content = """\
 VkForgePixelFormatPair VkForge_GetPixelFormatFromString(const char* order)
@@ -1616,6 +2429,7 @@ VkForgePixelFormatPair VkForge_GetPixelFormatFromString(const char* order)
 """
     return content.format()
 
+@Declares("bool VkForge_IsDescriptorTypeImage(VkDescriptorType type)")
 def CreatesIsDescriptorTypeImage(ctx: VkForgeContext):
     content = """\
 /**
@@ -1634,6 +2448,7 @@ bool VkForge_IsDescriptorTypeImage(VkDescriptorType type)
 """
     return content.format()
 
+@Declares("bool VkForge_IsDescriptorTypeBuffer(VkDescriptorType type)")
 def CreatesIsDescriptorTypeBuffer(ctx: VkForgeContext):
     content = """\
 /**
@@ -1651,6 +2466,7 @@ bool VkForge_IsDescriptorTypeBuffer(VkDescriptorType type)
 """
     return content.format()
 
+@Declares("const char* VkForge_StringifyDescriptorType(VkDescriptorType descriptortype)")
 def CreateStringifyDescriptorType(ctx: VkForgeContext):
     content = """\
 const char* VkForge_StringifyDescriptorType(VkDescriptorType descriptortype)
@@ -1718,55 +2534,59 @@ const char* VkForge_StringifyDescriptorType(VkDescriptorType descriptortype)
 """
     return content.format()
 
+UTIL_CREATORS = [
+    CreateDebugMsgInfo,
+    CreateDebugMsgCallback,
+    CreateScorePhysicalDevice,
+    CreateGetMemoryTypeIndex,
+    CreateGetSwapchainSize,
+    CreateGetSurfaceFormat,
+    CreateGetSurfaceCapabilities,
+    CreateGetPresentMode,
+    CreateCmdBufferBarrier,
+    CreateCmdImageBarrier,
+    CreateFence,
+    CreateSemaphore,
+    CreateBeginCommandBuffer,
+    CreateEndCommandBuffer,
+    CreateCopyBufferToImage,
+    CreateQueueSubmit,
+    CreateCreateBuffer,
+    CreateCreateBufferAlloc,
+    CreateCreateBufferOffset,
+    CreateCreateImage,
+    CreateCreateImageAlloc,
+    CreateCreateImageOffset,
+    CreateStagingBuffer,
+    CreateImageView,
+    CreateSampler,
+    CreateCreateTexture,
+    CreateDestroyTexture,
+    CreateAllocDeviceMemory,
+    CreateBindBufferMemory,
+    CreateBindImageMemory,
+    CreateDestroyBufferAlloc,
+    CreateDestroyImageAlloc,
+    CreateAllocator,
+    CreateSetColor,
+    CreateBeginRendering,
+    CreateEndRendering,
+    CreateQueuePresent,
+    CreateReadFile,
+    CreateCreateShaderModuleFromCode,
+    CreateCreateShaderModule,
+    CreateShaderPack,
+    CreateStringifyResult,
+    CreateLoadBuffer,
+    CreateCmdCopyBuffer,
+    CreateAllocateCommandBuffer,
+    CreateCreateDescriptorPool,
+    CreateAllocateDescriptorSet,
+    CreateGetPixelFormatFromString,
+    CreatesIsDescriptorTypeBuffer,
+    CreatesIsDescriptorTypeImage,
+    CreateStringifyDescriptorType,
+]
+
 def GetUtilStrings(ctx: VkForgeContext):
-    return [
-        CreateDebugMsgInfo(ctx),
-        CreateDebugMsgCallback(ctx),
-        CreateScorePhysicalDevice(ctx),
-        CreateGetMemoryTypeIndex(ctx),
-        CreateGetSwapchainSize(ctx),
-        CreateGetSurfaceFormat(ctx),
-        CreateGetSurfaceCapabilities(ctx),
-        CreateGetPresentMode(ctx),        
-        CreateCmdBufferBarrier(ctx),
-        CreateCmdImageBarrier(ctx),        
-        CreateFence(ctx),
-        CreateSemaphore(ctx),       
-        CreateBeginCommandBuffer(ctx),
-        CreateEndCommandBuffer(ctx),
-        CreateCopyBufferToImage(ctx),
-        CreateQueueSubmit(ctx),
-        CreateCreateBuffer(ctx),
-        CreateCreateBufferAlloc(ctx),
-        CreateCreateBufferOffset(ctx),
-        CreateCreateImage(ctx),
-        CreateCreateImageAlloc(ctx),
-        CreateCreateImageOffset(ctx),
-        CreateStagingBuffer(ctx),
-        CreateImageView(ctx),
-        CreateSampler(ctx),
-        CreateCreateTexture(ctx),
-        CreateDestroyTexture(ctx),
-        CreateAllocDeviceMemory(ctx),
-        CreateBindBufferMemory(ctx),
-        CreateBindImageMemory(ctx),
-        CreateDestroyBufferAlloc(ctx),
-        CreateDestroyImageAlloc(ctx),
-        CreateSetColor(ctx),
-        CreateBeginRendering(ctx),
-        CreateEndRendering(ctx),
-        CreateQueuePresent(ctx),
-        CreateReadFile(ctx),
-        CreateCreateShaderModule(ctx),
-        CreateStringifyResult(ctx),
-        CreateLoadBuffer(ctx),
-        CreateCmdCopyBuffer(ctx),
-        CreateAllocateCommandBuffer(ctx),
-        CreateCreateDescriptorPool(ctx),
-        CreateAllocateDescriptorSet(ctx),
-        CreateGetPixelFormatFromString(ctx),
-        CreatesIsDescriptorTypeBuffer(ctx),
-        CreatesIsDescriptorTypeImage(ctx),
-        CreateStringifyDescriptorType(ctx)
-
-    ]
+    return [create(ctx) for create in UTIL_CREATORS]
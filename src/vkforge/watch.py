@@ -0,0 +1,131 @@
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+import hashlib
+import os
+import time
+from .schema import VkForgeModel
+from .shader import find_shader, find_shader_includes, shader_is_source
+from .mappings import *
+
+CONFIG = ""  # key of the config file in the watched file map
+
+
+class FileWatcher:
+    """
+    Polls a set of files. A file only counts as changed when its mtime or size moved
+    and its content hash differs, so saving without edits does not trigger a rebuild.
+    """
+
+    def __init__(self):
+        self.state: Dict[Path, Optional[Tuple[int, int, str]]] = {}
+
+    def stat(self, path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def snapshot(self, path: Path) -> Optional[Tuple[int, int, str]]:
+        stat = self.stat(path)
+        if stat is None:
+            return None
+        try:
+            with open(path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except FileNotFoundError:
+            return None
+        return stat + (digest,)
+
+    def track(self, paths: List[Path]):
+        """Start watching paths, keeping the state of paths already watched."""
+        self.state = {path: self.state.get(path) or self.snapshot(path) for path in paths}
+
+    def poll(self) -> Set[Path]:
+        changed = set()
+        for path, previous in self.state.items():
+            stat = self.stat(path)
+            if previous and stat == previous[:2]:
+                continue
+            if not previous and stat is None:
+                continue
+            current = self.snapshot(path)
+            self.state[path] = current
+            if (previous and previous[2]) != (current and current[2]):
+                changed.add(path)
+        return changed
+
+
+def get_shader_files(roots: List[str], id: str) -> List[Path]:
+    """Files a shader's compiled output and reflection depend on."""
+    try:
+        path = find_shader(roots, id)
+    except FileNotFoundError:
+        return [Path(id)]
+    if shader_is_source(path.suffix):
+        return find_shader_includes(path)
+    return [path]
+
+
+def get_watched_files(config_path: str, roots: List[str], fm: Optional[VkForgeModel]) -> Dict[str, List[Path]]:
+    files = {CONFIG: [Path(config_path)]}
+    if fm:
+        for pipeline in fm.Pipeline:
+            for shader_module in pipeline.ShaderModule:
+                if shader_module.path not in files:
+                    files[shader_module.path] = get_shader_files(roots, shader_module.path)
+    return files
+
+
+def watch(
+    args,
+    load_model: Callable[[str], VkForgeModel],
+    run: Callable[..., dict],
+    interval: float = 0.5
+):
+    """
+    Regenerate whenever the config or a shader it uses changes.
+
+    The validated model and the compiled, reflected shaders are kept between runs.
+    A shader is only loaded again when one of its files changes, and the config is
+    only parsed again when it changes. The build manifest then limits rendering and
+    writing to the outputs whose inputs changed.
+    """
+    watcher = FileWatcher()
+    fm: Optional[VkForgeModel] = None
+    known: Dict[str, dict] = {}
+    validated: set = set()
+    files = get_watched_files(args.config_path, args.config_roots, None)
+    watcher.track([path for paths in files.values() for path in paths])
+    changed = None  # None: first run
+
+    try:
+        while True:
+            if changed is None or changed:
+                if changed:
+                    for path in sorted(changed):
+                        print(f"CHANGED: {path}")
+                    for id, paths in files.items():
+                        if id != CONFIG and changed.intersection(paths):
+                            known.pop(id, None)
+
+                start = time.perf_counter()
+                try:
+                    if fm is None or changed is None or changed.intersection(files[CONFIG]):
+                        fm = load_model(args.config_path)
+                    shader_data = run(args, fm, known=known, validated=validated)
+                    known = dict(shader_data[SHADER.LIST])
+                    print(f"DONE: in {time.perf_counter() - start:.2f}s")
+                except Exception as e:
+                    print(f"ERROR: {type(e).__name__}: {e}")
+
+                # Includes or the shader list may have changed
+                files = get_watched_files(args.config_path, args.config_roots, fm)
+                watcher.track([path for paths in files.values() for path in paths])
+                args.force = False
+                print(f"WATCHING: {args.config_path} and {len(files) - 1} shader(s). Press Ctrl+C to stop.")
+
+            time.sleep(interval)
+            changed = watcher.poll()
+    except KeyboardInterrupt:
+        print("STOPPED: watch")
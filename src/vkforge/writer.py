@@ -2,7 +2,12 @@ import os
 from pathlib import Path
 from vkforge.context import VkForgeContext
 from vkforge.translators import *
+from vkforge.translators.pipeline import GetShaderCodes, GetPipelineShaderModuleIndices, BuildShaderPack
 from vkforge.mappings import *
+from vkforge.cache import write_atomic
+from vkforge.manifest import Manifest
+from concurrent.futures import ProcessPoolExecutor
+from vkforge import profile
 
 TYPE_INCLUDE = f'#include "{FILE.TYPE}"'
 FUNC_INCLUDE = f'#include "{FILE.FUNC}"'
@@ -21,11 +26,8 @@ def IncludeStandardDeclarationHeaders():
 #include <SDL3/SDL.h>
 """
 
-def Write_Plain_File(ctx: VkForgeContext, filename, stringFunc):
-    output = "\n".join(stringFunc(ctx))
-
+def Write_Output(ctx: VkForgeContext, filename, output: str):
     filepath = Path(ctx.sourceDir) / filename
-    filepath.parent.mkdir(parents=True, exist_ok=True)
 
     if (
         ctx.forgeModel.GenerateOnce 
@@ -33,13 +35,25 @@ def Write_Plain_File(ctx: VkForgeContext, filename, stringFunc):
         and filepath.exists()
     ):
         print(f"SKIPPED (GenerateOnce): {filepath}")
+        return
+
+    # Leave identical files untouched so their mtime does not trigger a downstream rebuild.
+    # Otherwise write through a temp file + rename so a concurrent build never reads a partial file.
+    data = output.encode("utf-8")
+    if filepath.exists() and filepath.read_bytes() == data:
+        print(f"UNCHANGED: {filepath}")
     else:
-        with open(filepath, "w") as f:
-            f.write(output)
-            print(f"GENERATED: {filepath}")
+        write_atomic(filepath, data)
+        print(f"GENERATED: {filepath}")
 
+def Render_Plain_File(ctx: VkForgeContext, filename, stringFunc) -> str:
+    return "\n".join(stringFunc(ctx))
 
-def Write_C_Definition_Module(ctx: VkForgeContext, filename, stringFunc, additionalIncludes = []):
+def Write_Plain_File(ctx: VkForgeContext, filename, stringFunc):
+    Write_Output(ctx, filename, Render_Plain_File(ctx, filename, stringFunc))
+
+
+def Render_C_Definition_Module(ctx: VkForgeContext, filename, stringFunc, additionalIncludes = []) -> str:
     content = """\
 {standard_includes}
 {type_include}
@@ -66,22 +80,10 @@ def Write_C_Definition_Module(ctx: VkForgeContext, filename, stringFunc, additio
         code="\n".join(stringFunc(ctx)),
     )
 
-    filepath = Path(ctx.sourceDir) / filename
-    filepath.parent.mkdir(parents=True, exist_ok=True)
-
-    if (
-        ctx.forgeModel.GenerateOnce 
-        and filename in ctx.forgeModel.GenerateOnce 
-        and filepath.exists()
-    ):
-        print(f"SKIPPED (GenerateOnce): {filepath}")
-    else:
-        with open(filepath, "w") as f:
-            f.write(output)
-            print(f"GENERATED: {filepath}")
+    return output
 
 
-def Write_C_Declaration_Module(ctx: VkForgeContext, filename, stringFunc):
+def Render_C_Declaration_Module(ctx: VkForgeContext, filename, stringFunc) -> str:
     content = """\
 #pragma once
 
@@ -108,19 +110,13 @@ extern "C" {{
         code="\n".join(stringFunc(ctx)),
     )
 
-    filepath = Path(ctx.sourceDir) / filename
-    filepath.parent.mkdir(parents=True, exist_ok=True)
+    return output
 
-    if (
-        ctx.forgeModel.GenerateOnce 
-        and filename in ctx.forgeModel.GenerateOnce 
-        and filepath.exists()
-    ):
-        print(f"SKIPPED (GenerateOnce): {filepath}")
-    else:
-        with open(filepath, "w") as f:
-            f.write(output)
-            print(f"GENERATED: {filepath}")
+def Write_C_Definition_Module(ctx: VkForgeContext, filename, stringFunc, additionalIncludes = []):
+    Write_Output(ctx, filename, Render_C_Definition_Module(ctx, filename, stringFunc, additionalIncludes))
+
+def Write_C_Declaration_Module(ctx: VkForgeContext, filename, stringFunc):
+    Write_Output(ctx, filename, Render_C_Declaration_Module(ctx, filename, stringFunc))
 
 def GetInclude(name:str)->str:
     if "#include" in name:
@@ -148,13 +144,157 @@ def GetUserDefinedInsertions(ctx: VkForgeContext) -> str:
             return '\n'.join(insertions) + '\n'
     return "/** NO USER DECLARATIONS **/"
 
-def Generate(ctx: VkForgeContext):
-    Write_C_Definition_Module(ctx, FILE.CORE, GetCoreStrings)
-    Write_C_Definition_Module(ctx, FILE.UTIL, GetUtilStrings, additionalIncludes=["<stdlib.h>", "<SDL3_image/SDL_image.h>"])
-    Write_C_Definition_Module(ctx, FILE.LAYOUT_C, GetLayoutStrings, additionalIncludes=[FILE.PIPELINE_H, FILE.LAYOUT_H])
-    Write_C_Definition_Module(ctx, FILE.PIPELINE_C, GetPipelineStrings)
-    Write_C_Declaration_Module(ctx, FILE.TYPE, GetTypeStrings)
-    Write_C_Declaration_Module(ctx, FILE.FUNC, GetFuncStrings)
-    Write_C_Declaration_Module(ctx, FILE.PIPELINE_H, GetPipelineDeclarationStrings)
-    Write_C_Declaration_Module(ctx, FILE.LAYOUT_H, GetLayoutHeaderStrings)
-    Write_Plain_File(ctx, FILE.CMAKE, GetCMakeStrings)
+def CoreInputs(ctx: VkForgeContext) -> list:
+    fm = ctx.forgeModel
+    return [ctx.removeValidations, fm.InstanceCreateInfo, fm.ApplicationInfo, fm.DeviceCreateInfo]
+
+def UtilInputs(ctx: VkForgeContext) -> list:
+    return [ctx.forgeModel.DebugUtilsMessengerCreateInfoEXT]
+
+def PipelineNames(ctx: VkForgeContext) -> list:
+    return [pipeline.name for pipeline in ctx.forgeModel.Pipeline]
+
+def PipelineShaderModules(ctx: VkForgeContext) -> list:
+    # Pipeline ids and shader module indices both follow the config order
+    return list(GetPipelineShaderModuleIndices(ctx).items())
+
+# Every generated file with the inputs it is rendered from.
+# A file is only rendered again when one of its inputs (or VkForge itself) changes.
+# Definition modules also embed the UserDefined includes and insertions.
+ARTIFACTS = [
+    (FILE.CORE,       Render_C_Definition_Module,  GetCoreStrings,               [],                                        lambda ctx: CoreInputs(ctx)),
+    (FILE.UTIL,       Render_C_Definition_Module,  GetUtilStrings,               ["<stdlib.h>", "<SDL3_image/SDL_image.h>"], lambda ctx: UtilInputs(ctx)),
+    (FILE.LAYOUT_C,   Render_C_Definition_Module,  GetLayoutStrings,             [FILE.PIPELINE_H, FILE.LAYOUT_H],          lambda ctx: [ctx.layout, PipelineShaderModules(ctx), ctx.forgeModel.PipelinePrewarm]),
+    (FILE.PIPELINE_C, Render_C_Definition_Module,  GetPipelineStrings,           [],                                        lambda ctx: [ctx.forgeModel.Pipeline, ctx.shaderData, ctx.shaderStorage, ctx.overwriteShaderDir, ctx.buildDir]),
+    (FILE.TYPE,       Render_C_Declaration_Module, GetTypeStrings,               None,                                      lambda ctx: [ctx.layout, PipelineShaderModules(ctx)]),
+    (FILE.FUNC,       Render_C_Declaration_Module, GetFuncStrings,               None,                                      lambda ctx: []),
+    (FILE.PIPELINE_H, Render_C_Declaration_Module, GetPipelineDeclarationStrings, None,                                     lambda ctx: PipelineNames(ctx)),
+    (FILE.LAYOUT_H,   Render_C_Declaration_Module, GetLayoutHeaderStrings,       None,                                      lambda ctx: []),
+    (FILE.PRIME,      Render_C_Definition_Module,  GetPrimeStrings,              [FILE.PIPELINE_H, FILE.LAYOUT_H],          lambda ctx: []),
+    (FILE.CMAKE,      Render_Plain_File,           GetCMakeStrings,              None,                                      lambda ctx: [ctx.forgeModel.ID]),
+]
+ARTIFACT_TABLE = {artifact[0]: artifact for artifact in ARTIFACTS}
+
+# Context of a render worker process, set once by InitRenderWorker
+# so that it is not pickled again for every artifact.
+worker_ctx: VkForgeContext = None
+
+def InitRenderWorker(ctx: VkForgeContext, profiling: bool = False):
+    global worker_ctx
+    worker_ctx = ctx
+    if profiling:
+        profile.enable()
+
+def RenderArtifact(filename, ctx: VkForgeContext) -> str:
+    _, render, stringFunc, additionalIncludes, _ = ARTIFACT_TABLE[filename]
+    with profile.span(f"render {filename}", "render"):
+        if additionalIncludes is None:
+            return render(ctx, filename, stringFunc)
+        return render(ctx, filename, stringFunc, additionalIncludes=additionalIncludes)
+
+def RenderArtifactInWorker(filename) -> tuple:
+    # Hand the spans recorded for this artifact back to the parent process
+    output = RenderArtifact(filename, worker_ctx)
+    events = profile.PROFILER.drain() if profile.is_enabled() else []
+    return output, events
+
+def RenderArtifacts(ctx: VkForgeContext, filenames: list, jobs: int, serial: bool) -> dict:
+    """
+    Render each artifact to a string. Artifacts only read the context so they are rendered
+    concurrently on a process pool. Returns filename -> output, or the exception raised.
+    """
+    results = {}
+    if serial or jobs <= 1 or len(filenames) <= 1:
+        for filename in filenames:
+            try:
+                results[filename] = RenderArtifact(filename, ctx)
+            except Exception as e:
+                results[filename] = e
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(filenames)), initializer=InitRenderWorker, initargs=(ctx, profile.is_enabled())
+    ) as pool:
+        futures = {filename: pool.submit(RenderArtifactInWorker, filename) for filename in filenames}
+        for filename, future in futures.items():
+            try:
+                results[filename], events = future.result()
+                if events:
+                    profile.PROFILER.extend(events)
+            except Exception as e:
+                results[filename] = e
+    return results
+
+def GetPendingArtifacts(ctx: VkForgeContext, manifest: Manifest = None) -> tuple:
+    """Fingerprint each artifact's inputs and list the artifacts that must be rendered again."""
+    keys = {}
+    pending = []
+    for filename, render, _, _, inputs in ARTIFACTS:
+        filepath = Path(ctx.sourceDir) / filename
+
+        if manifest:
+            deps = inputs(ctx)
+            if render == Render_C_Definition_Module:
+                deps = deps + [ctx.forgeModel.UserDefined]
+            keys[filename] = manifest.fingerprint(filename, deps)
+            if manifest.is_current(filename, keys[filename], filepath):
+                manifest.record(filename, keys[filename], filepath)
+                print(f"SKIPPED (inputs unchanged): {filepath}")
+                continue
+        pending.append(filename)
+    return keys, pending
+
+def WriteShaderPack(ctx: VkForgeContext, manifest: Manifest = None):
+    """Write the SPIR-V the pipelines load with --shader-storage pack into --build-dir."""
+    filepath = Path(ctx.buildDir) / FILE.SHADER_PACK
+
+    if manifest:
+        key = manifest.fingerprint(FILE.SHADER_PACK, list(GetShaderCodes(ctx)))
+        if manifest.is_current(FILE.SHADER_PACK, key, filepath):
+            manifest.record(FILE.SHADER_PACK, key, filepath)
+            print(f"SKIPPED (inputs unchanged): {filepath}")
+            return
+
+    data = BuildShaderPack(ctx)
+    if filepath.exists() and filepath.read_bytes() == data:
+        print(f"UNCHANGED: {filepath}")
+    else:
+        write_atomic(filepath, data)
+        print(f"GENERATED: {filepath}")
+
+    if manifest:
+        manifest.record(FILE.SHADER_PACK, key, filepath)
+
+def Generate(ctx: VkForgeContext, manifest: Manifest = None, jobs: int = None, serial: bool = False):
+    with profile.span("check_manifest"):
+        keys, pending = GetPendingArtifacts(ctx, manifest)
+
+    with profile.span("render_artifacts"):
+        results = RenderArtifacts(ctx, pending, jobs or os.cpu_count() or 1, serial)
+
+    # Write in table order so the output and log do not depend on which worker finished first
+    errors = []
+    for filename in pending:
+        filepath = Path(ctx.sourceDir) / filename
+        output = results[filename]
+        if isinstance(output, Exception):
+            print(f"FAILED: {filepath}: {type(output).__name__}: {output}")
+            errors.append((filename, output))
+            continue
+
+        with profile.span(f"write {filename}", "write"):
+            Write_Output(ctx, filename, output)
+        if manifest:
+            manifest.record(filename, keys[filename], filepath)
+
+    if ctx.shaderStorage == "pack":
+        with profile.span("write_shader_pack"):
+            WriteShaderPack(ctx, manifest)
+
+    if manifest:
+        with profile.span("save_manifest"):
+            manifest.save()
+
+    if errors:
+        failed = ", ".join(str(filename) for filename, _ in errors)
+        raise RuntimeError(f"Failed to generate {len(errors)} file(s): {failed}") from errors[0][1]
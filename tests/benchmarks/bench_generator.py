@@ -0,0 +1,135 @@
+"""
+Benchmark the VkForge generator on synthetic configs.
+
+    python tests/benchmarks/bench_generator.py                      # run and compare to baseline.json
+    python tests/benchmarks/bench_generator.py --update-baseline    # record a new baseline
+    python tests/benchmarks/bench_generator.py --full               # every size x sets x bindings case
+
+Times VkForgeModel validation, create_pipeline_layouts, each translator and
+Generate. Runs without a Vulkan SDK: shader data is synthesized (see synthetic.py).
+Exits with 1 when a phase is slower than --tolerance times its baseline.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from synthetic import make_config, make_shader_data
+from vkforge.schema import VkForgeModel
+from vkforge.context import VkForgeContext
+from vkforge.layout import create_pipeline_layouts
+from vkforge.writer import ARTIFACTS, Generate
+import contextlib
+import io
+
+BASELINE = Path(__file__).parent / "baseline.json"
+# Key of the machine the baseline was recorded on; every other key is a case
+META = "_machine"
+
+# (pipelines, sets, bindings)
+DEFAULT_CASES = [(10, 1, 1), (100, 4, 8), (1000, 8, 16)]
+FULL_CASES = [(p, s, b) for p in (10, 100, 1000) for s, b in ((1, 1), (4, 8), (8, 16))]
+
+
+def best_of(repeat: int, func) -> float:
+    """Best wall time of func in milliseconds, which is the least noisy estimate."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_case(pipelines: int, sets: int, bindings: int, repeat: int) -> dict:
+    config = make_config(pipelines)
+    fm = VkForgeModel(**config)
+    shader_data = make_shader_data(config, sets, bindings)
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    timings = {}
+    timings["validate"] = best_of(repeat, lambda: VkForgeModel(**config))
+    with quiet:
+        timings["layout"] = best_of(repeat, lambda: create_pipeline_layouts(fm, shader_data))
+        layout = create_pipeline_layouts(fm, shader_data)
+
+    with tempfile.TemporaryDirectory() as source_dir:
+        def context():
+            return VkForgeContext(False, source_dir, source_dir, fm, shader_data, layout)
+
+        for filename, _, stringFunc, _, _ in ARTIFACTS:
+            timings[f"translate {filename}"] = best_of(repeat, lambda: stringFunc(context()))
+
+        with quiet:
+            timings["generate"] = best_of(repeat, lambda: Generate(context(), serial=True))
+    return timings
+
+
+def case_name(pipelines: int, sets: int, bindings: int) -> str:
+    return f"{pipelines}p_{sets}s_{bindings}b"
+
+
+def machine_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    recorded = baseline.get(META)
+    if recorded and recorded != machine_info():
+        print(f"Baseline was recorded on another machine, compare with care: {recorded}")
+    for case, timings in results.items():
+        print(f"\n{case}")
+        for phase, ms in timings.items():
+            base = baseline.get(case, {}).get(phase)
+            if base:
+                ratio = ms / base
+                flag = "  REGRESSION" if ratio > tolerance and ms - base > 1.0 else ""
+                print(f"  {phase:<36} {ms:>10.2f} ms  baseline {base:>10.2f} ms  x{ratio:.2f}{flag}")
+                if flag:
+                    regressions.append((case, phase, ratio))
+            else:
+                print(f"  {phase:<36} {ms:>10.2f} ms  (no baseline)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the VkForge generator on synthetic configs.")
+    parser.add_argument("--full", action="store_true", help="Run every size x sets x bindings case.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept.")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Slowdown factor over the baseline that fails the run.")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to baseline.json.")
+    args = parser.parse_args()
+
+    results = {}
+    for case in FULL_CASES if args.full else DEFAULT_CASES:
+        results[case_name(*case)] = run_case(*case, args.repeat)
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    regressions = compare(results, baseline, args.tolerance)
+
+    if args.update_baseline:
+        baseline.update({case: {k: round(v, 3) for k, v in t.items()} for case, t in results.items()})
+        baseline[META] = machine_info()
+        BASELINE.write_text(json.dumps(baseline, indent=4) + "\n")
+        print(f"\nGENERATED: {BASELINE}")
+    elif regressions:
+        print(f"\n{len(regressions)} phase(s) slower than x{args.tolerance} the baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
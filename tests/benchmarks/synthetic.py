@@ -0,0 +1,100 @@
+# Synthetic configs and shader data for benchmarking VkForge at scale.
+#
+# The shader data is built from fake reflection dicts in the same shape spirv-cross
+# produces, so nothing here needs glslangValidator, spirv-cross or a Vulkan SDK.
+
+from pathlib import Path
+from vkforge.mappings import *
+from vkforge.cache import hash_bytes
+
+# Descriptor kinds cycled through the bindings: (reflect key, reflected type)
+KINDS = [
+    (REFLECT.UBO, "_ubo"),
+    (REFLECT.TEXTURE, "sampler2D"),
+    (REFLECT.SSBO, "_ssbo"),
+]
+
+# Pipelines come in this many descriptor variants so the layout passes have to merge and split
+VARIANTS = 4
+
+
+def make_config(pipelines: int) -> dict:
+    return {
+        "ID": "VkForge 0.5",
+        "UserDefined": {
+            "insertions": [
+                "typedef struct Vertex Vertex;",
+                "struct Vertex { float x, y, w, h; };",
+            ]
+        },
+        "Pipeline": [
+            {
+                "name": f"Pipeline{i}",
+                "ShaderModule": [
+                    {"path": f"p{i}.vert"},
+                    {"path": f"v{i % VARIANTS}.frag"},
+                ],
+                "VertexInputBindingDescription": [
+                    {"stride": "Vertex", "first_location": 0, "input_rate": "vertex"}
+                ],
+            }
+            for i in range(pipelines)
+        ],
+    }
+
+
+def make_descriptors(variant: int, sets: int, bindings: int) -> dict:
+    reflect = {REFLECT.TYPE: {}}
+    for set1 in range(sets):
+        for binding in range(bindings):
+            key, type = KINDS[(set1 + binding + variant) % len(KINDS)]
+            resource = {
+                MEMBER.NAME: f"r{set1}_{binding}",
+                MEMBER.SET: set1,
+                MEMBER.BIND: binding,
+            }
+            if type.startswith("_"):
+                type = f"_{set1}_{binding}"
+                reflect[REFLECT.TYPE][type] = {"name": type, "members": [{"name": "m", "type": "mat4", "offset": 0}]}
+            resource[MEMBER.TYPE] = type
+            reflect.setdefault(key, []).append(resource)
+    return reflect
+
+
+def make_reflection(mode: str, variant: int, sets: int, bindings: int) -> dict:
+    reflect = {REFLECT.ENTRYPOINT: [{"name": "main", "mode": mode}]}
+    if mode == "vert":
+        reflect[REFLECT.INPUT] = [
+            {"type": "vec2", "name": "pos", "location": 0},
+            {"type": "vec2", "name": "size", "location": 1},
+        ]
+        reflect[REFLECT.OUTPUT] = [{"type": "vec4", "name": "color", "location": 0}]
+    else:
+        reflect[REFLECT.INPUT] = [{"type": "vec4", "name": "color", "location": 0}]
+        reflect[REFLECT.OUTPUT] = [{"type": "vec4", "name": "out_color", "location": 0}]
+        reflect.update(make_descriptors(variant, sets, bindings))
+    return reflect
+
+
+def make_shader_data(config: dict, sets: int, bindings: int) -> dict:
+    """Shader data as load_shader_data returns it, with injected reflections in place of reflect_shader."""
+    shader_list = {}
+    shader_combinations = {}
+    for pipeline in config["Pipeline"]:
+        ids = [module["path"] for module in pipeline["ShaderModule"]]
+        shader_combinations[pipeline["name"]] = ids
+        for id in ids:
+            if id in shader_list:
+                continue
+            mode = Path(id).suffix[1:]
+            variant = int(Path(id).stem[1:]) % VARIANTS
+            shader_list[id] = {
+                SHADER.MODE: mode,
+                SHADER.ENTRYNAME: "main",
+                SHADER.BINPATH: Path("build") / (id + ".spv"),
+                SHADER.CODEPATH: Path("build") / (id + ".spv"),
+                SHADER.DIGEST: hash_bytes(id),
+                SHADER.SRCPATH: Path(id),
+                SHADER.REFLECT: make_reflection(mode, variant, sets, bindings),
+            }
+    return {SHADER.LIST: shader_list, SHADER.COMBO: shader_combinations}
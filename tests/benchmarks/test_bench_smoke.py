@@ -0,0 +1,29 @@
+from pathlib import Path
+import json
+import sys
+import warnings
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_generator import BASELINE, META, case_name, run_case
+
+
+def test_smallest_case_runs():
+    timings = run_case(10, 1, 1, repeat=1)
+    assert "validate" in timings and "layout" in timings and "generate" in timings
+    assert all(ms >= 0 for ms in timings.values())
+
+
+def test_baseline_covers_the_measured_phases():
+    baseline = json.loads(BASELINE.read_text())
+    recorded = set(baseline[case_name(10, 1, 1)])
+    measured = set(run_case(10, 1, 1, repeat=1))
+    # Phases come and go with the artifacts; only the ones in both are compared
+    assert {"validate", "layout", "generate"} <= recorded & measured
+    if recorded != measured:
+        warnings.warn(f"baseline.json is stale, phases differ: {sorted(recorded ^ measured)}")
+
+
+def test_baseline_records_the_machine():
+    baseline = json.loads(BASELINE.read_text())
+    assert "python" in baseline[META]
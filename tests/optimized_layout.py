@@ -1,4 +1,4 @@
-from vkforge.layout import optimize_pipeline_layouts, check_for_errors_single_descriptorsets
+from vkforge.layout import optimize_pipeline_layouts
 import json
 
 def convert_sets_to_lists(obj):
@@ -0,0 +1,256 @@
+from vkforge.schema import VkForgeModel
+from vkforge.context import VkForgeContext
+from vkforge.translators.util import CreateAllocator, UTIL_CREATORS
+from typing import Optional
+import pytest
+import random
+import shutil
+import subprocess
+
+
+def make_ctx() -> VkForgeContext:
+    return VkForgeContext(forgeModel=VkForgeModel(ID="VkForge 0.5", Pipeline=[]))
+
+
+def test_sub_allocations_reuse_the_offset_helpers():
+    code = CreateAllocator(make_ctx())
+    assert "VkForge_CreateOffsetBuffer\n    (\n        allocator->device,\n        subAlloc.allocation.memory,\n        subAlloc.allocation.offset," in code
+    assert "VkForge_CreateOffsetImage\n    (\n        allocator->device,\n        subAlloc.allocation.memory,\n        subAlloc.allocation.offset," in code
+    # Memory properties are queried once, when the allocator is created
+    assert code.count("vkGetPhysicalDeviceMemoryProperties(") == 1
+
+
+def test_allocator_follows_the_offset_helpers():
+    # The allocator calls the static create-info helpers defined with them
+    names = [creator.__name__ for creator in UTIL_CREATORS]
+    assert names.index("CreateAllocator") > names.index("CreateCreateBufferOffset")
+    assert names.index("CreateAllocator") > names.index("CreateCreateImageOffset")
+
+
+# A mirror of the buddy tree in the generated allocator, used as the reference
+# for the allocate, free and merge node math and for the block size fallback.
+MIN_SIZE = 1024
+BLOCK_SIZE = 64 * 1024 * 1024
+
+
+def get_allocation_order(size: int, min_size: int = MIN_SIZE) -> int:
+    order = 0
+    while (min_size << order) < size:
+        order += 1
+    return order
+
+
+def get_block_size(available: int, min_size: int) -> Optional[int]:
+    """Size of the block CreateAllocatorBlock gets from a heap with this much memory left."""
+    size = BLOCK_SIZE
+    while size >= min_size:
+        if size <= available:
+            return size
+        size //= 2
+    return None
+
+
+class BuddyBlock:
+    def __init__(self, size: int, min_size: int = MIN_SIZE):
+        self.min_size = min_size
+        self.max_order = get_allocation_order(size, min_size)
+        self.free_orders = [
+            self.max_order - level + 1 for level in range(self.max_order + 1) for _ in range(1 << level)
+        ]
+
+    def merge(self, node: int, order: int) -> int:
+        left = self.free_orders[2 * node + 1]
+        right = self.free_orders[2 * node + 2]
+        if left == order and right == order:
+            return order + 1
+        return max(left, right)
+
+    def allocate(self, order: int) -> Optional[int]:
+        if order > self.max_order or self.free_orders[0] < order + 1:
+            return None
+        node, node_order = 0, self.max_order
+        while node_order != order:
+            left = 2 * node + 1
+            node = left if self.free_orders[left] >= order + 1 else left + 1
+            node_order -= 1
+        self.free_orders[node] = 0
+
+        first_of_level = (1 << (self.max_order - node_order)) - 1
+        offset = (node - first_of_level) * (self.min_size << node_order)
+        while node:
+            node = (node - 1) // 2
+            node_order += 1
+            self.free_orders[node] = self.merge(node, node_order)
+        return offset
+
+    def free(self, offset: int):
+        node = offset // self.min_size + (1 << self.max_order) - 1
+        node_order = 0
+        while self.free_orders[node] != 0:
+            assert node != 0, "offset was not allocated from this block"
+            node = (node - 1) // 2
+            node_order += 1
+        self.free_orders[node] = node_order + 1
+        while node:
+            node = (node - 1) // 2
+            node_order += 1
+            self.free_orders[node] = self.merge(node, node_order)
+
+
+def test_buddies_merge_back_to_a_full_block():
+    block = BuddyBlock(16 * MIN_SIZE)
+    full = list(block.free_orders)
+
+    offsets = [block.allocate(0) for _ in range(16)]
+    assert sorted(offsets) == [i * MIN_SIZE for i in range(16)]
+    assert block.allocate(0) is None
+
+    for offset in random.Random(1).sample(offsets, len(offsets)):
+        block.free(offset)
+    assert block.free_orders == full
+    assert block.allocate(block.max_order) == 0
+
+
+def test_alignment_larger_than_the_size():
+    block = BuddyBlock(64 * MIN_SIZE)
+    assert block.allocate(0) == 0
+
+    # VkForge_AllocateMemory rounds the size up to the alignment
+    order = get_allocation_order(max(256, 16 * MIN_SIZE))
+    offset = block.allocate(order)
+    assert offset % (16 * MIN_SIZE) == 0 and offset != 0
+
+
+def test_offsets_are_aligned_to_their_size():
+    block = BuddyBlock(256 * MIN_SIZE)
+    rng = random.Random(2)
+    live = {}
+    for _ in range(2000):
+        if live and rng.random() < 0.45:
+            offset = rng.choice(sorted(live))
+            block.free(offset)
+            del live[offset]
+            continue
+        size = MIN_SIZE << rng.randrange(6)
+        offset = block.allocate(get_allocation_order(size))
+        if offset is None:
+            continue
+        assert offset % size == 0 and offset + size <= 256 * MIN_SIZE
+        assert all(offset + size <= o or o + s <= offset for o, s in live.items())
+        live[offset] = size
+
+
+def test_blocks_fall_back_to_smaller_sizes():
+    assert get_block_size(BLOCK_SIZE, MIN_SIZE) == BLOCK_SIZE
+    assert get_block_size(BLOCK_SIZE - 1, MIN_SIZE) == BLOCK_SIZE // 2
+    assert get_block_size(5 * 1024 * 1024, MIN_SIZE) == 4 * 1024 * 1024
+    # Never smaller than the allocation that needs the block
+    assert get_block_size(3 * MIN_SIZE, 4 * MIN_SIZE) is None
+
+    code = CreateAllocator(make_ctx())
+    assert "VkDeviceSize size = VKFORGE_ALLOCATOR_BLOCK_SIZE;\n    for (; size >= minSize; size /= 2)" in code
+    assert "VkDeviceSize size = SDL_max(memRequirements.size, memRequirements.alignment);" in code
+
+
+HARNESS_PRELUDE = """\
+#include <assert.h>
+#include <stdbool.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+typedef uint64_t VkDeviceSize;
+typedef void* VkDeviceMemory;
+typedef void* VkDevice;
+typedef void* VkPhysicalDevice;
+typedef struct { int unused; } VkPhysicalDeviceMemoryProperties;
+typedef struct SDL_Mutex SDL_Mutex;
+#define SDL_max(a, b) ((a) > (b) ? (a) : (b))
+"""
+
+HARNESS_MAIN = """\
+int main(void)
+{{
+    static const long long ops[] = {{ {ops} }};
+    VkForgeAllocatorBlock block = {{0}};
+    block.max_order = GetAllocationOrder(VKFORGE_ALLOCATOR_BLOCK_SIZE);
+    block.free_orders = (uint8_t*)malloc((2u << block.max_order) - 1);
+    for (uint32_t node = 0, level = 0; level <= block.max_order; level++)
+    {{
+        for (uint32_t i = 0; i < (1u << level); i++, node++)
+        {{
+            block.free_orders[node] = (uint8_t)(block.max_order - level + 1);
+        }}
+    }}
+    for (size_t i = 0; i < sizeof(ops) / sizeof(ops[0]); i++)
+    {{
+        VkDeviceSize offset = 0;
+        if (ops[i] < 0)
+        {{
+            FreeToBlock(&block, (VkDeviceSize)(-ops[i] - 1));
+            printf("free %d\\n", block.free_orders[0]);
+        }}
+        else if (AllocateFromBlock(&block, (uint8_t)ops[i], &offset))
+        {{
+            printf("%llu %d\\n", (unsigned long long)offset, block.free_orders[0]);
+        }}
+        else
+        {{
+            printf("none %d\\n", block.free_orders[0]);
+        }}
+    }}
+    for (uint32_t node = 0; node < (2u << block.max_order) - 1; node++)
+    {{
+        printf("%d ", block.free_orders[node]);
+    }}
+    printf("\\n");
+    return 0;
+}}
+"""
+
+
+def test_generated_allocator_matches_the_mirror(tmp_path):
+    compiler = shutil.which("cc") or shutil.which("gcc")
+    if not compiler:
+        pytest.skip("no C compiler")
+
+    # Only the buddy tree: the block and node helpers before any Vulkan calls
+    code = CreateAllocator(make_ctx())
+    start = code.index("#ifndef VKFORGE_ALLOCATOR_BLOCK_SIZE")
+    end = code.index("static VkDeviceMemory AllocateMappedMemory")
+
+    block_size, min_size = 64 * 256, 256
+    mirror = BuddyBlock(block_size, min_size)
+    rng = random.Random(3)
+    ops, expected, live = [], [], []
+    for _ in range(400):
+        if live and rng.random() < 0.4:
+            offset = live.pop(rng.randrange(len(live)))
+            mirror.free(offset)
+            ops.append(-offset - 1)
+            expected.append(f"free {mirror.free_orders[0]}")
+            continue
+        order = rng.randrange(mirror.max_order + 2)
+        offset = mirror.allocate(order)
+        ops.append(order)
+        expected.append(f"{'none' if offset is None else offset} {mirror.free_orders[0]}")
+        if offset is not None:
+            live.append(offset)
+    for offset in live:
+        mirror.free(offset)
+        ops.append(-offset - 1)
+        expected.append(f"free {mirror.free_orders[0]}")
+    expected.append(" ".join(str(order) for order in mirror.free_orders))
+    assert mirror.free_orders == BuddyBlock(block_size, min_size).free_orders
+
+    source = tmp_path / "buddy.c"
+    source.write_text(
+        HARNESS_PRELUDE
+        + f"#define VKFORGE_ALLOCATOR_BLOCK_SIZE ((VkDeviceSize){block_size})\n"
+        + f"#define VKFORGE_ALLOCATOR_MIN_SIZE ((VkDeviceSize){min_size})\n"
+        + code[start:end]
+        + HARNESS_MAIN.format(ops=", ".join(str(op) for op in ops))
+    )
+    binary = tmp_path / "buddy"
+    subprocess.run([compiler, "-std=c99", "-Wall", "-Werror", "-o", str(binary), str(source)], check=True)
+    output = subprocess.run([str(binary)], check=True, capture_output=True, text=True).stdout
+    assert [line.strip() for line in output.splitlines()] == expected
@@ -0,0 +1,73 @@
+from vkforge.cache import UMASK, MEBIBYTE, ContentCache, write_atomic
+from vkforge.shader import compile_shader
+from pathlib import Path
+import os
+import pytest
+import shutil
+import stat
+import subprocess
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ContentCache(tmp_path, "spirv", 10)
+    cache.put("aa", b"12345", ".spv")
+    cache.put("bb", b"12345", ".spv")
+    os.utime(cache.path("aa", ".spv"), (1, 1))
+    os.utime(cache.path("bb", ".spv"), (2, 2))
+
+    assert cache.get("aa", ".spv")  # refreshes aa
+    cache.put("cc", b"12345", ".spv")
+    cache.evict()
+
+    assert cache.get("aa", ".spv")
+    assert cache.get("bb", ".spv") is None
+    assert cache.get("cc", ".spv")
+
+
+def test_cache_disabled(tmp_path):
+    cache = ContentCache(tmp_path, "spirv", 0)
+    assert cache.put("aa", b"1") is None
+    assert cache.get("aa") is None
+
+
+def test_write_atomic_keeps_file_modes(tmp_path):
+    new = tmp_path / "new.c"
+    write_atomic(new, b"1")
+    assert stat.S_IMODE(os.stat(new).st_mode) == 0o666 & ~UMASK
+
+    existing = tmp_path / "existing.sh"
+    existing.write_bytes(b"0")
+    os.chmod(existing, 0o755)
+    write_atomic(existing, b"1")
+    assert stat.S_IMODE(os.stat(existing).st_mode) == 0o755
+    assert existing.read_bytes() == b"1"
+
+
+def test_cached_shader_needs_no_compiler(tmp_path, monkeypatch):
+    compiler = tmp_path / "glslangValidator"
+    compiler.write_bytes(b"")
+    shader = tmp_path / "a.frag"
+    shader.write_text("void main() {}")
+
+    def fake_compiler(args, **kwargs):
+        if "-o" in args:
+            Path(args[args.index("-o") + 1]).write_bytes(b"spirv")
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    monkeypatch.setattr(shutil, "which", lambda name: str(compiler))
+    monkeypatch.setattr("vkforge.shader.run_tool", fake_compiler)
+    cache = ContentCache(tmp_path, "spirv", 10 * MEBIBYTE)
+    compile_shader(tmp_path / "build", None, shader, None, cache)
+
+    # Without the compiler a hit still works and only a miss fails
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    def missing_compiler(args, **kwargs):
+        raise FileNotFoundError(args[0])
+
+    monkeypatch.setattr("vkforge.shader.run_tool", missing_compiler)
+    output = compile_shader(tmp_path / "other", None, shader, None, cache)
+    assert output.read_bytes() == b"spirv"
+
+    shader.write_text("void main() { }")
+    with pytest.raises(FileNotFoundError):
+        compile_shader(tmp_path / "other", None, shader, None, cache)
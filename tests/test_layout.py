@@ -0,0 +1,351 @@
+from vkforge.layout import (
+    find_single_descriptorset_conflicts,
+    find_group_descriptorset_conflicts,
+    raise_descriptorset_conflicts,
+    find_signature_conflicts,
+    color_dsatur,
+    color_exact,
+    optimize_greedy,
+    optimize_pack,
+    EXACT_PACK_NODES,
+    PACK_EXACT,
+    PACK_CAPPED,
+    PACK_HEURISTIC,
+    create_pipeline_layouts,
+)
+from vkforge.schema import VkForgeModel, DescriptorFrequencyModel
+from vkforge.translators.layout import (
+    GetSetLayoutDesigns,
+    GetStaticSubComponents,
+    HashPipelineName,
+    MixPipelineNameHash,
+    BuildPipelineNameHash,
+    CreatePipelineIdTables,
+    CreateForgePipelineTable,
+)
+from vkforge.context import VkForgeContext
+from vkforge.mappings import *
+import pytest
+
+
+def test_single_shader_overlap():
+    dsets = [("vert", 0, 0, "ubos", 1), ("vert", 0, 1, "ubos", 1), ("vert", 0, 0, "ssbos", 1)]
+    errors = find_single_descriptorset_conflicts("a.vert", dsets)
+    assert errors == ["set 0, binding 0, mode vert overlapped for shader a.vert"]
+
+
+def test_shared_binding_across_stages_is_allowed():
+    groups = {"P": ["a.vert", "a.frag"]}
+    dsets = {
+        "a.vert": [("vert", 0, 0, "ubos", 1)],
+        "a.frag": [("frag", 0, 0, "ubos", 1)],
+    }
+    assert find_group_descriptorset_conflicts(groups, dsets) == []
+
+
+def test_every_pipeline_is_checked():
+    # The conflict is in the first pipeline, not the last
+    groups = {"Bad": ["a.vert", "b.frag"], "Good": ["a.vert", "a.frag"]}
+    dsets = {
+        "a.vert": [("vert", 0, 0, "ubos", 1)],
+        "a.frag": [("frag", 1, 0, "sampler2D", 1)],
+        "b.frag": [("frag", 0, 0, "sampler2D", 1)],
+    }
+    errors = find_group_descriptorset_conflicts(groups, dsets)
+    assert len(errors) == 1
+    assert "pipeline Bad" in errors[0] and "different types" in errors[0]
+
+
+def test_all_conflicts_are_reported():
+    groups = {"P": ["a.vert", "a.frag", "b.frag"]}
+    dsets = {
+        "a.vert": [("vert", 0, 0, "ubos", 1), ("vert", 0, 1, "sampler2D", 4)],
+        "a.frag": [("frag", 0, 0, "ssbos", 1), ("frag", 0, 1, "sampler2D", 2)],
+        "b.frag": [("frag", 2, 0, "ubos", 1)],
+    }
+    errors = find_group_descriptorset_conflicts(groups, dsets)
+    assert len(errors) == 2
+    assert any("binding 0 have different types" in e for e in errors)
+    assert any("binding 1 have different counts" in e for e in errors)
+
+
+def test_duplicate_mode_in_pipeline():
+    groups = {"P": ["a.frag", "b.frag"]}
+    dsets = {
+        "a.frag": [("frag", 0, 0, "ubos", 1)],
+        "b.frag": [("frag", 0, 0, "ubos", 1)],
+    }
+    errors = find_group_descriptorset_conflicts(groups, dsets)
+    assert len(errors) == 1 and "mode frag is duplicated" in errors[0]
+
+
+def test_raise_lists_every_conflict():
+    raise_descriptorset_conflicts([])
+    with pytest.raises(ValueError, match=r"2 descriptor set conflict\(s\)") as e:
+        raise_descriptorset_conflicts(["first", "second"])
+    assert "  - first\n  - second" in str(e.value)
+
+
+def descriptors(*bindings):
+    return [(set1, bind, type, 1, {"frag"}) for set1, bind, type in bindings]
+
+
+# A and C conflict with B at set 0 binding 0; A and C only differ where they do not overlap
+PIPELINES = {
+    "A": descriptors((0, 0, "ubos")),
+    "B": descriptors((0, 0, "ssbos")),
+    "C": descriptors((0, 0, "ubos"), (1, 2, "sampler2D")),
+}
+
+
+def test_greedy_depends_on_config_order():
+    layouts, references = optimize_greedy(["A", "B", "C"], PIPELINES)
+    assert len(layouts) == 3
+    layouts, references = optimize_greedy(["A", "C", "B"], PIPELINES)
+    assert len(layouts) == 2
+
+
+def test_pack_is_independent_of_config_order():
+    first = optimize_pack(["A", "B", "C"], PIPELINES)
+    second = optimize_pack(["C", "B", "A"], PIPELINES)
+    assert first[0] == second[0]
+    assert first[1] == {"A": 1, "B": 0, "C": 1}
+    assert first[1] == second[1] and list(second[1]) == ["C", "B", "A"]
+    assert first[2] == PACK_EXACT
+
+
+def test_pack_layout_contents():
+    layouts, references, _ = optimize_pack(["A", "B", "C"], PIPELINES)
+    # Layouts are numbered by their smallest descriptor signature
+    assert layouts[0] == [[("ssbos", 1, {"frag"})]]
+    assert layouts[1] == [[("ubos", 1, {"frag"})], [None, None, ("sampler2D", 1, {"frag"})]]
+
+
+def test_stages_are_merged():
+    pipelines = {
+        "A": [(0, 0, "ubos", 1, {"vert"})],
+        "B": [(0, 0, "ubos", 1, {"frag"})],
+    }
+    for layouts, *_ in (optimize_pack(["A", "B"], pipelines), optimize_greedy(["A", "B"], pipelines)):
+        assert layouts == [[[("ubos", 1, {"vert", "frag"})]]]
+    assert pipelines["A"][0][4] == {"vert"}
+
+
+def test_conflict_graph():
+    signatures = [
+        ((0, 0, "ubos", 1),),
+        ((0, 0, "ssbos", 1),),
+        ((0, 0, "ubos", 2),),
+        ((1, 0, "ubos", 1),),
+    ]
+    assert find_signature_conflicts(signatures) == [0b0110, 0b0101, 0b0011, 0]
+
+
+def crown_graph(count: int) -> list:
+    """Two rows of count nodes, each conflicting with every node of the other row but its twin."""
+    conflicts = [0] * (2 * count)
+    for i in range(count):
+        for j in range(count):
+            if i != j:
+                conflicts[i] |= 1 << (count + j)
+                conflicts[count + j] |= 1 << i
+    return conflicts
+
+
+def test_exact_improves_on_dsatur():
+    # A crown graph: DSatur's ties pick a poor order, the optimum is 2 colors
+    conflicts = crown_graph(4)
+    colors, order = color_dsatur(conflicts)
+    best, method = color_exact(conflicts, [1] * len(conflicts), colors, order)
+    assert method == PACK_EXACT and len(set(best)) == 2
+    for node, mask in enumerate(conflicts):
+        assert all(best[node] != best[other] for other in range(len(conflicts)) if mask >> other & 1)
+
+
+def test_exact_prefers_fewer_set_layouts():
+    # Nothing conflicts, so one layout holding every set is best
+    best, method = color_exact([0, 0, 0], [3, 1, 2], [0, 1, 2], [0, 1, 2])
+    assert method == PACK_EXACT and best == [0, 0, 0]
+
+
+def test_step_cap_reports_how_far_the_search_got(monkeypatch):
+    # Visiting twins one after another, the search finds 4 then 3 colors before the optimum of 2
+    conflicts = crown_graph(4)
+    order = [0, 4, 1, 5, 2, 6, 3, 7]
+    start = list(range(8))
+
+    monkeypatch.setattr("vkforge.layout.EXACT_PACK_STEPS", 15)
+    best, method = color_exact(conflicts, [1] * 8, start, order)
+    assert method == PACK_CAPPED and len(set(best)) == 3
+
+    monkeypatch.setattr("vkforge.layout.EXACT_PACK_STEPS", 5)
+    best, method = color_exact(conflicts, [1] * 8, start, order)
+    assert method == PACK_HEURISTIC and best == start
+
+
+def test_large_inputs_fall_back_to_dsatur():
+    pipelines = {
+        f"P{i}": descriptors((0, i % (EXACT_PACK_NODES + 8), "ubos"), (0, 200 + i % 3, "ssbos"))
+        for i in range(200)
+    }
+    pipelines["X"] = descriptors((0, 0, "sampler2D"))
+    layouts, references, method = optimize_pack(list(pipelines), pipelines)
+    assert method == PACK_HEURISTIC
+    assert len(layouts) == 2 and references["X"] == 0
+
+
+def make_shaders(pipelines: dict) -> dict:
+    """Shader data with one fragment shader per pipeline, each a list of (set, binding, kind, name)."""
+    shader_list = {}
+    for pipeline_name, bindings in pipelines.items():
+        reflect = {"types": {"_block": {}}}
+        for set1, binding, kind, name in bindings:
+            type = "_block" if kind in ("ubos", "ssbos") else "sampler2D"
+            reflect.setdefault(kind, []).append({"type": type, "name": name, "set": set1, "binding": binding})
+        shader_list[f"{pipeline_name}.frag"] = {SHADER.MODE: "frag", SHADER.REFLECT: reflect}
+    return {
+        SHADER.LIST: shader_list,
+        SHADER.COMBO: {name: [f"{name}.frag"] for name in pipelines},
+    }
+
+
+def make_model(pipelines: dict, frequencies=None) -> VkForgeModel:
+    return VkForgeModel(
+        ID="VkForge 0.5",
+        Pipeline=[
+            {"name": name, "ShaderModule": [{"path": f"{name}.frag"}], "VertexInputBindingDescription": []}
+            for name in pipelines
+        ],
+        DescriptorFrequency=frequencies,
+    )
+
+
+SCENE = {
+    "Lit": [(0, 0, "ubos", "camera"), (1, 0, "textures", "albedo"), (2, 0, "ubos", "model")],
+    "Unlit": [(0, 0, "ubos", "camera"), (1, 0, "textures", "albedo")],
+}
+
+
+def test_frequencies_are_inferred(capsys):
+    layout = create_pipeline_layouts(make_model(SCENE), make_shaders(SCENE))
+    assert layout[LAYOUT.FREQUENCIES] == [["frame", "material", "draw"]]
+    assert "0 warning(s)" in capsys.readouterr().out
+
+
+def test_frequencies_are_noted_on_the_pipeline_layouts():
+    layout = create_pipeline_layouts(make_model(SCENE), make_shaders(SCENE))
+    components = GetStaticSubComponents(
+        layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.LAYOUTS],
+        layout[LAYOUT.PIPELINE_LAYOUT][LAYOUT.REFERENCES],
+        layout[LAYOUT.FREQUENCIES],
+    )
+    assert "// set 0 per-frame, set 1 per-material, set 2 per-draw\nstatic VkForgeLayoutPipelineLayoutDesign PIPELINE_LAYOUT_0" in components["static_pipeline_layouts"]
+
+
+def test_annotations_override_inference(capsys):
+    frequencies = [{"name": "camera", "frequency": "draw"}, {"set": 1, "frequency": "frame"}]
+    layout = create_pipeline_layouts(make_model(SCENE, frequencies), make_shaders(SCENE))
+    assert layout[LAYOUT.FREQUENCIES] == [["draw", "frame", "draw"]]
+    out = capsys.readouterr().out
+    assert "set 0 of pipeline layout 0 changes per-draw but set 1 after it changes per-frame" in out
+
+
+def test_mixed_set_is_reported(capsys):
+    pipelines = {"Mixed": [(0, 0, "ubos", "camera"), (0, 1, "ubos", "model")]}
+    frequencies = [{"name": "camera", "frequency": "frame"}, {"name": "missing", "frequency": "frame"}]
+    layout = create_pipeline_layouts(make_model(pipelines, frequencies), make_shaders(pipelines))
+    assert layout[LAYOUT.FREQUENCIES] == [["draw"]]
+    out = capsys.readouterr().out
+    assert "set 0 of pipeline layout 0 mixes update frequencies (binding 0 per-frame, binding 1 per-draw)" in out
+    assert "DescriptorFrequency name missing matches no descriptor" in out
+
+
+def test_mixed_inferred_set_is_only_counted(capsys):
+    pipelines = {"Mixed": [(0, 0, "textures", "albedo"), (0, 1, "ubos", "model")]}
+    layout = create_pipeline_layouts(make_model(pipelines), make_shaders(pipelines))
+    assert layout[LAYOUT.FREQUENCIES] == [["draw"]]
+    out = capsys.readouterr().out
+    assert "mixes update frequencies" not in out
+    assert "1 set(s) mix inferred frequencies, 0 warning(s)" in out
+
+
+def test_frequency_annotation_needs_one_target():
+    with pytest.raises(ValueError):
+        DescriptorFrequencyModel(frequency="frame")
+    with pytest.raises(ValueError):
+        DescriptorFrequencyModel(frequency="frame", name="camera", set=0)
+    with pytest.raises(ValueError):
+        DescriptorFrequencyModel(frequency="frame", binding=0)
+
+
+def test_set_layout_designs_are_shared():
+    ubo = ("ubos", 1, {"vert"})
+    texture = ("sampler2D", 1, {"frag"})
+    layouts = [
+        [[ubo], [texture]],
+        [[ubo], None, [None, texture]],  # set 1 unused
+        None,                            # pipelines without descriptors
+    ]
+    designs, layout_sets = GetSetLayoutDesigns(layouts)
+    assert designs == [
+        (("ubos", 1, ("vert",)),),
+        (("sampler2D", 1, ("frag",)),),
+        (),
+        (None, ("sampler2D", 1, ("frag",))),
+    ]
+    assert layout_sets == [[0, 1], [0, 2, 3], []]
+
+    components = GetStaticSubComponents(layouts, {"A": 0, "B": 1, "C": 2})
+    sets = components["static_descriptor_set_layouts"]
+    assert sets.count("static VkForgeLayoutDescriptorSetLayoutDesign DESCRIPTOR_SET_LAYOUT_") == 4
+    assert "    0, NULL, 2\n" in sets
+    assert "DESCRIPTOR_SET_LAYOUTS_1[] = {\n    &DESCRIPTOR_SET_LAYOUT_0, &DESCRIPTOR_SET_LAYOUT_2, &DESCRIPTOR_SET_LAYOUT_3\n" in sets
+    assert components["static_bind_designs"].count("static VkForgeLayoutBindDesign BIND_") == 2
+
+
+def test_pipeline_name_hash_is_fnv1a():
+    assert HashPipelineName("") == 0x811C9DC5
+    assert HashPipelineName("a") == 0xE40C292C
+    assert HashPipelineName("foobar") == 0xBF9CF968
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 64, 1000])
+def test_pipeline_name_hash_is_perfect(count):
+    names = [f"Pipeline{i}" for i in range(count)]
+    displacements, slots = BuildPipelineNameHash(names)
+    assert sorted(slots) == list(range(count))
+    for id, name in enumerate(names):
+        hash = HashPipelineName(name)
+        displacement = displacements[MixPipelineNameHash(hash, 0) % len(displacements)]
+        assert slots[MixPipelineNameHash(hash, displacement) % count] == id
+
+
+def test_pipeline_names_must_be_unique():
+    with pytest.raises(ValueError):
+        BuildPipelineNameHash(["Main", "Other", "Main"])
+
+
+def test_prewarm_order_follows_the_config():
+    model = make_model(SCENE).model_copy(update={"PipelinePrewarm": ["Unlit", "Lit"]})
+    layout = create_pipeline_layouts(model, make_shaders(SCENE))
+    tables = CreatePipelineIdTables(VkForgeContext(forgeModel=model, layout=layout))
+    assert (
+        "PIPELINE_PREWARM_ORDER[] = { VKFORGE_PIPELINE_ID_Unlit, VKFORGE_PIPELINE_ID_Lit, VKFORGE_PIPELINE_ID_COUNT };"
+        in tables
+    )
+
+
+def test_prewarm_creates_the_unlisted_pipelines_too():
+    table = CreateForgePipelineTable(VkForgeContext())
+    listed = table.index("PIPELINE_PREWARM_ORDER[i] != VKFORGE_PIPELINE_ID_COUNT")
+    rest = table.index("for (uint32_t id = 0; id < VKFORGE_PIPELINE_ID_COUNT; id++)\n    {\n        if (!PrewarmPipeline(")
+    assert listed < rest
+    assert "if (prewarm && VKFORGE_PIPELINE_ID_COUNT > 0)" in table
+
+
+def test_prewarm_names_must_be_pipelines():
+    pipelines = [{"name": "Lit", "ShaderModule": [{"path": "Lit.frag"}], "VertexInputBindingDescription": []}]
+    with pytest.raises(ValueError):
+        VkForgeModel(ID="VkForge 0.5", Pipeline=pipelines, PipelinePrewarm=["Missing"])
+    with pytest.raises(ValueError):
+        VkForgeModel(ID="VkForge 0.5", Pipeline=pipelines, PipelinePrewarm=["Lit", "Lit"])
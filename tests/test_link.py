@@ -0,0 +1,43 @@
+from vkforge.shader import link_shader_combination
+from vkforge.mappings import *
+import pytest
+
+
+def shader(mode, **reflect):
+    return {SHADER.MODE: mode, SHADER.REFLECT: reflect}
+
+
+VERT = shader(
+    "vert",
+    outputs=[{"type": "vec4", "name": "color", "location": 0}, {"type": "vec2", "name": "uv", "location": 1}],
+    ubos=[{"type": "_10", "name": "ubo", "set": 0, "binding": 0}],
+)
+
+
+def test_matching_interfaces_link():
+    frag = shader(
+        "frag",
+        inputs=[{"type": "vec2", "name": "uv", "location": 1}],
+        ubos=[{"type": "_7", "name": "ubo", "set": 0, "binding": 0}],
+    )
+    link_shader_combination("Test", {"a.frag": frag, "a.vert": VERT})
+
+
+def test_mismatches_are_all_reported():
+    frag = shader(
+        "frag",
+        inputs=[{"type": "vec3", "name": "color", "location": 0}, {"type": "float", "name": "fog", "location": 2}],
+        textures=[{"type": "sampler2D", "name": "tex", "set": 0, "binding": 0}],
+    )
+    with pytest.raises(RuntimeError) as e:
+        link_shader_combination("Test", {"a.vert": VERT, "a.frag": frag})
+
+    message = str(e.value)
+    assert "location 0 is vec4 'color' in a.vert but vec3 'color' in a.frag" in message
+    assert "a.frag reads 'fog' at location 2 but a.vert writes nothing there" in message
+    assert "set 0, binding 0 is ubos in a.vert but sampler2D in a.frag" in message
+
+
+def test_per_vertex_arrays_are_ignored():
+    geom = shader("geom", inputs=[{"type": "vec4", "name": "color", "location": 0, "array": [3]}])
+    link_shader_combination("Test", {"a.vert": VERT, "a.geom": geom})
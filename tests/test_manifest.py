@@ -0,0 +1,27 @@
+from vkforge.manifest import Manifest, decode_tagged, encode_tagged
+import json
+
+
+def test_layout_roundtrip():
+    layout = {"layouts": [[(0, "UBO", 1, {"VERTEX", "FRAGMENT"})], None], "references": {"Test": 0}}
+    encoded = json.loads(json.dumps(encode_tagged(layout)))
+    assert decode_tagged(encoded) == layout
+
+
+def test_artifact_skipped_only_when_inputs_and_output_match(tmp_path):
+    output = tmp_path / "vkforge_core.c"
+    output.write_text("code")
+
+    manifest = Manifest(tmp_path)
+    key = manifest.fingerprint("vkforge_core.c", [{"applicationName": "A"}])
+    manifest.record("vkforge_core.c", key, output)
+    manifest.save()
+
+    manifest = Manifest(tmp_path)
+    assert manifest.is_current("vkforge_core.c", key, output)
+    assert not manifest.is_current("vkforge_core.c", manifest.fingerprint("vkforge_core.c", [{"applicationName": "B"}]), output)
+
+    output.write_text("edited")
+    assert not manifest.is_current("vkforge_core.c", key, output)
+
+    assert not Manifest(tmp_path, force=True).is_current("vkforge_core.c", key, output)
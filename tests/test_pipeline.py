@@ -0,0 +1,135 @@
+from pathlib import Path
+from vkforge.schema import VkForgeModel
+from vkforge.context import VkForgeContext
+from vkforge.translators.pipeline import (
+    ReadShaderCode,
+    GetPipelineStrings,
+    BuildShaderPack,
+    SPIRV_MAGIC,
+    SHADER_PACK_MAGIC,
+    SHADER_PACK_VERSION,
+)
+from vkforge.translators.layout import CreateCreateAllForgePipelines
+from vkforge.translators.prime import GetPrimeStrings
+from vkforge.translators.cmake import GetCMakeStrings
+from vkforge.cache import hash_file
+from vkforge.mappings import *
+import struct
+import pytest
+
+WORDS = [SPIRV_MAGIC, 0x00010600, 0, 8, 0]
+
+
+def write_spirv(path: Path, words: list, order: str = "<") -> Path:
+    path.write_bytes(struct.pack(f"{order}{len(words)}I", *words))
+    return path
+
+
+def make_ctx(tmp_path: Path, shaderStorage: str) -> VkForgeContext:
+    vert = write_spirv(tmp_path / "a.vert.spv", WORDS)
+    frag = write_spirv(tmp_path / "a.frag.spv", WORDS + [1])
+    same = write_spirv(tmp_path / "b.frag.spv", WORDS + [1])  # same code as a.frag
+
+    vertex = [{"stride": 16, "first_location": 0, "input_rate": "vertex"}]
+    fm = VkForgeModel(
+        ID="VkForge 0.5",
+        Pipeline=[
+            {"name": "A", "ShaderModule": [{"path": "a.vert"}, {"path": "a.frag"}], "VertexInputBindingDescription": vertex},
+            {"name": "B", "ShaderModule": [{"path": "a.vert"}, {"path": "b.frag"}], "VertexInputBindingDescription": vertex},
+        ],
+    )
+    shaders = {}
+    for id, path, mode in [("a.vert", vert, "vert"), ("a.frag", frag, "frag"), ("b.frag", same, "frag")]:
+        shaders[id] = {
+            SHADER.MODE: mode,
+            SHADER.ENTRYNAME: "main",
+            SHADER.BINPATH: Path("/baked") / path.name,
+            SHADER.CODEPATH: path,
+            SHADER.DIGEST: hash_file(path),
+            SHADER.SRCPATH: None,
+            SHADER.REFLECT: {},
+        }
+    shaderData = {
+        SHADER.LIST: shaders,
+        SHADER.COMBO: {"A": ["a.vert", "a.frag"], "B": ["a.vert", "b.frag"]},
+    }
+    return VkForgeContext(buildDir="build", forgeModel=fm, shaderData=shaderData, shaderStorage=shaderStorage)
+
+
+def test_shader_code_is_read_in_either_byte_order(tmp_path):
+    little = ReadShaderCode(write_spirv(tmp_path / "le.spv", WORDS, "<"))
+    big = ReadShaderCode(write_spirv(tmp_path / "be.spv", WORDS, ">"))
+    assert list(little) == list(big) == WORDS
+
+
+def test_shader_code_must_be_spirv(tmp_path):
+    with pytest.raises(ValueError):
+        ReadShaderCode(write_spirv(tmp_path / "bad.spv", [1, 2, 3]))
+    (tmp_path / "odd.spv").write_bytes(b"\x03\x02\x23\x07\x00")
+    with pytest.raises(ValueError):
+        ReadShaderCode(tmp_path / "odd.spv")
+
+
+def test_embedded_shader_code_is_deduplicated(tmp_path):
+    code, modules, pipelines = GetPipelineStrings(make_ctx(tmp_path, "embed"))
+    assert code.count("static const uint32_t VKFORGE_SPIRV_") == 2
+    assert "0x07230203, 0x00010600, 0x00000000, 0x00000008, 0x00000000, 0x00000001" in code
+    assert modules.count("VkForge_CreateShaderModuleFromCode(device, VKFORGE_SPIRV_") == 2
+    assert "/baked/" not in modules
+
+
+def test_file_storage_reads_baked_paths(tmp_path):
+    modules, _ = GetPipelineStrings(make_ctx(tmp_path, "file"))
+    assert 'return VkForge_CreateShaderModule(device, "/baked/a.vert.spv");' in modules
+
+
+def test_shader_pack_indexes_unique_code(tmp_path):
+    pack = BuildShaderPack(make_ctx(tmp_path, "pack"))
+    magic, version, count, _ = struct.unpack_from("<4I", pack)
+    assert (magic, version, count) == (SHADER_PACK_MAGIC, SHADER_PACK_VERSION, 2)
+
+    entries = [struct.unpack_from("<2I", pack, 16 + 8 * i) for i in range(count)]
+    assert entries == [(32, 20), (52, 24)]
+    assert list(struct.unpack_from("<6I", pack, 52)) == WORDS + [1]
+    assert len(pack) == 76
+
+
+def test_pack_storage_loads_by_index(tmp_path):
+    modules, _ = GetPipelineStrings(make_ctx(tmp_path, "pack"))
+    assert 'case 0: // a.vert\n            return VkForge_CreateShaderModuleFromPack(device, "build/vkforge_shaders.pack", 0);' in modules
+    assert 'case 1: // a.frag\n            return VkForge_CreateShaderModuleFromPack(device, "build/vkforge_shaders.pack", 1);' in modules
+
+
+def test_pipelines_share_modules_of_identical_code(tmp_path):
+    _, pipelines = GetPipelineStrings(make_ctx(tmp_path, "file"))
+    # b.frag has the same code as a.frag, so pipeline B borrows module 1 too
+    assert pipelines.count("shader_modules ? shader_modules[0] : VkForge_CreateForgeShaderModule(device, 0);") == 2
+    assert pipelines.count("shader_modules ? shader_modules[1] : VkForge_CreateForgeShaderModule(device, 1);") == 2
+
+
+def test_pipelines_are_created_through_the_pipeline_cache(tmp_path):
+    _, pipelines = GetPipelineStrings(make_ctx(tmp_path, "file"))
+    assert pipelines.count("VkPipelineCache pipeline_cache,") == 2
+    assert pipelines.count("vkCreateGraphicsPipelines(device, pipeline_cache, 1,") == 2
+
+
+def test_prime_creates_every_pipeline_and_saves_the_cache(tmp_path):
+    ctx = make_ctx(tmp_path, "file")
+    (prime,) = GetPrimeStrings(ctx)
+    assert "VkForge_CreateAllForgePipelines(forgeLayout, pipelineLayouts, pipelines, 0);" in prime
+    assert "VkForge_SaveForgePipelineCache(forgeLayout)" in prime
+
+    (cmake,) = GetCMakeStrings(ctx)
+    assert f"add_executable(vkforge_prime {FILE.PRIME})" in cmake
+    assert f'set(VKFORGE_PIPELINE_CACHE_PATH "${{CMAKE_BINARY_DIR}}/{FILE.PIPELINE_CACHE}"' in cmake
+    # The programs load the cache from where vkforge_prime writes it
+    assert 'target_compile_definitions(vkforge PUBLIC "VKFORGE_PIPELINE_CACHE_PATH=\\"${VKFORGE_PIPELINE_CACHE_PATH}\\"")' in cmake
+    assert "COMMAND vkforge_prime ${VKFORGE_PIPELINE_CACHE_PATH}" in cmake
+
+
+def test_all_pipelines_share_one_surface_format_query(tmp_path):
+    code = CreateCreateAllForgePipelines(make_ctx(tmp_path, "file"))
+    assert code.count("VkForge_GetSurfaceFormat(") == 1
+    # Shader modules are created before the workers start, which only read them
+    assert code.index("AcquireShaderModules(") < code.index("SDL_CreateThread(")
+    assert "forgeLayout->pipeline_cache," in code
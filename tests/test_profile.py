@@ -0,0 +1,30 @@
+from vkforge import profile
+import json
+from pathlib import Path
+import sys
+
+
+def test_spans_are_written_as_chrome_trace(tmp_path):
+    profiler = profile.enable()
+    try:
+        with profile.span("load_shader", shader="a.vert"):
+            profile.run_tool([sys.executable, "-c", "pass"])
+        with profile.span("load_shader", shader="b.frag"):
+            pass
+        profiler.save(tmp_path / "trace.json")
+        summary = profiler.summary()
+    finally:
+        profile.PROFILER = None
+
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    # Spans are recorded when they end, so the tool call comes first
+    assert [e["name"] for e in events] == [Path(sys.executable).name, "load_shader", "load_shader"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    assert events[1]["args"] == {"shader": "a.vert"}
+    assert "load_shader" in summary
+
+
+def test_span_is_a_no_op_when_disabled():
+    with profile.span("anything"):
+        pass
+    assert not profile.is_enabled()
@@ -0,0 +1,40 @@
+from vkforge.schema import VkForgeModel
+from vkforge.context import VkForgeContext
+from vkforge.translators import core, util
+from vkforge.translators.registry import FindUnusedCreators
+import re
+import pytest
+
+# A non-static function definition at the start of a line: return type, name, parameters, body
+DEFINITION = re.compile(
+    r"^(?!static\b)([A-Za-z_][\w \t*]*?)\s*\b(VkForge_\w+)\s*\(([^)]*)\)\s*\{",
+    re.MULTILINE,
+)
+
+
+def normalize(text: str) -> str:
+    text = " ".join(text.split())
+    return text.replace("( ", "(").replace(" )", ")").replace(" ,", ",")
+
+
+def make_ctx(removeValidations: bool) -> VkForgeContext:
+    return VkForgeContext(
+        removeValidations=removeValidations,
+        forgeModel=VkForgeModel(ID="VkForge 0.5", Pipeline=[]),
+    )
+
+
+@pytest.mark.parametrize("removeValidations", [False, True])
+@pytest.mark.parametrize("creator", core.CORE_CREATORS + util.UTIL_CREATORS, ids=lambda c: c.__name__)
+def test_declarations_match_definitions(creator, removeValidations):
+    output = creator(make_ctx(removeValidations))
+    defined = [
+        normalize(f"{ret} {name}({params})")
+        for ret, name, params in DEFINITION.findall(output)
+    ]
+    assert defined == creator.declarations
+
+
+def test_every_creator_is_rendered():
+    assert FindUnusedCreators(core, core.CORE_CREATORS) == []
+    assert FindUnusedCreators(util, util.UTIL_CREATORS) == []
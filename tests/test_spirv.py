@@ -0,0 +1,83 @@
+from vkforge.spirv import SpirvError, reflect_spirv
+from array import array
+import pytest
+
+
+def op(code, *args):
+    return [(len(args) + 1) << 16 | code] + list(args)
+
+
+def string(text):
+    raw = text.encode("utf-8") + b"\0"
+    raw += b"\0" * (-len(raw) % 4)
+    return [int.from_bytes(raw[i:i + 4], "little") for i in range(0, len(raw), 4)]
+
+
+def make_vertex_shader() -> bytes:
+    # layout(location = 0) in vec2 inPos;
+    # layout(location = 0) out vec4 outColor;
+    # layout(set = 0, binding = 1) uniform UBO { mat4 mvp; } ubo;
+    # layout(set = 1, binding = 2) uniform sampler2D tex[4];
+    # gl_Position (builtin, not reflected)
+    words = [0x07230203, 0x00010000, 0, 100, 0]
+    words += op(15, 0, 1, *string("main"), 20, 21)      # OpEntryPoint Vertex %1 "main"
+    words += op(5, 20, *string("inPos"))
+    words += op(5, 21, *string("outColor"))
+    words += op(5, 22, *string("ubo"))
+    words += op(5, 13, *string("UBO"))
+    words += op(6, 13, 0, *string("mvp"))
+    words += op(5, 23, *string("tex"))
+    words += op(71, 20, 30, 0)                          # inPos Location 0
+    words += op(71, 21, 30, 0)                          # outColor Location 0
+    words += op(71, 13, 2)                              # UBO Block
+    words += op(72, 13, 0, 35, 0)                       # UBO.mvp Offset 0
+    words += op(71, 22, 34, 0)                          # ubo DescriptorSet 0
+    words += op(71, 22, 33, 1)                          # ubo Binding 1
+    words += op(71, 23, 34, 1)                          # tex DescriptorSet 1
+    words += op(71, 23, 33, 2)                          # tex Binding 2
+    words += op(71, 24, 11, 0)                          # gl_Position BuiltIn Position
+    words += op(22, 10, 32)                             # %float
+    words += op(23, 11, 10, 2)                          # %vec2
+    words += op(23, 12, 10, 4)                          # %vec4
+    words += op(24, 14, 12, 4)                          # %mat4
+    words += op(30, 13, 14)                             # %UBO = struct { mat4 }
+    words += op(21, 15, 32, 0)                          # %uint
+    words += op(43, 15, 16, 4)                          # %uint_4
+    words += op(25, 17, 10, 1, 0, 0, 0, 1, 0)           # %image 2D sampled
+    words += op(27, 18, 17)                             # %sampledImage
+    words += op(28, 19, 18, 16)                         # %sampledImage[4]
+    words += op(32, 30, 1, 11)                          # Input vec2*
+    words += op(32, 31, 3, 12)                          # Output vec4*
+    words += op(32, 32, 2, 13)                          # Uniform UBO*
+    words += op(32, 33, 0, 19)                          # UniformConstant sampledImage[4]*
+    words += op(59, 30, 20, 1)
+    words += op(59, 31, 21, 3)
+    words += op(59, 32, 22, 2)
+    words += op(59, 33, 23, 0)
+    words += op(59, 31, 24, 3)
+    return array("I", words).tobytes()
+
+
+def test_reflect_vertex_shader():
+    r = reflect_spirv(make_vertex_shader())
+
+    assert r["entryPoints"] == [{"name": "main", "mode": "vert"}]
+    assert r["inputs"] == [{"type": "vec2", "name": "inPos", "location": 0}]
+    assert r["outputs"] == [{"type": "vec4", "name": "outColor", "location": 0}]
+    assert r["ubos"] == [{"type": "_13", "name": "ubo", "set": 0, "binding": 1}]
+    assert r["textures"] == [{
+        "type": "sampler2D", "name": "tex", "set": 1, "binding": 2,
+        "array": [4], "array_size_is_literal": [True],
+    }]
+    assert r["types"]["_13"]["members"] == [{"name": "mvp", "type": "mat4", "offset": 0}]
+
+
+def test_reflect_byteswapped_binary():
+    words = array("I", make_vertex_shader())
+    words.byteswap()
+    assert reflect_spirv(words.tobytes()) == reflect_spirv(make_vertex_shader())
+
+
+def test_reflect_rejects_non_spirv():
+    with pytest.raises(SpirvError):
+        reflect_spirv(b"#version 450\nvoid main() {}\n")
@@ -0,0 +1,22 @@
+from vkforge.watch import FileWatcher
+import os
+
+
+def test_only_content_changes_are_reported(tmp_path):
+    shader = tmp_path / "a.frag"
+    shader.write_text("void main() {}")
+    missing = tmp_path / "b.glsl"
+
+    watcher = FileWatcher()
+    watcher.track([shader, missing])
+    assert watcher.poll() == set()
+
+    st = shader.stat()
+    os.utime(shader, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert watcher.poll() == set()
+
+    shader.write_text("void main() { }")
+    assert watcher.poll() == {shader}
+
+    missing.write_text("float x;")
+    assert watcher.poll() == {missing}